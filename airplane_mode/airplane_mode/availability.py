@@ -0,0 +1,97 @@
+import hashlib
+import json
+
+import frappe
+from frappe.utils import cint, flt
+from werkzeug.wrappers import Response
+
+CACHE_KEY = "airplane_mode:flight_availability:{}"
+CACHE_TTL = 30
+MAX_FLIGHTS = 50
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def get_availability(flights):
+	"""Return remaining seats and fare of published flights as `{flight: {...}}`.
+
+	`flights` is a comma separated list or a JSON array of flight names. Each flight
+	is served from a cache that lives for `CACHE_TTL` seconds and is dropped when a
+	booking or cancellation commits. The response carries an ETag, and a request
+	whose If-None-Match still matches gets an empty 304.
+	"""
+	flights = parse_flights(flights)
+	availability = get_flights_availability(flights)
+
+	body = json.dumps(availability, sort_keys=True, separators=(",", ":"))
+	etag = '"{}"'.format(hashlib.md5(body.encode()).hexdigest())
+	headers = {"ETag": etag, "Cache-Control": f"public, max-age={CACHE_TTL}"}
+	if etag in frappe.get_request_header("If-None-Match", "").split(", "):
+		return Response(status=304, headers=headers)
+	return Response(body, mimetype="application/json", headers=headers)
+
+
+def parse_flights(flights):
+	if isinstance(flights, str):
+		flights = frappe.parse_json(flights) if flights.startswith("[") else flights.split(",")
+	flights = list(dict.fromkeys(str(flight).strip() for flight in flights or () if flight))
+	if len(flights) > MAX_FLIGHTS:
+		frappe.throw(f"Cannot fetch availability of more than {MAX_FLIGHTS} flights at once.")
+	return flights
+
+
+def get_flights_availability(flights):
+	availability = {}
+	missing = []
+	for flight in flights:
+		cached = frappe.cache.get_value(CACHE_KEY.format(flight))
+		if cached is None:
+			missing.append(flight)
+		elif cached:
+			availability[flight] = cached
+
+	if missing:
+		fetched = fetch_availability(missing)
+		for flight in missing:
+			# unknown and unpublished flights are cached as empty so they cost no query either
+			frappe.cache.set_value(
+				CACHE_KEY.format(flight), fetched.get(flight, {}), expires_in_sec=CACHE_TTL
+			)
+		availability.update(fetched)
+	return availability
+
+
+def fetch_availability(flights):
+	Flight = frappe.qb.DocType("Airplane Flight")
+	Inventory = frappe.qb.DocType("Flight Seat Inventory")
+	rows = (
+		frappe.qb.from_(Flight)
+		.join(Inventory)
+		.on(Inventory.flight == Flight.name)
+		.select(
+			Flight.name,
+			Flight.fare,
+			Inventory.capacity,
+			Inventory.seats_sold,
+			Inventory.seats_held,
+		)
+		.where(Flight.name.isin(flights))
+		.where(Flight.published == 1)
+		.where(Flight.docstatus < 2)
+	).run(as_dict=True)
+
+	availability = {}
+	for row in rows:
+		seats_left = max(cint(row.capacity) - cint(row.seats_sold) - cint(row.seats_held), 0)
+		availability[row.name] = {
+			"seats_left": seats_left,
+			"sold_out": not seats_left,
+			"fare": flt(row.fare),
+		}
+	return availability
+
+
+def clear_availability_cache(*flights):
+	"""Drop the cached availability of flights once the current transaction commits."""
+	keys = [CACHE_KEY.format(flight) for flight in flights if flight]
+	if keys:
+		frappe.db.after_commit.add(lambda: frappe.cache.delete_value(keys))
@@ -0,0 +1,197 @@
+"""Concurrent booking stress harness.
+
+Fires many concurrent ticket bookings at one small-capacity flight on a local
+site and reports throughput, latency percentiles and the number of oversold or
+double-booked seats. Both must be 0. Run it through bench:
+
+	bench --site test_site booking-stress-test --bookings 2000 --concurrency 32 --capacity 50
+
+It creates its own airline, airplane, airports, flight and passengers and removes
+them afterwards unless `--keep` is given.
+"""
+
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+from frappe.utils import add_days, now, today
+
+PREFIX = "STRESS"
+
+
+def run(site, bookings=2000, concurrency=32, capacity=50, keep=False, sites_path="."):
+	connect(site, sites_path)
+	try:
+		flight, passengers = setup(bookings, capacity)
+	finally:
+		frappe.destroy()
+
+	local = threading.local()
+
+	def book(passenger):
+		if not getattr(local, "connected", False):
+			connect(site, sites_path)
+			local.connected = True
+
+		start = time.perf_counter()
+		try:
+			frappe.get_doc(
+				{
+					"doctype": "Airplane Ticket",
+					"flight": flight,
+					"passenger": passenger,
+					"flight_price": 1000,
+				}
+			).insert(ignore_permissions=True)
+			frappe.db.commit()
+			outcome = "booked"
+		except frappe.ValidationError:
+			frappe.db.rollback()
+			outcome = "rejected"
+		except Exception:
+			frappe.db.rollback()
+			outcome = "error"
+		return outcome, time.perf_counter() - start
+
+	started = time.perf_counter()
+	with ThreadPoolExecutor(max_workers=concurrency) as executor:
+		outcomes = list(executor.map(book, passengers))
+	elapsed = time.perf_counter() - started
+
+	connect(site, sites_path)
+	try:
+		result = summarize(flight, capacity, outcomes, elapsed)
+		if not keep:
+			teardown(flight)
+	finally:
+		frappe.destroy()
+	return result
+
+
+def connect(site, sites_path):
+	frappe.init(site=site, sites_path=sites_path)
+	frappe.connect()
+	frappe.set_user("Administrator")
+
+
+def setup(bookings, capacity):
+	suffix = frappe.generate_hash(length=6).upper()
+	airline = frappe.get_doc(
+		{
+			"doctype": "Airline",
+			"name": f"{PREFIX} Airline {suffix}",
+			"customer_care_number": "0000000000",
+			"headquarters": "Stress",
+		}
+	).insert()
+	airplane = frappe.get_doc(
+		{"doctype": "Airplane", "airline": airline.name, "model": "Stress", "capacity": capacity}
+	).insert()
+	airports = [
+		frappe.get_doc(
+			{
+				"doctype": "Airport",
+				"name": f"{PREFIX}-{code}-{suffix}",
+				"code": f"S{code}",
+				"city": "Stress",
+				"country": "Stress",
+			}
+		).insert()
+		for code in ("A", "B")
+	]
+	flight = frappe.get_doc(
+		{
+			"doctype": "Airplane Flight",
+			"airplane": airplane.name,
+			"date_of_departure": add_days(today(), 30),
+			"time_of_departure": "10:00:00",
+			"duration": 3600,
+			"source_airport": airports[0].name,
+			"destination_airport": airports[1].name,
+		}
+	).insert()
+
+	timestamp = now()
+	passengers = [f"{PREFIX}-{suffix}-{i:07d}" for i in range(bookings)]
+	frappe.db.bulk_insert(
+		"Flight Passenger",
+		[
+			"name",
+			"first_name",
+			"last_name",
+			"full_name",
+			"date_of_birth",
+			"owner",
+			"creation",
+			"modified",
+			"modified_by",
+		],
+		[
+			(
+				name,
+				PREFIX,
+				name,
+				f"{PREFIX} {name}",
+				"1990-01-01",
+				"Administrator",
+				timestamp,
+				timestamp,
+				"Administrator",
+			)
+			for name in passengers
+		],
+	)
+	frappe.db.commit()
+	return flight.name, passengers
+
+
+def summarize(flight, capacity, outcomes, elapsed):
+	latencies = sorted(latency for _, latency in outcomes)
+	percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+	tickets = frappe.db.count("Airplane Ticket", {"flight": flight, "docstatus": ["<", 2]})
+	duplicate_seats = frappe.db.sql(
+		"""
+		SELECT COUNT(*) FROM (
+			SELECT seat FROM `tabAirplane Ticket`
+			WHERE flight = %s AND docstatus < 2
+			GROUP BY seat HAVING COUNT(*) > 1
+		) duplicates
+		""",
+		flight,
+	)[0][0]
+	counts = {outcome: 0 for outcome in ("booked", "rejected", "error")}
+	for outcome, _ in outcomes:
+		counts[outcome] += 1
+
+	result = {
+		"attempts": len(outcomes),
+		**counts,
+		"capacity": capacity,
+		"tickets": tickets,
+		"oversold": max(tickets - capacity, 0),
+		"duplicate_seats": duplicate_seats,
+		"seats_held": frappe.db.get_value("Flight Seat Inventory", flight, "seats_held"),
+		"elapsed_s": round(elapsed, 3),
+		"throughput_per_s": round(len(outcomes) / elapsed, 1) if elapsed else 0,
+		"p50_ms": round(percentiles[49] * 1000, 2),
+		"p99_ms": round(percentiles[98] * 1000, 2),
+	}
+	return result
+
+
+def teardown(flight):
+	flight_doc = frappe.get_doc("Airplane Flight", flight)
+	tickets = frappe.get_all("Airplane Ticket", filters={"flight": flight}, pluck="name")
+	frappe.db.delete("Airplane Ticket Add-on Item", {"parent": ["in", tickets]})
+	frappe.db.delete("Airplane Ticket", {"flight": flight})
+	frappe.db.delete("Flight Passenger", {"name": ["like", f"{PREFIX}-%"]})
+	airplane = frappe.get_doc("Airplane", flight_doc.airplane)
+	airports = (flight_doc.source_airport, flight_doc.destination_airport)
+	flight_doc.delete()
+	airplane.delete()
+	frappe.delete_doc("Airline", airplane.airline)
+	for airport in airports:
+		frappe.delete_doc("Airport", airport)
+	frappe.db.commit()
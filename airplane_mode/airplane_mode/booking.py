@@ -0,0 +1,243 @@
+import frappe
+from frappe.utils import flt, now
+
+from airplane_mode.airplane_mode.doctype.airplane_ticket.airplane_ticket import (
+	get_fetched_flight_fields,
+	get_name_prefix,
+)
+from airplane_mode.airplane_mode.doctype.airplane_ticket_add_on_type.airplane_ticket_add_on_type import (
+	get_add_on_catalog,
+	get_add_on_price,
+	needs_airline,
+)
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import (
+	get_seat_inventory,
+	get_seat_map,
+	save_seat_map,
+	update_seat_counters,
+)
+from airplane_mode.airplane_mode.doctype.flight_waitlist_entry.flight_waitlist_entry import (
+	add_to_waitlist,
+	get_position,
+)
+from airplane_mode.utils import bulk_insert, reserve_series
+
+TICKET_DOCTYPE = "Airplane Ticket"
+ADD_ON_DOCTYPE = "Airplane Ticket Add-on Item"
+BOOKING_WEB_FORM = "book-flight-ticket-web-form"
+
+
+@frappe.whitelist()
+def issue_tickets(flight, tickets):
+	"""Issue draft tickets for a group of passengers on one flight in a single transaction.
+
+	`tickets` is a list of dicts with `passenger`, `flight_price` and optionally
+	`seat` and `add_ons` (a list of dicts with `item` and `amount`). Returns one
+	result per requested ticket, in order, holding either the issued `ticket` and
+	its `seat` or an `error`. Passengers who do not fit on the flight are put on its
+	waitlist and their result also holds the `waitlist_entry`.
+
+	Capacity and seats are reserved once for the whole group under the flight's
+	inventory lock, the flight is read once, ticket names come from one block of
+	the naming series and tickets and add-ons are written with multi-row inserts.
+	"""
+	frappe.has_permission(TICKET_DOCTYPE, "create", throw=True)
+	return issue_ticket_requests(flight, frappe.parse_json(tickets) or [])
+
+
+def issue_ticket_requests(flight, tickets):
+	"""Issue `tickets` on a flight as `issue_tickets` does, without checking permissions."""
+	flight_fields = get_fetched_flight_fields()
+	flight_doc = frappe.db.get_value(
+		"Airplane Flight", flight, ["airplane", *(field for _, field in flight_fields)], as_dict=True
+	)
+	if not flight_doc:
+		frappe.throw(f"Flight {flight} does not exist.", frappe.DoesNotExistError)
+
+	results = [frappe._dict(passenger=ticket.get("passenger")) for ticket in tickets]
+	requests = validate_requests(tickets, results)
+	set_add_on_amounts(requests, flight_doc)
+
+	inventory = get_seat_inventory(flight, for_update=True)
+	seat_map = get_seat_map(inventory)
+	seats_left = inventory.capacity - inventory.seats_sold - inventory.seats_held
+
+	issued = []
+	for ticket, result in requests:
+		if len(issued) >= seats_left:
+			set_waitlisted(flight, ticket, result)
+			continue
+
+		if ticket.get("seat"):
+			index = seat_map.index(ticket.seat)
+			if index is None or seat_map.is_taken(index):
+				result.error = f"Seat {ticket.seat} is not available on flight {flight}."
+				continue
+		else:
+			index = seat_map.next_free()
+			if index is None:
+				set_waitlisted(flight, ticket, result)
+				continue
+
+		seat_map.take(index)
+		result.seat = seat_map.label(index)
+		issued.append((ticket, result))
+
+	if not issued:
+		return results
+
+	save_seat_map(flight, seat_map)
+	update_seat_counters(flight, held=len(issued))
+
+	prefix = get_name_prefix(flight, flight_doc.source_airport_code, flight_doc.destination_airport_code)
+	for (_, result), name in zip(
+		issued, reserve_series(prefix, len(issued), doctype=TICKET_DOCTYPE), strict=True
+	):
+		result.ticket = name
+
+	insert_tickets(flight, flight_doc, flight_fields, issued)
+	return results
+
+
+@frappe.whitelist(allow_guest=True, methods=["POST"])
+def book_ticket(flight, passenger, seat=None):
+	"""Issue one draft ticket from the public booking web form, or waitlist the passenger.
+
+	Open to whoever may use the web form, so only the flight, passenger and seat are
+	taken from the client: the flight must be scheduled and the price is its fare
+	(or the web form's default price when no fare is set). Capacity is checked
+	before anything is written, so a full flight is not an error: the waitlist
+	entry is inserted in this transaction and the result holds `waitlist_entry`
+	and `waitlist_position` instead of `ticket`.
+	"""
+	web_form = frappe.db.get_value(
+		"Web Form", BOOKING_WEB_FORM, ["published", "login_required"], as_dict=True
+	)
+	if not web_form or not web_form.published or (web_form.login_required and frappe.session.user == "Guest"):
+		frappe.throw("Booking is not available.", frappe.PermissionError)
+
+	flight_doc = frappe.db.get_value("Airplane Flight", flight, ["status", "docstatus", "fare"], as_dict=True)
+	if not flight_doc or flight_doc.docstatus == 2 or flight_doc.status != "Scheduled":
+		frappe.throw(f"Flight {flight} is not open for booking.")
+	if not frappe.db.exists("Flight Passenger", passenger):
+		frappe.throw(f"Passenger {passenger} does not exist.", frappe.DoesNotExistError)
+
+	flight_price = flt(flight_doc.fare) or get_web_form_price()
+	result = issue_ticket_requests(
+		flight, [{"passenger": passenger, "flight_price": flight_price, "seat": seat}]
+	)[0]
+	if result.get("waitlist_entry"):
+		result.waitlist_position = get_position(flight, passenger)
+	return result
+
+
+def get_web_form_price():
+	return flt(
+		frappe.db.get_value(
+			"Web Form Field", {"parent": BOOKING_WEB_FORM, "fieldname": "flight_price"}, "default"
+		)
+	)
+
+
+def set_waitlisted(flight, ticket, result):
+	result.error = "Cannot issue ticket as the flight is already full."
+	result.waitlist_entry = add_to_waitlist(flight, ticket.passenger, ticket.flight_price)
+
+
+def validate_requests(tickets, results):
+	"""Run the per-ticket checks with one query per linked doctype and return the valid requests."""
+	passengers = {ticket.get("passenger") for ticket in tickets}
+	existing_passengers = set(
+		frappe.get_all("Flight Passenger", filters={"name": ["in", list(passengers)]}, pluck="name")
+	)
+	add_on_types = set(frappe.get_all("Airplane Ticket Add-on Type", pluck="name"))
+
+	requests = []
+	for ticket, result in zip(tickets, results, strict=True):
+		ticket = frappe._dict(ticket)
+		ticket.add_ons = remove_duplicate_add_ons(ticket.get("add_ons") or [])
+
+		if ticket.passenger not in existing_passengers:
+			result.error = f"Passenger {ticket.passenger} does not exist."
+		elif ticket.flight_price in (None, ""):
+			result.error = "Flight Price is mandatory."
+		elif unknown := {add_on.item for add_on in ticket.add_ons} - add_on_types:
+			result.error = f"Unknown add-ons: {', '.join(sorted(map(str, unknown)))}."
+		else:
+			requests.append((ticket, result))
+	return requests
+
+
+def set_add_on_amounts(requests, flight_doc):
+	"""Price add-ons that have no amount from the cached catalog, reading the airline at most once."""
+	unpriced = [
+		add_on for ticket, _ in requests for add_on in ticket.add_ons if add_on.get("amount") in (None, "")
+	]
+	if not unpriced:
+		return
+
+	catalog = get_add_on_catalog()
+	airline = None
+	if needs_airline(catalog, {add_on.item for add_on in unpriced}):
+		airline = frappe.db.get_value("Airplane", flight_doc.airplane, "airline")
+	for add_on in unpriced:
+		amount = get_add_on_price(
+			catalog, add_on.item, airline, flight_doc.source_airport, flight_doc.destination_airport
+		)
+		if amount is not None:
+			add_on.amount = amount
+
+
+def remove_duplicate_add_ons(add_ons):
+	unique_add_ons = {}
+	for add_on in add_ons:
+		add_on = frappe._dict(add_on)
+		unique_add_ons.setdefault(add_on.item, add_on)
+	return list(unique_add_ons.values())
+
+
+def insert_tickets(flight, flight_doc, flight_fields, issued):
+	timestamp = now()
+	user = frappe.session.user
+	standard = {
+		"owner": user,
+		"creation": timestamp,
+		"modified": timestamp,
+		"modified_by": user,
+		"docstatus": 0,
+	}
+
+	ticket_rows = []
+	add_on_rows = []
+	for ticket, result in issued:
+		flight_price = flt(ticket.flight_price)
+		ticket_rows.append(
+			{
+				**standard,
+				"name": result.ticket,
+				"idx": 0,
+				"flight": flight,
+				"passenger": ticket.passenger,
+				"seat": result.seat,
+				"status": "Booked",
+				"flight_price": flight_price,
+				"total_amount": flight_price + sum(flt(add_on.amount) for add_on in ticket.add_ons),
+				**{ticket_field: flight_doc[flight_field] for ticket_field, flight_field in flight_fields},
+			}
+		)
+		for idx, add_on in enumerate(ticket.add_ons, start=1):
+			add_on_rows.append(
+				{
+					**standard,
+					"name": frappe.generate_hash(length=10),
+					"idx": idx,
+					"parent": result.ticket,
+					"parenttype": TICKET_DOCTYPE,
+					"parentfield": "add_ons",
+					"item": add_on.item,
+					"amount": flt(add_on.amount),
+				}
+			)
+
+	bulk_insert(TICKET_DOCTYPE, ticket_rows)
+	bulk_insert(ADD_ON_DOCTYPE, add_on_rows)
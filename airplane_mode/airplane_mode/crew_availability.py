@@ -0,0 +1,164 @@
+"""Crew availability from an interval index of each crew member's duty windows.
+
+A duty window runs from a flight's departure to its arrival plus `REST_BUFFER`.
+Each crew member's windows are kept sorted in a `DutyIndex`, cached per member in
+Redis, so checking one member against a time slot is a binary search.
+"""
+
+import pickle
+from bisect import bisect_left
+from datetime import timedelta
+
+import frappe
+from frappe.utils import cint, get_datetime
+
+CACHE_KEY = "airplane_mode:crew_duty_index"
+# minimum rest after a flight lands before the crew member can fly again
+REST_BUFFER = timedelta(hours=10)
+
+
+class DutyIndex:
+	"""Duty windows of one crew member sorted by start, as parallel lists.
+
+	`max_ends[i]` is the latest end among the first i + 1 windows, which lets a
+	query find overlaps with one bisect even if the stored roster already has
+	overlapping windows.
+	"""
+
+	def __init__(self, duties=()):
+		duties = sorted(duties)
+		self.starts = [start for start, _, _ in duties]
+		self.ends = [end for _, end, _ in duties]
+		self.flights = [flight for _, _, flight in duties]
+		self.max_ends = []
+		for end in self.ends:
+			self.max_ends.append(max(end, self.max_ends[-1]) if self.max_ends else end)
+
+	def conflicts(self, start, end, exclude=None):
+		"""Return the flights whose windows overlap [start, end), latest first."""
+		flights = []
+		# windows starting before `end` are the only candidates
+		i = bisect_left(self.starts, end) - 1
+		while i >= 0 and self.max_ends[i] > start:
+			if self.ends[i] > start and self.flights[i] != exclude:
+				flights.append(self.flights[i])
+			i -= 1
+		return flights
+
+	def is_free(self, start, end, exclude=None):
+		i = bisect_left(self.starts, end) - 1
+		if i < 0 or self.max_ends[i] <= start:
+			return True
+		return not self.conflicts(start, end, exclude)
+
+
+def get_duty_window(date_of_departure, time_of_departure, duration):
+	start = get_datetime(f"{date_of_departure} {time_of_departure}")
+	return start, start + timedelta(seconds=cint(duration)) + REST_BUFFER
+
+
+def get_duty_indexes(crew_members, cached=True):
+	"""Return {crew member: DutyIndex}, building the ones not in the cache with one query."""
+	crew_members = list(dict.fromkeys(crew_members))
+	indexes = {}
+	if cached and crew_members:
+		# one round trip for every member; values are pickled the way RedisWrapper.hset stores them
+		values = frappe.cache.hmget(frappe.cache.make_key(CACHE_KEY), crew_members)
+		for crew_member, value in zip(crew_members, values, strict=True):
+			if value is not None:
+				indexes[crew_member] = pickle.loads(value)
+
+	missing = [crew_member for crew_member in crew_members if crew_member not in indexes]
+	if missing:
+		built = build_duty_indexes(missing)
+		for crew_member, index in built.items():
+			frappe.cache.hset(CACHE_KEY, crew_member, index)
+		indexes.update(built)
+	return indexes
+
+
+def build_duty_indexes(crew_members):
+	Crew = frappe.qb.DocType("Flight Crew")
+	Flight = frappe.qb.DocType("Airplane Flight")
+	rows = (
+		frappe.qb.from_(Crew)
+		.join(Flight)
+		.on(Flight.name == Crew.parent)
+		.select(
+			Crew.crew_member,
+			Flight.name,
+			Flight.date_of_departure,
+			Flight.time_of_departure,
+			Flight.duration,
+		)
+		.where(Crew.parenttype == "Airplane Flight")
+		.where(Crew.crew_member.isin(crew_members))
+		.where(Flight.docstatus < 2)
+	).run(as_dict=True)
+
+	duties = {crew_member: [] for crew_member in crew_members}
+	for row in rows:
+		start, end = get_duty_window(row.date_of_departure, row.time_of_departure, row.duration)
+		duties[row.crew_member].append((start, end, row.name))
+	return {crew_member: DutyIndex(windows) for crew_member, windows in duties.items()}
+
+
+def clear_duty_indexes(crew_members):
+	"""Drop cached duty indexes once the current transaction commits."""
+	crew_members = [crew_member for crew_member in set(crew_members) if crew_member]
+	if crew_members:
+		frappe.db.after_commit.add(lambda: frappe.cache.hdel(CACHE_KEY, crew_members))
+
+
+def get_roster_conflicts(crew_members, start, end, exclude_flight=None, cached=True):
+	"""Return {crew member: [conflicting flights]} for the members busy during [start, end)."""
+	conflicts = {}
+	for crew_member, index in get_duty_indexes(crew_members, cached=cached).items():
+		if flights := index.conflicts(start, end, exclude_flight):
+			conflicts[crew_member] = flights
+	return conflicts
+
+
+def get_free_crew(start, end, role=None, airline=None, exclude_flight=None, txt=None):
+	"""Return the active crew members, optionally of a role and airline, free during [start, end)."""
+	filters = {"status": "Active"}
+	if role:
+		filters["role"] = role
+	if airline:
+		filters["airline"] = airline
+	or_filters = {"name": ["like", f"%{txt}%"], "full_name": ["like", f"%{txt}%"]} if txt else None
+	crew = frappe.get_all(
+		"Crew Member",
+		filters=filters,
+		or_filters=or_filters,
+		fields=["name", "full_name", "role"],
+		order_by="name asc",
+	)
+	indexes = get_duty_indexes([member.name for member in crew])
+	return [member for member in crew if indexes[member.name].is_free(start, end, exclude_flight)]
+
+
+@frappe.whitelist()
+def get_available_crew(date_of_departure, time_of_departure, duration, role=None, airline=None, flight=None):
+	frappe.has_permission("Crew Member", "read", throw=True)
+	start, end = get_duty_window(date_of_departure, time_of_departure, duration)
+	return get_free_crew(start, end, role, airline, flight)
+
+
+@frappe.whitelist()
+@frappe.validate_and_sanitize_search_inputs
+def crew_member_query(doctype, txt, searchfield, start, page_len, filters):
+	"""Link query for the crew table of a flight that only offers crew free for its slot."""
+	frappe.has_permission("Crew Member", "read", throw=True)
+	if not (filters.get("date_of_departure") and filters.get("time_of_departure")):
+		return []
+
+	airline = None
+	if filters.get("airplane"):
+		airline = frappe.get_cached_value("Airplane", filters["airplane"], "airline")
+	window = get_duty_window(
+		filters["date_of_departure"], filters["time_of_departure"], filters.get("duration")
+	)
+	crew = get_free_crew(*window, filters.get("role"), airline, filters.get("flight"), txt)
+	crew = crew[cint(start) : cint(start) + cint(page_len)]
+	return [(member.name, member.full_name, member.role) for member in crew]
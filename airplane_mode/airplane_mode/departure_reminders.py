@@ -0,0 +1,130 @@
+from datetime import timedelta
+from itertools import groupby
+
+import frappe
+from frappe.utils import format_datetime, get_datetime, now_datetime
+from frappe.utils.user import get_users_with_role
+from pypika import CustomFunction
+
+REMINDER_WINDOW = timedelta(hours=24)
+# recipients per Email Queue entry; each entry is sent over one SMTP connection
+BATCH_SIZE = 100
+DEPARTURE_INDEX = ("status", "date_of_departure", "time_of_departure")
+DEPARTURE_INDEX_NAME = "departure_index"
+
+Timestamp = CustomFunction("TIMESTAMP", ["date", "time"])
+
+
+def send_departure_reminders():
+	"""Queue reminders for passengers whose flight departs within `REMINDER_WINDOW`.
+
+	One query selects the scheduled flights in the window, through `departure_index`,
+	together with the tickets not reminded yet. Every flight gets one Email Queue entry
+	per `BATCH_SIZE` passengers, and its tickets are flagged in the same transaction,
+	so a rerun after a crash neither skips nor repeats a ticket. Admins receive one
+	digest for the whole run.
+	"""
+	start = now_datetime()
+	end = start + REMINDER_WINDOW
+	tickets = get_pending_tickets(start, end)
+	if not tickets:
+		return
+
+	digest = []
+	for _, flight_tickets in groupby(tickets, key=lambda ticket: ticket.flight):
+		flight_tickets = list(flight_tickets)
+		recipients = list(dict.fromkeys(ticket.email for ticket in flight_tickets if ticket.email))
+		for i in range(0, len(recipients), BATCH_SIZE):
+			send_flight_reminder(flight_tickets[0], recipients[i : i + BATCH_SIZE])
+
+		mark_reminded([ticket.name for ticket in flight_tickets])
+		frappe.db.commit()
+		digest.append((flight_tickets[0], len(flight_tickets), len(recipients)))
+
+	send_digest(digest, start, end)
+
+
+def get_pending_tickets(start, end):
+	Flight = frappe.qb.DocType("Airplane Flight")
+	Ticket = frappe.qb.DocType("Airplane Ticket")
+	Passenger = frappe.qb.DocType("Flight Passenger")
+	departure = Timestamp(Flight.date_of_departure, Flight.time_of_departure)
+	return (
+		frappe.qb.from_(Flight)
+		.join(Ticket)
+		.on(Ticket.flight == Flight.name)
+		.left_join(Passenger)
+		.on(Passenger.name == Ticket.passenger)
+		.select(
+			Ticket.name,
+			Ticket.flight,
+			Passenger.email,
+			Flight.date_of_departure,
+			Flight.time_of_departure,
+			Flight.source_airport_code,
+			Flight.destination_airport_code,
+			Flight.gate,
+		)
+		.where(Flight.status == "Scheduled")
+		.where(Flight.date_of_departure.between(start.date(), end.date()))
+		.where(departure.between(start, end))
+		.where(Flight.docstatus < 2)
+		.where(Ticket.docstatus < 2)
+		.where(Ticket.status != "Cancelled")
+		.where(Ticket.departure_reminder_sent == 0)
+		.orderby(Flight.name)
+		.orderby(Ticket.name)
+	).run(as_dict=True)
+
+
+def get_departure(flight):
+	return get_datetime(f"{flight.date_of_departure} {flight.time_of_departure}")
+
+
+def send_flight_reminder(flight, recipients):
+	departure = format_datetime(get_departure(flight), "d MMMM, YYYY HH:mm")
+	gate = f" from gate {flight.gate}" if flight.gate else ""
+	frappe.sendmail(
+		recipients=recipients,
+		subject=f"Your flight {flight.source_airport_code} to {flight.destination_airport_code} departs soon",
+		message=(
+			f"<p>Your flight {flight.flight} from {flight.source_airport_code} to "
+			f"{flight.destination_airport_code} departs on {departure}{gate}.</p>"
+			"<p>Please arrive at the airport in good time. We wish you a pleasant journey.</p>"
+		),
+		reference_doctype="Airplane Flight",
+		reference_name=flight.flight,
+	)
+
+
+def mark_reminded(tickets):
+	Ticket = frappe.qb.DocType("Airplane Ticket")
+	frappe.qb.update(Ticket).set(Ticket.departure_reminder_sent, 1).where(Ticket.name.isin(tickets)).run()
+
+
+def send_digest(digest, start, end):
+	recipients = get_users_with_role("System Manager")
+	if not recipients:
+		return
+
+	rows = "".join(
+		f"<tr><td>{flight.flight}</td><td>{flight.source_airport_code} - {flight.destination_airport_code}</td>"
+		f"<td>{format_datetime(get_departure(flight), 'd MMM, HH:mm')}</td>"
+		f"<td>{tickets}</td><td>{emails}</td></tr>"
+		for flight, tickets, emails in digest
+	)
+	frappe.sendmail(
+		recipients=recipients,
+		subject=f"Departure reminders: {len(digest)} flights",
+		message=(
+			f"<p>Departure reminders were queued for flights departing between "
+			f"{format_datetime(start, 'd MMM, HH:mm')} and {format_datetime(end, 'd MMM, HH:mm')}.</p>"
+			"<table><tr><th>Flight</th><th>Route</th><th>Departure</th><th>Tickets</th><th>Emails</th></tr>"
+			f"{rows}</table>"
+		),
+	)
+	frappe.db.commit()
+
+
+def add_departure_index():
+	frappe.db.add_index("Airplane Flight", list(DEPARTURE_INDEX), index_name=DEPARTURE_INDEX_NAME)
@@ -0,0 +1,8 @@
+// Copyright (c) 2026, Me! and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Add-on Sales Rollup", {
+// 	refresh(frm) {
+
+// 	},
+// });
@@ -0,0 +1,96 @@
+# Copyright (c) 2026, Me! and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt
+
+from airplane_mode.report_cache import touch_doctypes
+from airplane_mode.utils import add_to_rollup
+
+# columns a rollup row is keyed by
+ROLLUP_KEY = ("item", "airline", "source_airport", "destination_airport", "date_of_departure")
+# Add-on Popularity filters on the date range, then airline and route, and groups by item
+REPORT_INDEX = ("date_of_departure", "airline", "source_airport", "destination_airport", "item")
+REPORT_INDEX_NAME = "add_on_report_index"
+REBUILD_CHUNK_SIZE = 1000
+
+
+class AddonSalesRollup(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Add-on Sales Rollup", list(REPORT_INDEX), index_name=REPORT_INDEX_NAME)
+
+
+def get_add_on_sales_query():
+	AddOn = frappe.qb.DocType("Airplane Ticket Add-on Item")
+	Ticket = frappe.qb.DocType("Airplane Ticket")
+	Flight = frappe.qb.DocType("Airplane Flight")
+	Airplane = frappe.qb.DocType("Airplane")
+	group = (
+		AddOn.item,
+		Airplane.airline,
+		Flight.source_airport,
+		Flight.destination_airport,
+		Flight.date_of_departure,
+	)
+	return (
+		(
+			frappe.qb.from_(AddOn)
+			.join(Ticket)
+			.on(Ticket.name == AddOn.parent)
+			.join(Flight)
+			.on(Flight.name == Ticket.flight)
+			.left_join(Airplane)
+			.on(Airplane.name == Flight.airplane)
+			.select(
+				*group,
+				frappe.qb.functions.Count("*").as_("quantity"),
+				frappe.qb.functions.Sum(AddOn.amount).as_("revenue"),
+			)
+			.where(AddOn.parenttype == "Airplane Ticket")
+			.where(AddOn.parentfield == "add_ons")
+			.groupby(*group)
+		),
+		AddOn,
+		Ticket,
+	)
+
+
+def add_ticket_add_on_sales(tickets, sign=1):
+	"""Add (or with `sign=-1` subtract) the add-ons of submitted tickets to their rollup rows."""
+	if not tickets:
+		return
+	query, AddOn, _ = get_add_on_sales_query()
+	rows = query.where(AddOn.parent.isin(tickets)).run(as_dict=True)
+	for row in rows:
+		row.quantity = sign * row.quantity
+		row.revenue = sign * flt(row.revenue)
+	update_add_on_sales_rollup(rows)
+
+
+def move_flight_add_on_sales(flight, old_key, new_key):
+	"""Move the add-on sales of a flight's submitted tickets from one rollup key to another."""
+	query, _, Ticket = get_add_on_sales_query()
+	rows = query.where(Ticket.flight == flight).where(Ticket.docstatus == 1).run(as_dict=True)
+	deltas = []
+	for row in rows:
+		deltas.append({**old_key, "item": row.item, "quantity": -row.quantity, "revenue": -flt(row.revenue)})
+		deltas.append({**new_key, "item": row.item, "quantity": row.quantity, "revenue": flt(row.revenue)})
+	update_add_on_sales_rollup(deltas)
+
+
+def update_add_on_sales_rollup(rows):
+	add_to_rollup("Add-on Sales Rollup", ROLLUP_KEY, ("quantity", "revenue"), rows)
+
+
+def rebuild_add_on_sales_rollup():
+	"""Recompute every rollup row from the add-ons of submitted tickets."""
+	query, _, Ticket = get_add_on_sales_query()
+	rows = query.where(Ticket.docstatus == 1).run(as_dict=True)
+	frappe.db.delete("Add-on Sales Rollup")
+	touch_doctypes("Add-on Sales Rollup")
+	for i in range(0, len(rows), REBUILD_CHUNK_SIZE):
+		update_add_on_sales_rollup(rows[i : i + REBUILD_CHUNK_SIZE])
@@ -0,0 +1,45 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+	create_test_ticket,
+)
+from airplane_mode.airplane_mode.flight_cancellation import cancel_flight_tickets
+from airplane_mode.airplane_mode.flight_operations import process_flight_tickets
+from airplane_mode.airplane_mode.report.add_on_popularity.add_on_popularity import execute
+from airplane_mode.airplane_mode.test_booking import create_test_add_on_type
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class IntegrationTestAddonSalesRollup(IntegrationTestCase):
+	"""
+	Integration tests for AddonSalesRollup.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def test_report_counts_only_submitted_add_ons(self):
+		flight = create_test_flight(capacity=3)
+		add_on = create_test_add_on_type()
+		for status in ("Boarded", "Booked"):
+			create_test_ticket(flight.name, status=status, add_ons=[{"item": add_on, "amount": 250}])
+		process_flight_tickets(flight.name, "Submit")
+
+		filters = {"source_airport": flight.source_airport, "from_date": flight.date_of_departure}
+		filters["to_date"] = filters["from_date"]
+		_, data, _, _, summary = execute(filters)
+		row = next(row for row in data if row.add_on_type == add_on)
+		self.assertEqual((row.sold_count, row.revenue), (1, 250))
+		self.assertEqual(summary[0]["value"], sum(row.sold_count for row in data))
+
+		cancel_flight_tickets(flight.name)
+		_, data, *_ = execute(filters)
+		self.assertNotIn(add_on, [row.add_on_type for row in data])
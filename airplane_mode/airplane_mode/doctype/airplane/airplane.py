@@ -4,6 +4,12 @@
 # import frappe
 from frappe.model.document import Document
 
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import sync_capacity
+
 
 class Airplane(Document):
-	pass
\ No newline at end of file
+	def on_update(self):
+		if self.flags.in_insert:
+			return
+		if self.has_value_changed("capacity") or self.has_value_changed("seats_per_row"):
+			sync_capacity(airplane=self.name)
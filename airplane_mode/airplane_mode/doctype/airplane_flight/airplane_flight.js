@@ -1,8 +1,68 @@
 // Copyright (c) 2025, Me! and contributors
 // For license information, please see license.txt
 
-// frappe.ui.form.on("Airplane Flight", {
-// 	refresh(frm) {
-
-// 	},
-// });
+frappe.ui.form.on("Airplane Flight", {
+	setup(frm) {
+		frm.set_query("crew_member", "crew_members", (doc) => ({
+			query: "airplane_mode.airplane_mode.crew_availability.crew_member_query",
+			filters: {
+				flight: doc.name,
+				airplane: doc.airplane,
+				date_of_departure: doc.date_of_departure,
+				time_of_departure: doc.time_of_departure,
+				duration: doc.duration,
+			},
+		}));
+		frappe.realtime.on("flight_operation_complete", (summary) => {
+			if (summary.flight !== frm.doc.name) {
+				return;
+			}
+			frappe.msgprint({
+				title: summary.operation,
+				message: `${summary.succeeded} of ${summary.total} tickets processed, ${summary.failed.length} failed.`,
+				indicator: summary.failed.length ? "orange" : "green",
+			});
+			frm.reload_doc();
+		});
+		frappe.realtime.on("flight_cancellation_complete", (summary) => {
+			if (summary.flight !== frm.doc.name) {
+				return;
+			}
+			frappe.show_alert({
+				message: `${summary.cancelled} tickets cancelled, ${summary.notified} passengers notified.`,
+				indicator: "green",
+			});
+			frm.reload_doc();
+		});
+	},
+	refresh(frm) {
+		if (frm.is_new()) {
+			return;
+		}
+		["Check In", "Board", "Submit"].forEach((operation) => {
+			frm.add_custom_button(operation, () => {
+				frappe.confirm(`${operation} all draft tickets of flight ${frm.doc.name}?`, () => {
+					frappe.call({
+						method: "airplane_mode.airplane_mode.flight_operations.run_flight_operation",
+						args: { flight: frm.doc.name, operation: operation },
+					});
+				});
+			}, "Tickets");
+		});
+		["csv", "jsonl"].forEach((format) => {
+			frm.add_custom_button(format.toUpperCase(), () => {
+				window.open(
+					"/api/method/airplane_mode.airplane_mode.manifest.download_manifest?" +
+						new URLSearchParams({ flight: frm.doc.name, format: format })
+				);
+			}, "Manifest");
+		});
+		if (frm.doc.docstatus < 2 && frm.doc.status === "Scheduled") {
+			frm.add_custom_button("Cancel Flight", () => {
+				frappe.confirm(`Cancel flight ${frm.doc.name} and all of its tickets?`, () => {
+					frm.call("cancel_flight").then(() => frm.reload_doc());
+				});
+			});
+		}
+	},
+});
@@ -3,23 +3,233 @@
 
 import frappe
 from datetime import timedelta
+from frappe.utils import now, nowdate
 from frappe.website.website_generator import WebsiteGenerator
 
+from airplane_mode.airplane_mode.availability import clear_availability_cache
+from airplane_mode.airplane_mode.crew_availability import (
+	clear_duty_indexes,
+	get_duty_window,
+	get_roster_conflicts,
+)
+from airplane_mode.airplane_mode.departure_reminders import add_departure_index
+from airplane_mode.airplane_mode.doctype.add_on_sales_rollup.add_on_sales_rollup import move_flight_add_on_sales
+from airplane_mode.airplane_mode.doctype.airplane_ticket.airplane_ticket import get_fetched_flight_fields
+from airplane_mode.airplane_mode.doctype.crew_member.crew_member import accrue_flying_hours
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import (
+	create_seat_inventory,
+	sync_capacity,
+)
+from airplane_mode.airplane_mode.doctype.revenue_rollup.revenue_rollup import ROLLUP_KEY, move_flight_revenue
+from airplane_mode.airplane_mode.flight_cancellation import enqueue_flight_cancellation
+from airplane_mode.airplane_mode.flight_search import add_search_index
+from airplane_mode.page_cache import clear_page_cache
+from airplane_mode.utils import reserve_series
+
+# flights with more tickets than this push their changes from a background job
+TICKET_UPDATE_QUEUE_THRESHOLD = 500
+TICKET_UPDATE_CHUNK_SIZE = 1000
+
 class AirplaneFlight(WebsiteGenerator):
+	def autoname(self):
+		self.name = reserve_series(get_name_prefix(self.airplane), digits=5, doctype="Airplane Flight")[0]
+
 	def calculate_eta(self):
 		if self.time_of_departure and self.duration:
-			# Duration is stored in seconds, convert to timedelta and add to time_of_departure
-			duration_timedelta = timedelta(seconds=self.duration)
-			# Combine date_of_departure and time_of_departure to get datetime
-			departure_datetime = frappe.utils.get_datetime(
-				f"{self.date_of_departure} {self.time_of_departure}"
+			# Duration is stored in seconds
+			self.eta = calculate_eta(self.date_of_departure, self.time_of_departure, self.duration)
+
+	def validate_crew(self):
+		"""Reject crew members listed twice or already on duty during this flight."""
+		crew_members = [row.crew_member for row in self.crew_members if row.crew_member]
+		duplicates = {crew_member for crew_member in crew_members if crew_members.count(crew_member) > 1}
+		if duplicates:
+			frappe.throw(
+				title="Duplicate Crew",
+				msg=f"Crew members {', '.join(sorted(duplicates))} are listed more than once."
 			)
-			eta_datetime = departure_datetime + duration_timedelta
-			self.eta = eta_datetime.date()
+		if not crew_members:
+			return
+
+		# lock the members so two flights saved at once cannot both take the same one
+		frappe.get_all("Crew Member", filters={"name": ["in", crew_members]}, for_update=True)
+		start, end = get_duty_window(self.date_of_departure, self.time_of_departure, self.duration)
+		conflicts = get_roster_conflicts(crew_members, start, end, exclude_flight=self.name, cached=False)
+		if conflicts:
+			frappe.throw(
+				title="Crew Unavailable",
+				msg="<br>".join(
+					f"{crew_member} is on duty on flight {', '.join(flights)}."
+					for crew_member, flights in conflicts.items()
+				)
+			)
+
+	def clear_crew_cache(self):
+		crew_members = [row.crew_member for row in self.crew_members]
+		before_save = self.get_doc_before_save()
+		if before_save:
+			crew_members += [row.crew_member for row in before_save.crew_members]
+		clear_duty_indexes(crew_members)
+
+	def validate(self):
+		self.validate_crew()
 
 	def on_submit(self):
-		self.status = "Completed"
+		accrue_flying_hours({row.crew_member for row in self.crew_members if row.crew_member}, self.duration)
+
+	def on_cancel(self):
+		self.clear_crew_cache()
+		accrue_flying_hours({row.crew_member for row in self.crew_members if row.crew_member}, -self.duration)
+
+	@frappe.whitelist()
+	def cancel_flight(self):
+		"""Mark a scheduled flight Cancelled and cancel its tickets in the background."""
+		self.check_permission("write")
+		frappe.has_permission("Airplane Ticket", "cancel", throw=True)
+		if self.status != "Scheduled":
+			frappe.throw(
+				title="Invalid Status",
+				msg=f"Cannot cancel a flight with status '{self.status}'."
+			)
+		queued = self.set_cancelled()
+		clear_page_cache(self)
+		if queued:
+			message = "Its tickets are being cancelled."
+		else:
+			message = "Its tickets will be cancelled by the cancellation job already running for it."
+		frappe.msgprint(f"Flight {self.name} has been cancelled. {message}", alert=True)
+
+	def set_cancelled(self):
+		"""Mark the flight Cancelled and return whether a new ticket cascade job was queued."""
+		self.db_set("status", "Cancelled")
+		clear_availability_cache(self.name)
+		return enqueue_flight_cancellation(self.name)
 
 	def before_save(self):
 		self.calculate_eta()
-	
\ No newline at end of file
+
+	def after_insert(self):
+		create_seat_inventory(self.name, self.airplane)
+
+	def on_update(self):
+		self.clear_crew_cache()
+		if self.flags.in_insert:
+			return
+		if self.has_value_changed("airplane"):
+			sync_capacity(flight=self.name)
+		if self.has_value_changed("fare") or self.has_value_changed("published"):
+			clear_availability_cache(self.name)
+		self.propagate_to_tickets()
+		self.move_revenue()
+
+	def on_update_after_submit(self):
+		self.clear_crew_cache()
+		self.propagate_to_tickets()
+		self.move_revenue()
+
+	def get_rollup_key(self, doc):
+		return {
+			"airline": frappe.get_cached_value("Airplane", doc.airplane, "airline"),
+			**{field: doc.get(field) for field in ROLLUP_KEY if field != "airline"},
+		}
+
+	def move_revenue(self):
+		"""Move ticket and add-on revenue in the rollups when the flight changes airplane, route or date."""
+		before_save = self.get_doc_before_save()
+		if not before_save:
+			return
+		old_key, new_key = self.get_rollup_key(before_save), self.get_rollup_key(self)
+		if old_key != new_key:
+			move_flight_revenue(self.name, old_key, new_key)
+			move_flight_add_on_sales(self.name, old_key, new_key)
+
+	def get_ticket_changes(self):
+		return {
+			ticket_field: self.get(flight_field)
+			for ticket_field, flight_field in get_fetched_flight_fields()
+			if self.has_value_changed(flight_field)
+		}
+
+	def propagate_to_tickets(self):
+		"""Copy changed fields that tickets fetch from this flight onto its issued tickets."""
+		changes = self.get_ticket_changes()
+		if not changes:
+			return
+
+		tickets = frappe.db.count("Airplane Ticket", {"flight": self.name, "docstatus": ["<", 2]})
+		if tickets > TICKET_UPDATE_QUEUE_THRESHOLD:
+			frappe.enqueue(
+				update_tickets,
+				queue="long",
+				enqueue_after_commit=True,
+				flight=self.name,
+				changes=changes,
+				commit=True,
+			)
+			frappe.msgprint(f"Updating {tickets} tickets in the background.", alert=True)
+		elif tickets:
+			update_tickets(self.name, changes)
+
+	def on_trash(self):
+		frappe.db.delete("Flight Seat Inventory", {"flight": self.name})
+		clear_availability_cache(self.name)
+		self.clear_crew_cache()
+
+
+def get_name_prefix(airplane, date=None):
+	"""Series key of the `{airplane}-{MM}-{YYYY}-{#####}` naming rule, dated at creation."""
+	date = date or nowdate()
+	return f"{airplane}-{date[5:7]}-{date[:4]}-"
+
+
+def calculate_eta(date_of_departure, time_of_departure, duration):
+	departure = frappe.utils.get_datetime(f"{date_of_departure} {time_of_departure}")
+	return (departure + timedelta(seconds=duration)).date()
+
+
+def on_doctype_update():
+	add_search_index()
+	add_departure_index()
+
+
+def update_tickets(flight, changes, chunk_size=TICKET_UPDATE_CHUNK_SIZE, commit=False):
+	"""Set `changes` on every draft and submitted ticket of a flight and return the number updated.
+
+	Tickets are walked in name order and updated with one statement per chunk. With
+	`commit`, as in the background job, each chunk is committed on its own and the
+	final count is recorded on the flight's timeline.
+	"""
+	Ticket = frappe.qb.DocType("Airplane Ticket")
+	updated = 0
+	last_name = ""
+	while True:
+		names = frappe.get_all(
+			"Airplane Ticket",
+			filters={"flight": flight, "docstatus": ["<", 2], "name": [">", last_name]},
+			order_by="name asc",
+			limit=chunk_size,
+			pluck="name",
+		)
+		if not names:
+			break
+
+		query = (
+			frappe.qb.update(Ticket)
+			.set(Ticket.modified, now())
+			.set(Ticket.modified_by, frappe.session.user)
+			.where(Ticket.name.isin(names))
+		)
+		for fieldname, value in changes.items():
+			query = query.set(Ticket[fieldname], value)
+		query.run()
+
+		updated += len(names)
+		last_name = names[-1]
+		if commit:
+			frappe.db.commit()
+
+	if commit:
+		frappe.get_doc("Airplane Flight", flight).add_comment(
+			"Info", f"Updated {', '.join(changes)} on {updated} tickets."
+		)
+	return updated
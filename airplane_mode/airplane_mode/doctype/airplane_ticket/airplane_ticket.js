@@ -3,16 +3,33 @@
 
 frappe.ui.form.on("Airplane Ticket", {
 	refresh(frm) {
+        if (frm.doc.docstatus !== 0 || frm.is_new()) {
+            return;
+        }
         frm.add_custom_button("Assign Seats", () => {
             ticket_name = frm.doc.name;
-            frappe.prompt({
-                label: "Seat",
-                fieldname: "seat",
-                fieldtype: "Data",
-            }, (value) => {
-                    frm.set_value("seat", value.seat);
-                    frappe.msgprint(`Seat ${value.seat} assigned to ticket ${ticket_name}.`);
-                }, "Enter seat number to assign: ", "Submit");
+            frappe.call({
+                method: "airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory.get_free_seats",
+                args: { flight: frm.doc.flight },
+            }).then((r) => {
+                const free_seats = r.message || [];
+                if (!free_seats.length) {
+                    frappe.msgprint(`No free seats left on flight ${frm.doc.flight}.`);
+                    return;
+                }
+                frappe.prompt({
+                    label: "Seat",
+                    fieldname: "seat",
+                    fieldtype: "Select",
+                    options: free_seats,
+                    reqd: 1,
+                }, (value) => {
+                        frm.set_value("seat", value.seat);
+                        frm.save().then(() => {
+                            frappe.msgprint(`Seat ${value.seat} assigned to ticket ${ticket_name}.`);
+                        });
+                    }, "Select a free seat to assign: ", "Submit");
+            });
         })
 	},
 });
@@ -3,10 +3,33 @@
 
 import frappe
 from frappe.model.document import Document
-import random
+
+from airplane_mode.airplane_mode.doctype.add_on_sales_rollup.add_on_sales_rollup import (
+	add_ticket_add_on_sales,
+)
+from airplane_mode.airplane_mode.doctype.airplane_ticket_add_on_type.airplane_ticket_add_on_type import (
+	get_add_on_catalog,
+	get_add_on_price,
+	needs_airline,
+)
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import (
+	allocate_seat,
+	release_seat,
+	reserve_seat,
+	update_seat_counters,
+)
+from airplane_mode.airplane_mode.doctype.flight_waitlist_entry.flight_waitlist_entry import (
+	promote_waitlist,
+)
+from airplane_mode.airplane_mode.doctype.revenue_rollup.revenue_rollup import add_ticket_revenue
+from airplane_mode.utils import reserve_series
 
 
 class AirplaneTicket(Document):
+	def autoname(self):
+		prefix = get_name_prefix(self.flight, self.source_airport_code, self.destination_airport_code)
+		self.name = reserve_series(prefix, doctype="Airplane Ticket")[0]
+
 	def remove_duplicate_add_ons(self):
 		if not self.add_ons:
 			return
@@ -18,25 +41,41 @@ class AirplaneTicket(Document):
 				seen_ids.add(add_on.item)
 		self.add_ons = unique_add_ons
 
-	def total_number_of_tickets(self):
-		count = frappe.db.count(
-			"Airplane Ticket",
-			filters={"flight": self.flight}
-		)
-		return count
-	
-	def total_number_of_seats(self):
-		flight = frappe.get_value("Airplane Flight", self.flight, "airplane")
-		return frappe.get_value("Airplane", flight, "capacity")
-
-	def is_flight_full(self):
-		return self.total_number_of_tickets() >= self.total_number_of_seats()
-
-	def generate_seat_number(self):
-		if not self.seat:
-			row = random.randint(1, 100)
-			seat = random.choice(['A', 'B', 'C', 'D', 'E'])
-			self.seat = f"{row}{seat}"
+	def get_airline(self):
+		airplane = frappe.get_cached_value("Airplane Flight", self.flight, "airplane")
+		return frappe.get_cached_value("Airplane", airplane, "airline")
+
+	def set_add_on_amounts(self):
+		"""Price add-ons that have no amount yet from the cached add-on catalog."""
+		# an explicit 0 is a deliberately free add-on, not a missing price
+		unpriced = [add_on for add_on in self.add_ons if add_on.get("amount") in (None, "")]
+		if not unpriced:
+			return
+		catalog = get_add_on_catalog()
+		airline = self.get_airline() if needs_airline(catalog, {add_on.item for add_on in unpriced}) else None
+		for add_on in unpriced:
+			amount = get_add_on_price(
+				catalog, add_on.item, airline, self.source_airport, self.destination_airport
+			)
+			if amount is not None:
+				add_on.amount = amount
+
+	def reserve_seat(self):
+		seat = reserve_seat(self.flight, self.seat)
+		if not seat:
+			frappe.throw(
+				title="Flight Full",
+				msg="Cannot issue ticket as the flight is already full."
+			)
+		self.seat = seat
+
+	def update_seat(self):
+		if self.is_new() or not self.has_value_changed("seat"):
+			return
+		previous_seat = self.get_doc_before_save().seat
+		if self.seat:
+			self.seat = allocate_seat(self.flight, self.seat)
+		release_seat(self.flight, previous_seat)
 	
 	def calculate_total_amount(self):
 		add_ons_fee = sum(add_on.amount for add_on in self.add_ons)
@@ -45,20 +84,61 @@ class AirplaneTicket(Document):
 	def is_status_boarded(self):
 		return self.status == "Boarded"
 
+	def validate_cancelled(self):
+		"""Only a flight cancellation moves a ticket into or out of Cancelled."""
+		before_save = self.get_doc_before_save()
+		was_cancelled = bool(before_save) and before_save.status == "Cancelled"
+		if was_cancelled or (self.status == "Cancelled" and self.docstatus == 0):
+			frappe.throw(
+				title="Invalid Status",
+				msg="Tickets are cancelled by cancelling them or their flight, and cannot be changed afterwards."
+			)
+
 	def validate(self):
-		self.calculate_total_amount()
+		self.validate_cancelled()
 		self.remove_duplicate_add_ons()
+		self.set_add_on_amounts()
+		self.calculate_total_amount()
+		self.update_seat()
 
 	def before_insert(self):
-		self.generate_seat_number()
-		if self.is_flight_full():
-			frappe.throw(
-				title="Flight Full",
-				msg="Cannot issue ticket as the flight is already full."
-			)
+		self.reserve_seat()
 
 	def before_submit(self):
 		if not self.is_status_boarded():
 			frappe.throw(
 				title="Invalid Status",
 				msg="Cannot submit ticket unless status is 'Boarded'.")
+
+	def on_submit(self):
+		update_seat_counters(self.flight, held=-1, sold=1)
+		add_ticket_revenue([self.name])
+		add_ticket_add_on_sales([self.name])
+
+	def on_cancel(self):
+		update_seat_counters(self.flight, sold=-1)
+		add_ticket_revenue([self.name], sign=-1)
+		add_ticket_add_on_sales([self.name], sign=-1)
+		release_seat(self.flight, self.seat)
+		promote_waitlist(self.flight)
+
+	def on_trash(self):
+		# drafts of a cancelled flight already gave their seat back
+		if self.docstatus == 0 and self.status != "Cancelled":
+			update_seat_counters(self.flight, held=-1)
+			release_seat(self.flight, self.seat)
+			promote_waitlist(self.flight)
+
+
+def get_name_prefix(flight, source_airport_code, destination_airport_code):
+	"""Series key of the `{flight}-{source_airport_code}-to-{destination_airport_code}-{###}` naming rule."""
+	return f"{flight}-{source_airport_code}-to-{destination_airport_code}-"
+
+
+def get_fetched_flight_fields():
+	"""Return (ticket field, flight field) pairs of the fields a ticket fetches from its flight."""
+	return [
+		(df.fieldname, df.fetch_from.split(".", 1)[1])
+		for df in frappe.get_meta("Airplane Ticket").fields
+		if df.fetch_from and df.fetch_from.startswith("flight.")
+	]
@@ -1,9 +1,88 @@
 # Copyright (c) 2025, Me! and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
+CATALOG_CACHE_KEY = "airplane_mode:add_on_catalog"
+CATALOG_VERSION_CACHE_KEY = "airplane_mode:add_on_catalog_version"
+
+# per-site (version, catalog) kept in process so validating a ticket costs one cache read
+_local_catalogs = {}
+
 
 class AirplaneTicketAddonType(Document):
-	pass
+	def on_update(self):
+		clear_add_on_catalog()
+
+	def on_trash(self):
+		clear_add_on_catalog()
+
+
+def clear_add_on_catalog():
+	"""Invalidate every process's copy of the catalog by moving to a new version."""
+	frappe.cache.set_value(CATALOG_VERSION_CACHE_KEY, frappe.generate_hash(length=10))
+	frappe.cache.delete_value(CATALOG_CACHE_KEY)
+
+
+def get_add_on_catalog():
+	"""Return {add-on type: [(airline, source airport, destination airport, amount), ...]}.
+
+	Rows of each add-on type are ordered from the most to the least specific, the
+	default amount coming last as a row matching everything.
+	"""
+	version = frappe.cache.get_value(CATALOG_VERSION_CACHE_KEY)
+	if version is None:
+		version = frappe.generate_hash(length=10)
+		frappe.cache.set_value(CATALOG_VERSION_CACHE_KEY, version)
+
+	local = _local_catalogs.get(frappe.local.site)
+	if local and local[0] == version:
+		return local[1]
+
+	cached = frappe.cache.get_value(CATALOG_CACHE_KEY)
+	if cached and cached[0] == version:
+		catalog = cached[1]
+	else:
+		catalog = build_add_on_catalog()
+		frappe.cache.set_value(CATALOG_CACHE_KEY, (version, catalog))
+
+	_local_catalogs[frappe.local.site] = (version, catalog)
+	return catalog
+
+
+def build_add_on_catalog():
+	catalog = {}
+	prices = frappe.get_all(
+		"Airplane Ticket Add-on Price",
+		filters={"parenttype": "Airplane Ticket Add-on Type"},
+		fields=["parent", "airline", "source_airport", "destination_airport", "amount"],
+	)
+	for price in prices:
+		catalog.setdefault(price.parent, []).append(
+			(price.airline, price.source_airport, price.destination_airport, price.amount)
+		)
+
+	for add_on_type in frappe.get_all("Airplane Ticket Add-on Type", fields=["name", "default_amount"]):
+		rows = catalog.setdefault(add_on_type.name, [])
+		# airline and route rows first, then route-only, then airline-only
+		rows.sort(key=lambda row: (sum(map(bool, row[:3])), bool(row[1] or row[2])), reverse=True)
+		if add_on_type.default_amount:
+			rows.append((None, None, None, add_on_type.default_amount))
+	return catalog
+
+
+def get_add_on_price(catalog, item, airline=None, source_airport=None, destination_airport=None):
+	"""Return the catalog amount of an add-on for a ticket, or None if it has no price."""
+	for row_airline, row_source, row_destination, amount in catalog.get(item, ()):
+		if (
+			(not row_airline or row_airline == airline)
+			and (not row_source or row_source == source_airport)
+			and (not row_destination or row_destination == destination_airport)
+		):
+			return amount
+	return None
+
+
+def needs_airline(catalog, items):
+	return any(row[0] for item in items for row in catalog.get(item, ()))
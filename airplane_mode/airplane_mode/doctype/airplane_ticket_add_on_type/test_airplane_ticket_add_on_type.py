@@ -1,9 +1,14 @@
 # Copyright (c) 2025, Me! and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests import IntegrationTestCase
 
+from airplane_mode.airplane_mode.doctype.airplane_ticket_add_on_type.airplane_ticket_add_on_type import (
+	get_add_on_catalog,
+	get_add_on_price,
+)
+
 
 # On IntegrationTestCase, the doctype test records and all
 # link-field test record dependencies are recursively loaded
@@ -19,4 +24,24 @@ class IntegrationTestAirplaneTicketAddonType(IntegrationTestCase):
 	Use this class for testing interactions between multiple components.
 	"""
 
-	pass
+	def test_most_specific_price_wins(self):
+		add_on = frappe.get_doc(
+			{
+				"doctype": "Airplane Ticket Add-on Type",
+				"name": "Test Priced Add-on",
+				"default_amount": 100,
+				"prices": [
+					{"source_airport": "Test Airport A", "amount": 150},
+					{"source_airport": "Test Airport A", "destination_airport": "Test Airport B", "amount": 175},
+				],
+			}
+		).insert(ignore_links=True)
+		catalog = get_add_on_catalog()
+
+		self.assertEqual(get_add_on_price(catalog, add_on.name, None, "Test Airport A", "Test Airport B"), 175)
+		self.assertEqual(get_add_on_price(catalog, add_on.name, None, "Test Airport A", "Test Airport C"), 150)
+		self.assertEqual(get_add_on_price(catalog, add_on.name, None, "Test Airport C", "Test Airport B"), 100)
+
+		add_on.default_amount = 120
+		add_on.save()
+		self.assertEqual(get_add_on_price(get_add_on_catalog(), add_on.name), 120)
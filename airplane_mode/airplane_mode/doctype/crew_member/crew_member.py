@@ -1,9 +1,9 @@
 # Copyright (c) 2025, Me! and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
-from frappe.utils import getdate, today
+from frappe.utils import flt, getdate, today
 
 class CrewMember(Document):
 	def set_full_name(self):
@@ -18,6 +18,26 @@ class CrewMember(Document):
 			today_date = getdate(today())
 			self.age = today_date.year - dob.year - ((today_date.month, today_date.day) < (dob.month, dob.day))
 
+	def update_total_flying_hours(self):
+		if self.is_new():
+			self.total_flying_hours = flt(self.opening_flying_hours)
+		elif self.has_value_changed("opening_flying_hours"):
+			previous = flt(self.get_doc_before_save().opening_flying_hours)
+			self.total_flying_hours = flt(self.total_flying_hours) + flt(self.opening_flying_hours) - previous
+
 	def before_save(self):
 		self.set_full_name()
-		self.set_age_from_dob()
\ No newline at end of file
+		self.set_age_from_dob()
+		self.update_total_flying_hours()
+
+
+def accrue_flying_hours(crew_members, seconds):
+	"""Add `seconds` of flying time, negative to reverse it, to each crew member in one statement."""
+	if not crew_members:
+		return
+	CrewMember = frappe.qb.DocType("Crew Member")
+	(
+		frappe.qb.update(CrewMember)
+		.set(CrewMember.total_flying_hours, CrewMember.total_flying_hours + seconds / 3600)
+		.where(CrewMember.name.isin(list(crew_members)))
+	).run()
@@ -0,0 +1,15 @@
+// Copyright (c) 2026, Me! and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on("Flight Schedule", {
+	refresh(frm) {
+		if (frm.is_new()) {
+			return;
+		}
+		frm.add_custom_button("Generate Flights", () => {
+			frm.call("generate_flights").then(() => {
+				frappe.set_route("List", "Airplane Flight", { flight_schedule: frm.doc.name });
+			});
+		});
+	},
+});
@@ -0,0 +1,175 @@
+# Copyright (c) 2026, Me! and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, date_diff, get_time, getdate, now
+
+from airplane_mode.airplane_mode.doctype.airplane_flight.airplane_flight import (
+	calculate_eta,
+	get_name_prefix,
+)
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import (
+	rebuild_seat_inventory,
+)
+from airplane_mode.page_cache import enqueue_page_cache_warmup
+from airplane_mode.utils import bulk_insert, reserve_series
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+# fields a generated flight copies from its schedule
+SCHEDULED_FIELDS = (
+	"airplane",
+	"source_airport",
+	"destination_airport",
+	"time_of_departure",
+	"duration",
+	"fare",
+	"published",
+)
+MAX_SCHEDULE_DAYS = 400
+
+
+class FlightSchedule(Document):
+	def validate(self):
+		if self.source_airport == self.destination_airport:
+			frappe.throw(title="Invalid Route", msg="Source and destination airports must be different.")
+		if date_diff(self.valid_to, self.valid_from) < 0:
+			frappe.throw(title="Invalid Period", msg="Valid To cannot be before Valid From.")
+		if date_diff(self.valid_to, self.valid_from) >= MAX_SCHEDULE_DAYS:
+			frappe.throw(
+				title="Invalid Period", msg=f"A schedule cannot span more than {MAX_SCHEDULE_DAYS} days."
+			)
+		if not any(self.get(day) for day in WEEKDAYS):
+			frappe.throw(title="No Days of Operation", msg="Select at least one day of the week.")
+
+	def get_departure_dates(self):
+		days = {index for index, day in enumerate(WEEKDAYS) if self.get(day)}
+		start = getdate(self.valid_from)
+		return [
+			date
+			for date in (add_days(start, offset) for offset in range(date_diff(self.valid_to, start) + 1))
+			if date.weekday() in days
+		]
+
+	@frappe.whitelist()
+	def generate_flights(self):
+		"""Bring the schedule's draft flights in line with its pattern and return what changed.
+
+		Missing departures are created with one block of names from the naming series and
+		multi-row inserts. Existing draft flights are saved only when they differ from
+		the schedule, and draft flights on dates the schedule no longer covers are deleted
+		if they have no tickets. Submitted flights are left alone.
+		"""
+		self.check_permission("write")
+		frappe.has_permission("Airplane Flight", "create", throw=True)
+
+		flights = {
+			flight.date_of_departure: flight
+			for flight in frappe.get_all(
+				"Airplane Flight",
+				filters={"flight_schedule": self.name, "docstatus": ["<", 2]},
+				fields=["name", "docstatus", "date_of_departure", *SCHEDULED_FIELDS],
+			)
+		}
+		dates = self.get_departure_dates()
+		scheduled = set(dates)
+
+		created = self.insert_flights([date for date in dates if date not in flights])
+		updated = self.update_flights([flights[date] for date in dates if date in flights])
+		deleted, kept = self.delete_flights(
+			[flight for date, flight in flights.items() if date not in scheduled]
+		)
+
+		if created and self.published:
+			enqueue_page_cache_warmup("Airplane Flight", created)
+		summary = {"created": len(created), "updated": updated, "deleted": deleted, "kept": kept}
+		frappe.msgprint(
+			f"{summary['created']} flights created, {updated} updated and {deleted} deleted."
+			+ (f" {kept} flights no longer on the schedule have tickets and were kept." if kept else ""),
+			alert=True,
+		)
+		return summary
+
+	def insert_flights(self, dates):
+		if not dates:
+			return []
+
+		airports = dict(
+			frappe.get_all(
+				"Airport",
+				filters={"name": ["in", [self.source_airport, self.destination_airport]]},
+				fields=["name", "code"],
+				as_list=True,
+			)
+		)
+		route_prefix = frappe.get_meta("Airplane Flight").route
+		flight = frappe.new_doc("Airplane Flight")
+		names = reserve_series(
+			get_name_prefix(self.airplane), len(dates), digits=5, doctype="Airplane Flight"
+		)
+
+		timestamp = now()
+		user = frappe.session.user
+		rows = [
+			{
+				"name": name,
+				"owner": user,
+				"creation": timestamp,
+				"modified": timestamp,
+				"modified_by": user,
+				"docstatus": 0,
+				"idx": 0,
+				"flight_schedule": self.name,
+				"status": "Scheduled",
+				"date_of_departure": date,
+				"eta": calculate_eta(date, self.time_of_departure, self.duration),
+				"source_airport_code": airports.get(self.source_airport),
+				"destination_airport_code": airports.get(self.destination_airport),
+				"route": f"{route_prefix}/{flight.scrub(name)}",
+				**{field: self.get(field) for field in SCHEDULED_FIELDS},
+			}
+			for name, date in zip(names, dates, strict=True)
+		]
+		bulk_insert("Airplane Flight", rows)
+		rebuild_seat_inventory(names)
+		return names
+
+	def update_flights(self, flights):
+		updated = 0
+		for flight in flights:
+			if flight.docstatus != 0 or not self.differs_from(flight):
+				continue
+			doc = frappe.get_doc("Airplane Flight", flight.name)
+			doc.update({field: self.get(field) for field in SCHEDULED_FIELDS})
+			doc.save()
+			updated += 1
+		return updated
+
+	def differs_from(self, flight):
+		for field in SCHEDULED_FIELDS:
+			value, scheduled = flight.get(field), self.get(field)
+			if field == "time_of_departure":
+				value, scheduled = get_time(value), get_time(scheduled)
+			if (value or None) != (scheduled or None):
+				return True
+		return False
+
+	def delete_flights(self, flights):
+		drafts = [flight.name for flight in flights if flight.docstatus == 0]
+		with_tickets = set()
+		if drafts:
+			with_tickets = set(
+				frappe.get_all(
+					"Airplane Ticket",
+					filters={"flight": ["in", drafts], "docstatus": ["<", 2]},
+					pluck="flight",
+					distinct=True,
+				)
+			)
+
+		deleted = 0
+		for name in drafts:
+			if name not in with_tickets:
+				frappe.delete_doc("Airplane Flight", name)
+				deleted += 1
+		return deleted, len(flights) - deleted
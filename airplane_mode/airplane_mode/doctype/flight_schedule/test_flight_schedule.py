@@ -0,0 +1,82 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, getdate, today
+
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+	create_test_ticket,
+)
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+def create_test_schedule(**kwargs):
+	flight = create_test_flight()
+	start = add_days(today(), 30)
+	return frappe.get_doc(
+		{
+			"doctype": "Flight Schedule",
+			"airplane": flight.airplane,
+			"source_airport": flight.source_airport,
+			"destination_airport": flight.destination_airport,
+			"time_of_departure": "08:30:00",
+			"duration": 5400,
+			"valid_from": start,
+			"valid_to": add_days(start, 13),
+			"monday": 1,
+			"friday": 1,
+			**kwargs,
+		}
+	).insert()
+
+
+def get_schedule_flights(schedule):
+	return frappe.get_all(
+		"Airplane Flight",
+		filters={"flight_schedule": schedule},
+		fields=["name", "date_of_departure", "time_of_departure", "eta"],
+		order_by="date_of_departure asc",
+	)
+
+
+class IntegrationTestFlightSchedule(IntegrationTestCase):
+	"""
+	Integration tests for FlightSchedule.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def test_generates_one_flight_per_scheduled_day(self):
+		schedule = create_test_schedule()
+		summary = schedule.generate_flights()
+
+		flights = get_schedule_flights(schedule.name)
+		self.assertEqual(summary["created"], 4)
+		self.assertEqual({getdate(f.date_of_departure).weekday() for f in flights}, {0, 4})
+		self.assertEqual(len({f.name for f in flights}), 4)
+		self.assertTrue(all(frappe.db.exists("Flight Seat Inventory", f.name) for f in flights))
+
+	def test_regenerate_touches_only_changed_flights(self):
+		schedule = create_test_schedule()
+		schedule.generate_flights()
+		self.assertEqual(schedule.generate_flights(), {"created": 0, "updated": 0, "deleted": 0, "kept": 0})
+
+		first = get_schedule_flights(schedule.name)[0]
+		create_test_ticket(first.name)
+		schedule.reload()
+		schedule.monday = 0
+		schedule.friday = 0
+		schedule.wednesday = 1
+		schedule.time_of_departure = "23:30:00"
+		schedule.save()
+
+		summary = schedule.generate_flights()
+		self.assertEqual(summary["created"], 2)
+		self.assertEqual(summary["kept"], 1)
+		self.assertEqual(summary["deleted"], 3)
@@ -0,0 +1,251 @@
+# Copyright (c) 2026, Me! and contributors
+# For license information, please see license.txt
+
+from collections import defaultdict
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now
+
+from airplane_mode.airplane_mode.availability import clear_availability_cache
+from airplane_mode.airplane_mode.seat_map import SeatMap
+
+
+class FlightSeatInventory(Document):
+	pass
+
+
+def get_seat_inventory(flight, for_update=False):
+	"""Return the capacity, counters and seat map of a flight, creating its inventory if missing.
+
+	With `for_update` the inventory row stays locked until the transaction ends, which
+	serialises seat changes on this flight without blocking other flights.
+	"""
+	fields = ["capacity", "seats_sold", "seats_held", "seats_per_row", "seat_map"]
+	inventory = frappe.db.get_value(
+		"Flight Seat Inventory", flight, fields, as_dict=True, for_update=for_update
+	)
+	if not inventory:
+		rebuild_seat_inventory([flight])
+		inventory = frappe.db.get_value(
+			"Flight Seat Inventory", flight, fields, as_dict=True, for_update=for_update
+		)
+	return inventory
+
+
+def get_seat_map(inventory):
+	return SeatMap.from_hex(inventory.capacity, inventory.seats_per_row, inventory.seat_map)
+
+
+def save_seat_map(flight, seat_map):
+	frappe.db.sql(
+		"UPDATE `tabFlight Seat Inventory` SET seat_map = %s WHERE name = %s",
+		(seat_map.to_hex(), flight),
+	)
+
+
+def allocate_seat(flight, seat=None):
+	"""Take `seat`, or the first free seat, on the flight and return its label.
+
+	Returns None when no seat is left. Requesting a seat that does not exist on
+	the aircraft or is already taken raises a validation error.
+	"""
+	inventory = get_seat_inventory(flight, for_update=True)
+	return take_seat(flight, inventory, seat) if inventory else None
+
+
+def take_seat(flight, inventory, seat=None):
+	"""Mark a seat taken on a locked inventory and return its label, or None if none is free."""
+	seat_map = get_seat_map(inventory)
+	if seat:
+		index = seat_map.index(seat)
+		if index is None:
+			frappe.throw(title="Invalid Seat", msg=f"Seat {seat} does not exist on flight {flight}.")
+		if seat_map.is_taken(index):
+			frappe.throw(title="Seat Taken", msg=f"Seat {seat} is already taken on flight {flight}.")
+	else:
+		index = seat_map.next_free()
+		if index is None:
+			return None
+
+	seat_map.take(index)
+	save_seat_map(flight, seat_map)
+	return seat_map.label(index)
+
+
+def reserve_seat(flight, seat=None):
+	"""Hold a seat for a new draft ticket and return its label, or None if the flight is full.
+
+	The capacity check, the seat allocation and the held counter increment all
+	happen under the flight's inventory row lock, so concurrent bookings on one
+	flight are serialised and can never oversell it. Bookings on other flights
+	lock other rows and are not blocked.
+	"""
+	inventory = get_seat_inventory(flight, for_update=True)
+	if not inventory or inventory.seats_sold + inventory.seats_held >= inventory.capacity:
+		return None
+
+	seat = take_seat(flight, inventory, seat)
+	if seat:
+		update_seat_counters(flight, held=1)
+	return seat
+
+
+def release_seat(flight, seat):
+	release_seats(flight, [seat])
+
+
+def release_seats(flight, seats):
+	"""Free the given seats on the flight's seat map with one read and one write."""
+	seats = [seat for seat in seats if seat]
+	if not seats:
+		return
+	inventory = get_seat_inventory(flight, for_update=True)
+	if not inventory:
+		return
+
+	seat_map = get_seat_map(inventory)
+	indexes = [index for index in map(seat_map.index, seats) if index is not None]
+	if indexes:
+		for index in indexes:
+			seat_map.release(index)
+		save_seat_map(flight, seat_map)
+
+
+@frappe.whitelist()
+def get_free_seats(flight):
+	"""Return the labels of the seats still free on a flight."""
+	frappe.has_permission("Airplane Flight", "read", flight, throw=True)
+	inventory = get_seat_inventory(flight)
+	return get_seat_map(inventory).free_seats() if inventory else []
+
+
+def update_seat_counters(flight, held=0, sold=0):
+	"""Atomically shift the held and sold counters of a flight by the given deltas."""
+	frappe.db.sql(
+		"""
+		UPDATE `tabFlight Seat Inventory`
+		SET seats_held = seats_held + %(held)s, seats_sold = seats_sold + %(sold)s
+		WHERE name = %(flight)s
+		""",
+		{"flight": flight, "held": held, "sold": sold},
+	)
+	clear_availability_cache(flight)
+
+
+def create_seat_inventory(flight, airplane):
+	capacity, seats_per_row = frappe.db.get_value("Airplane", airplane, ["capacity", "seats_per_row"])
+	frappe.get_doc(
+		{
+			"doctype": "Flight Seat Inventory",
+			"flight": flight,
+			"airplane": airplane,
+			"capacity": capacity or 0,
+			"seats_per_row": seats_per_row,
+		}
+	).insert(ignore_permissions=True)
+
+
+def sync_capacity(airplane=None, flight=None):
+	"""Copy the airplane's capacity and layout onto the inventories of its flights (or one flight)."""
+	conditions = "inv.airplane = %(airplane)s" if airplane else "inv.flight = %(flight)s"
+	frappe.db.sql(
+		f"""
+		UPDATE `tabFlight Seat Inventory` inv
+		JOIN `tabAirplane Flight` f ON f.name = inv.flight
+		JOIN `tabAirplane` a ON a.name = f.airplane
+		SET inv.airplane = f.airplane, inv.capacity = a.capacity, inv.seats_per_row = a.seats_per_row
+		WHERE {conditions}
+		""",
+		{"airplane": airplane, "flight": flight},
+	)
+	if airplane:
+		flights = frappe.get_all("Flight Seat Inventory", filters={"airplane": airplane}, pluck="name")
+	else:
+		flights = [flight]
+	if flights:
+		rebuild_seat_maps(flights)
+		clear_availability_cache(*flights)
+
+
+def rebuild_seat_inventory(flights=None):
+	"""Rebuild seat inventories from `tabAirplane Ticket`.
+
+	Missing inventories are created from the flight's airplane capacity, then the
+	held (draft) and sold (submitted) counters are recomputed in one pass and the
+	seat maps are redrawn. Cancelled tickets, including drafts of a cancelled
+	flight left at docstatus 0, do not hold a seat.
+	"""
+	values = {"flights": tuple(flights or ()), "now": now(), "user": frappe.session.user}
+	flight_filter = "AND f.name IN %(flights)s" if flights else ""
+	ticket_filter = "AND flight IN %(flights)s" if flights else ""
+
+	frappe.db.sql(
+		f"""
+		INSERT INTO `tabFlight Seat Inventory`
+			(name, flight, airplane, capacity, seats_per_row, seats_sold, seats_held,
+			creation, modified, owner, modified_by, docstatus, idx)
+		SELECT f.name, f.name, f.airplane, COALESCE(a.capacity, 0), a.seats_per_row, 0, 0,
+			%(now)s, %(now)s, %(user)s, %(user)s, 0, 0
+		FROM `tabAirplane Flight` f
+		LEFT JOIN `tabAirplane` a ON a.name = f.airplane
+		LEFT JOIN `tabFlight Seat Inventory` inv ON inv.name = f.name
+		WHERE inv.name IS NULL {flight_filter}
+		""",
+		values,
+	)
+
+	frappe.db.sql(
+		f"""
+		UPDATE `tabFlight Seat Inventory` inv
+		JOIN `tabAirplane Flight` f ON f.name = inv.flight
+		LEFT JOIN `tabAirplane` a ON a.name = f.airplane
+		LEFT JOIN (
+			SELECT flight, SUM(docstatus = 1) AS sold, SUM(docstatus = 0) AS held
+			FROM `tabAirplane Ticket`
+			WHERE docstatus < 2 AND status != 'Cancelled' {ticket_filter}
+			GROUP BY flight
+		) t ON t.flight = inv.flight
+		SET inv.airplane = f.airplane,
+			inv.capacity = COALESCE(a.capacity, 0),
+			inv.seats_per_row = a.seats_per_row,
+			inv.seats_sold = COALESCE(t.sold, 0),
+			inv.seats_held = COALESCE(t.held, 0),
+			inv.modified = %(now)s
+		WHERE 1 = 1 {flight_filter}
+		""",
+		values,
+	)
+
+	rebuild_seat_maps(flights)
+
+
+def rebuild_seat_maps(flights=None):
+	"""Redraw seat maps from the seats of draft and submitted tickets.
+
+	Seats that do not exist on the aircraft layout, or that are already taken by
+	another ticket, are left out of the map.
+	"""
+	filters = {"flight": ["in", flights]} if flights else {}
+	inventories = frappe.get_all(
+		"Flight Seat Inventory", filters=filters, fields=["name", "capacity", "seats_per_row"]
+	)
+	if not inventories:
+		return
+
+	seats = defaultdict(list)
+	tickets = frappe.get_all(
+		"Airplane Ticket",
+		filters={**filters, "docstatus": ["<", 2], "status": ["!=", "Cancelled"], "seat": ["is", "set"]},
+		fields=["flight", "seat"],
+	)
+	for ticket in tickets:
+		seats[ticket.flight].append(ticket.seat)
+
+	for inventory in inventories:
+		seat_map = SeatMap(inventory.capacity, inventory.seats_per_row)
+		for seat in seats.get(inventory.name, ()):
+			index = seat_map.index(seat)
+			if index is not None:
+				seat_map.take(index)
+		save_seat_map(inventory.name, seat_map)
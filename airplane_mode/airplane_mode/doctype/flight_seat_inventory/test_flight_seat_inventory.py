@@ -0,0 +1,156 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, today
+
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import (
+	get_free_seats,
+	rebuild_seat_inventory,
+)
+from airplane_mode.airplane_mode.seat_map import SeatMap
+from airplane_mode.airport_management.test_tasks import (
+	create_test_airline,
+	create_test_airplane,
+	create_test_airport,
+)
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+def create_test_flight(capacity=2):
+	airline = create_test_airline("Test Airline")
+	airplane = create_test_airplane(airline, model="Test Model", capacity=capacity)
+	source = create_test_airport("TEST-AIRPORT-1", "TST1", "Test City 1", "Test Country")
+	destination = create_test_airport("TEST-AIRPORT-2", "TST2", "Test City 2", "Test Country")
+	flight = frappe.get_doc(
+		{
+			"doctype": "Airplane Flight",
+			"airplane": airplane,
+			"date_of_departure": add_days(today(), 7),
+			"time_of_departure": "10:00:00",
+			"duration": 7200,
+			"source_airport": source,
+			"destination_airport": destination,
+		}
+	)
+	flight.insert()
+	return flight
+
+
+def create_test_passenger():
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "Flight Passenger",
+				"first_name": "Test",
+				"last_name": frappe.generate_hash(length=8),
+				"date_of_birth": "1990-01-01",
+			}
+		)
+		.insert()
+		.name
+	)
+
+
+def create_test_ticket(flight, **kwargs):
+	return frappe.get_doc(
+		{
+			"doctype": "Airplane Ticket",
+			"passenger": create_test_passenger(),
+			"flight": flight,
+			"flight_price": 1000,
+			**kwargs,
+		}
+	).insert()
+
+
+def get_counters(flight):
+	return frappe.db.get_value(
+		"Flight Seat Inventory", flight, ["capacity", "seats_sold", "seats_held"], as_dict=True
+	)
+
+
+class IntegrationTestFlightSeatInventory(IntegrationTestCase):
+	"""
+	Integration tests for FlightSeatInventory.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def test_inventory_created_from_airplane_capacity(self):
+		flight = create_test_flight(capacity=3)
+		self.assertEqual(get_counters(flight.name), {"capacity": 3, "seats_sold": 0, "seats_held": 0})
+
+	def test_counters_follow_ticket_lifecycle(self):
+		flight = create_test_flight(capacity=2)
+
+		ticket = create_test_ticket(flight.name)
+		self.assertEqual(get_counters(flight.name).seats_held, 1)
+
+		ticket.status = "Boarded"
+		ticket.submit()
+		counters = get_counters(flight.name)
+		self.assertEqual((counters.seats_held, counters.seats_sold), (0, 1))
+
+		ticket.cancel()
+		counters = get_counters(flight.name)
+		self.assertEqual((counters.seats_held, counters.seats_sold), (0, 0))
+
+	def test_full_flight_rejects_ticket(self):
+		flight = create_test_flight(capacity=1)
+		create_test_ticket(flight.name)
+		self.assertRaises(frappe.ValidationError, create_test_ticket, flight.name)
+
+	def test_rebuild_matches_tickets(self):
+		flight = create_test_flight(capacity=5)
+		create_test_ticket(flight.name)
+		create_test_ticket(flight.name)
+		frappe.db.set_value("Flight Seat Inventory", flight.name, {"seats_held": 40, "seats_sold": 7})
+
+		rebuild_seat_inventory([flight.name])
+		self.assertEqual(get_counters(flight.name), {"capacity": 5, "seats_sold": 0, "seats_held": 2})
+
+	def test_seats_are_unique_and_within_layout(self):
+		flight = create_test_flight(capacity=3)
+		seats = [create_test_ticket(flight.name).seat for _ in range(3)]
+		self.assertEqual(seats, ["1A", "1B", "1C"])
+		self.assertEqual(get_free_seats(flight.name), [])
+
+	def test_requested_seat(self):
+		flight = create_test_flight(capacity=12)
+		self.assertEqual(create_test_ticket(flight.name, seat="2b").seat, "2B")
+		self.assertRaises(frappe.ValidationError, create_test_ticket, flight.name, seat="2B")
+		self.assertRaises(frappe.ValidationError, create_test_ticket, flight.name, seat="3A")
+		self.assertNotIn("2B", get_free_seats(flight.name))
+
+	def test_cancelled_seat_is_released(self):
+		flight = create_test_flight(capacity=2)
+		ticket = create_test_ticket(flight.name)
+		ticket.status = "Boarded"
+		ticket.submit()
+		ticket.cancel()
+		self.assertIn(ticket.seat, get_free_seats(flight.name))
+
+
+class TestSeatMap(IntegrationTestCase):
+	def test_labels_follow_layout(self):
+		seat_map = SeatMap(capacity=8, seats_per_row=4)
+		self.assertEqual(seat_map.free_seats(), ["1A", "1B", "1C", "1D", "2A", "2B", "2C", "2D"])
+		self.assertEqual(seat_map.index("2C"), 6)
+		self.assertIsNone(seat_map.index("3A"))
+		self.assertIsNone(seat_map.index("1E"))
+
+	def test_next_free_skips_taken_seats(self):
+		seat_map = SeatMap(capacity=4, seats_per_row=2)
+		seat_map.take(0)
+		seat_map.take(1)
+		self.assertEqual(seat_map.next_free(), 2)
+		seat_map.release(0)
+		self.assertEqual(seat_map.next_free(), 0)
+		restored = SeatMap.from_hex(4, 2, seat_map.to_hex())
+		self.assertEqual(restored.taken_count(), 1)
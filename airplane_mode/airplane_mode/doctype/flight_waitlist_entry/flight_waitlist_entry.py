@@ -0,0 +1,205 @@
+# Copyright (c) 2026, Me! and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now
+
+# entries are named from an auto-increment sequence, so name order is queue order
+WAITLIST_INDEX = ("flight", "status", "name")
+WAITLIST_INDEX_NAME = "waitlist_index"
+
+
+class FlightWaitlistEntry(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Flight Waitlist Entry", list(WAITLIST_INDEX), index_name=WAITLIST_INDEX_NAME)
+
+
+def add_to_waitlist(flight, passenger, flight_price=None):
+	"""Append a passenger to a flight's waitlist and return the entry name.
+
+	This is a single insert that takes no lock on the flight. A passenger already
+	waiting on the flight keeps their place.
+	"""
+	entry = frappe.db.get_value(
+		"Flight Waitlist Entry", {"flight": flight, "passenger": passenger, "status": "Waiting"}
+	)
+	if entry:
+		return entry
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "Flight Waitlist Entry",
+				"flight": flight,
+				"passenger": passenger,
+				"flight_price": flight_price,
+			}
+		)
+		.insert(ignore_permissions=True)
+		.name
+	)
+
+
+@frappe.whitelist()
+def get_waitlist_position(flight, passenger):
+	"""Return the passenger's 1-based place in the flight's waitlist, or None if not waiting.
+
+	Both lookups are range reads on `waitlist_index`.
+	"""
+	frappe.has_permission("Flight Waitlist Entry", "read", throw=True)
+	return get_position(flight, passenger)
+
+
+def get_position(flight, passenger):
+	entry = frappe.db.get_value(
+		"Flight Waitlist Entry", {"flight": flight, "passenger": passenger, "status": "Waiting"}
+	)
+	if not entry:
+		return None
+	ahead = frappe.db.count(
+		"Flight Waitlist Entry", {"flight": flight, "status": "Waiting", "name": ["<", entry]}
+	)
+	return ahead + 1
+
+
+def promote_waitlist(flight):
+	"""Issue the freed seat on a flight to the head of its waitlist and return the new ticket.
+
+	Called when a ticket releases its seat, in the same transaction and under the
+	flight's inventory lock, so no other booking can take the seat in between.
+	Each promotion runs under a savepoint: an entry whose ticket fails validation
+	(its passenger was deleted, say) is marked Failed and the next one is tried,
+	so the cancellation that freed the seat never fails because of the queue.
+	"""
+	if frappe.db.get_value("Airplane Flight", flight, "status") != "Scheduled":
+		return None
+	inventory = frappe.db.get_value(
+		"Flight Seat Inventory",
+		flight,
+		["capacity", "seats_sold", "seats_held"],
+		as_dict=True,
+		for_update=True,
+	)
+	if not inventory or inventory.seats_sold + inventory.seats_held >= inventory.capacity:
+		return None
+
+	while entry := get_waitlist_head(flight):
+		ticket = promote_entry(flight, entry)
+		if ticket:
+			frappe.enqueue(
+				notify_promotions,
+				job_id="waitlist_promotions",
+				deduplicate=True,
+				enqueue_after_commit=True,
+			)
+			return ticket
+	return None
+
+
+def get_waitlist_head(flight):
+	Entry = frappe.qb.DocType("Flight Waitlist Entry")
+	entry = (
+		frappe.qb.from_(Entry)
+		.select(Entry.name, Entry.passenger, Entry.flight_price)
+		.where(Entry.flight == flight)
+		.where(Entry.status == "Waiting")
+		.orderby(Entry.name)
+		.limit(1)
+		.for_update()
+	).run(as_dict=True)
+	return entry[0] if entry else None
+
+
+def promote_entry(flight, entry):
+	"""Issue a ticket for one entry and return its name, or mark the entry Failed and return None."""
+	savepoint = "promote_waitlist"
+	frappe.db.savepoint(savepoint)
+	try:
+		ticket = frappe.get_doc(
+			{
+				"doctype": "Airplane Ticket",
+				"flight": flight,
+				"passenger": entry.passenger,
+				"flight_price": entry.flight_price
+				or frappe.db.get_value("Airplane Flight", flight, "fare")
+				or 0,
+			}
+		)
+		ticket.insert(ignore_permissions=True)
+	except frappe.ValidationError:
+		frappe.db.rollback(save_point=savepoint)
+		# keep the failed insert's message out of the cancellation's response
+		frappe.clear_last_message()
+		frappe.log_error(
+			f"Could not promote waitlist entry {entry.name}",
+			reference_doctype="Flight Waitlist Entry",
+			reference_name=entry.name,
+		)
+		frappe.db.set_value("Flight Waitlist Entry", entry.name, "status", "Failed", update_modified=True)
+		return None
+
+	frappe.db.release_savepoint(savepoint)
+	frappe.db.set_value(
+		"Flight Waitlist Entry",
+		entry.name,
+		{"status": "Promoted", "ticket": ticket.name},
+		update_modified=True,
+	)
+	return ticket.name
+
+
+def notify_promotions():
+	"""Email every promoted passenger not notified yet, with one job for all pending promotions."""
+	Entry = frappe.qb.DocType("Flight Waitlist Entry")
+	Passenger = frappe.qb.DocType("Flight Passenger")
+	Ticket = frappe.qb.DocType("Airplane Ticket")
+	entries = (
+		frappe.qb.from_(Entry)
+		.join(Ticket)
+		.on(Ticket.name == Entry.ticket)
+		.left_join(Passenger)
+		.on(Passenger.name == Entry.passenger)
+		.select(Entry.name, Entry.flight, Entry.ticket, Ticket.seat, Passenger.email)
+		.where(Entry.status == "Promoted")
+		.where(Entry.notified == 0)
+		.orderby(Entry.name)
+	).run(as_dict=True)
+	if not entries:
+		return
+
+	for entry in entries:
+		if not entry.email:
+			continue
+		frappe.sendmail(
+			recipients=[entry.email],
+			subject=f"A seat is now available on flight {entry.flight}",
+			message=(
+				f"<p>Good news! A seat has opened up on flight {entry.flight} and ticket "
+				f"{entry.ticket} (seat {entry.seat}) has been issued to you from the waitlist.</p>"
+			),
+			reference_doctype="Airplane Ticket",
+			reference_name=entry.ticket,
+		)
+
+	(
+		frappe.qb.update(Entry)
+		.set(Entry.notified, 1)
+		.set(Entry.modified, now())
+		.where(Entry.name.isin([entry.name for entry in entries]))
+	).run()
+	frappe.db.commit()
+
+
+def cancel_waitlist(flight):
+	"""Close the waitlist of a cancelled flight."""
+	Entry = frappe.qb.DocType("Flight Waitlist Entry")
+	(
+		frappe.qb.update(Entry)
+		.set(Entry.status, "Cancelled")
+		.set(Entry.modified, now())
+		.where(Entry.flight == flight)
+		.where(Entry.status == "Waiting")
+	).run()
@@ -0,0 +1,84 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from airplane_mode.airplane_mode.booking import book_ticket
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+	create_test_passenger,
+	create_test_ticket,
+	get_counters,
+)
+from airplane_mode.airplane_mode.doctype.flight_waitlist_entry.flight_waitlist_entry import (
+	add_to_waitlist,
+	get_waitlist_position,
+)
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class IntegrationTestFlightWaitlistEntry(IntegrationTestCase):
+	"""
+	Integration tests for FlightWaitlistEntry.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def test_freed_seat_goes_to_head_of_waitlist(self):
+		flight = create_test_flight(capacity=1)
+		ticket = create_test_ticket(flight.name)
+		first, second = create_test_passenger(), create_test_passenger()
+		first_entry = add_to_waitlist(flight.name, first, 1000)
+		add_to_waitlist(flight.name, second, 1000)
+		self.assertEqual(add_to_waitlist(flight.name, first, 1000), first_entry)
+		self.assertEqual(get_waitlist_position(flight.name, second), 2)
+
+		frappe.delete_doc("Airplane Ticket", ticket.name)
+
+		status, promoted_ticket = frappe.db.get_value(
+			"Flight Waitlist Entry", first_entry, ["status", "ticket"]
+		)
+		self.assertEqual(status, "Promoted")
+		self.assertEqual(frappe.db.get_value("Airplane Ticket", promoted_ticket, "passenger"), first)
+		self.assertEqual(get_waitlist_position(flight.name, second), 1)
+		self.assertEqual(get_counters(flight.name).seats_held, 1)
+
+	def test_full_flight_waitlists_instead_of_failing(self):
+		flight = create_test_flight(capacity=1)
+		create_test_ticket(flight.name)
+		flight.db_set("fare", 1500)
+		passenger = create_test_passenger()
+
+		frappe.set_user("Guest")
+		try:
+			result = book_ticket(flight.name, passenger)
+		finally:
+			frappe.set_user("Administrator")
+
+		self.assertFalse(result.get("ticket"))
+		self.assertEqual(result.waitlist_position, 1)
+		entry = frappe.db.get_value(
+			"Flight Waitlist Entry", result.waitlist_entry, ["status", "flight_price"], as_dict=True
+		)
+		self.assertEqual((entry.status, entry.flight_price), ("Waiting", 1500))
+		self.assertFalse(frappe.db.exists("Airplane Ticket", {"passenger": passenger}))
+
+	def test_invalid_head_of_waitlist_is_skipped(self):
+		flight = create_test_flight(capacity=1)
+		ticket = create_test_ticket(flight.name)
+		first, second = create_test_passenger(), create_test_passenger()
+		first_entry = add_to_waitlist(flight.name, first, 1000)
+		second_entry = add_to_waitlist(flight.name, second, 1000)
+		# a passenger removed behind the waitlist's back fails link validation on promotion
+		frappe.db.delete("Flight Passenger", first)
+
+		frappe.delete_doc("Airplane Ticket", ticket.name)
+
+		self.assertFalse(frappe.db.exists("Airplane Ticket", ticket.name))
+		self.assertEqual(frappe.db.get_value("Flight Waitlist Entry", first_entry, "status"), "Failed")
+		self.assertEqual(frappe.db.get_value("Flight Waitlist Entry", second_entry, "status"), "Promoted")
@@ -0,0 +1,107 @@
+# Copyright (c) 2026, Me! and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt
+
+from airplane_mode.report_cache import touch_doctypes
+from airplane_mode.utils import add_to_rollup
+
+# columns a rollup row is keyed by
+ROLLUP_KEY = ("airline", "source_airport", "destination_airport", "date_of_departure")
+# Revenue by Airline joins on airline and filters on the date range, then the route
+REPORT_INDEX = ("airline", "date_of_departure", "source_airport", "destination_airport")
+REPORT_INDEX_NAME = "revenue_report_index"
+
+
+class RevenueRollup(Document):
+	pass
+
+
+def on_doctype_update():
+	add_report_index()
+
+
+def add_report_index():
+	frappe.db.add_index("Revenue Rollup", list(REPORT_INDEX), index_name=REPORT_INDEX_NAME)
+
+
+def add_ticket_revenue(tickets, sign=1):
+	"""Add (or with `sign=-1` subtract) the revenue of submitted tickets to their rollup rows.
+
+	The tickets are grouped by key with one query, so a chunk of tickets costs one
+	read and one write however many there are.
+	"""
+	if not tickets:
+		return
+	Ticket = frappe.qb.DocType("Airplane Ticket")
+	Flight = frappe.qb.DocType("Airplane Flight")
+	Airplane = frappe.qb.DocType("Airplane")
+	rows = (
+		frappe.qb.from_(Ticket)
+		.join(Flight)
+		.on(Flight.name == Ticket.flight)
+		.left_join(Airplane)
+		.on(Airplane.name == Flight.airplane)
+		.select(
+			Airplane.airline,
+			Flight.source_airport,
+			Flight.destination_airport,
+			Flight.date_of_departure,
+			frappe.qb.functions.Sum(Ticket.total_amount).as_("revenue"),
+			frappe.qb.functions.Count("*").as_("tickets"),
+		)
+		.where(Ticket.name.isin(tickets))
+		.groupby(
+			Airplane.airline, Flight.source_airport, Flight.destination_airport, Flight.date_of_departure
+		)
+	).run(as_dict=True)
+	for row in rows:
+		row.revenue = sign * flt(row.revenue)
+		row.tickets = sign * row.tickets
+	update_revenue_rollup(rows)
+
+
+def move_flight_revenue(flight, old_key, new_key):
+	"""Move the revenue of a flight's submitted tickets from one rollup key to another."""
+	revenue, tickets = frappe.db.sql(
+		"""
+		SELECT SUM(total_amount), COUNT(*)
+		FROM `tabAirplane Ticket`
+		WHERE flight = %s AND docstatus = 1
+		""",
+		(flight,),
+	)[0]
+	if tickets:
+		update_revenue_rollup(
+			[
+				{**old_key, "revenue": -flt(revenue), "tickets": -tickets},
+				{**new_key, "revenue": flt(revenue), "tickets": tickets},
+			]
+		)
+
+
+def update_revenue_rollup(rows):
+	"""Add the `revenue` and `tickets` deltas of `rows` to their rollup rows with one upsert."""
+	add_to_rollup("Revenue Rollup", ROLLUP_KEY, ("revenue", "tickets"), rows)
+
+
+def rebuild_revenue_rollup():
+	"""Recompute every rollup row from the submitted tickets."""
+	rows = frappe.db.sql(
+		"""
+		SELECT a.airline, f.source_airport, f.destination_airport, f.date_of_departure,
+			SUM(t.total_amount) AS revenue, COUNT(*) AS tickets
+		FROM `tabAirplane Ticket` t
+		JOIN `tabAirplane Flight` f ON f.name = t.flight
+		LEFT JOIN `tabAirplane` a ON a.name = f.airplane
+		WHERE t.docstatus = 1
+		GROUP BY a.airline, f.source_airport, f.destination_airport, f.date_of_departure
+		""",
+		as_dict=True,
+	)
+	frappe.db.delete("Revenue Rollup")
+	touch_doctypes("Revenue Rollup")
+	for i in range(0, len(rows), 1000):
+		update_revenue_rollup(rows[i : i + 1000])
@@ -0,0 +1,71 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+	create_test_ticket,
+)
+from airplane_mode.airplane_mode.doctype.revenue_rollup.revenue_rollup import rebuild_revenue_rollup
+from airplane_mode.airplane_mode.flight_cancellation import cancel_flight_tickets
+from airplane_mode.airplane_mode.flight_operations import process_flight_tickets
+from airplane_mode.airplane_mode.report.revenue_by_airline.revenue_by_airline import execute
+from airplane_mode.utils import get_rollup_name
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+def get_rollup(flight):
+	airline = frappe.db.get_value("Airplane", flight.airplane, "airline")
+	name = get_rollup_name(
+		airline, flight.source_airport, flight.destination_airport, flight.date_of_departure
+	)
+	return frappe.db.get_value("Revenue Rollup", name, ["revenue", "tickets"], as_dict=True) or frappe._dict(
+		revenue=0, tickets=0
+	)
+
+
+class IntegrationTestRevenueRollup(IntegrationTestCase):
+	"""
+	Integration tests for RevenueRollup.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def test_rollup_follows_submit_and_cancel(self):
+		flight = create_test_flight(capacity=3)
+		before = get_rollup(flight)
+		for _ in range(2):
+			create_test_ticket(flight.name, status="Boarded")
+		process_flight_tickets(flight.name, "Submit")
+
+		rollup = get_rollup(flight)
+		self.assertEqual(rollup.revenue - before.revenue, 2000)
+		self.assertEqual(rollup.tickets - before.tickets, 2)
+
+		rebuild_revenue_rollup()
+		self.assertEqual(get_rollup(flight), rollup)
+
+		cancel_flight_tickets(flight.name)
+		self.assertEqual(get_rollup(flight).revenue, before.revenue)
+
+	def test_report_filters_by_airline_and_date(self):
+		flight = create_test_flight()
+		create_test_ticket(flight.name, status="Boarded")
+		process_flight_tickets(flight.name, "Submit")
+		airline = frappe.db.get_value("Airplane", flight.airplane, "airline")
+
+		filters = {
+			"airline": airline,
+			"from_date": flight.date_of_departure,
+			"to_date": flight.date_of_departure,
+		}
+		_, data, _, _, summary = execute(filters)
+		self.assertEqual([row[0] for row in data], [airline])
+		self.assertEqual(summary[0]["value"], data[0][1])
+		self.assertEqual(data[0][1], get_rollup(flight).revenue)
@@ -0,0 +1,183 @@
+import frappe
+from frappe.utils import flt, now
+from frappe.utils.background_jobs import is_job_enqueued
+
+from airplane_mode.airplane_mode.doctype.add_on_sales_rollup.add_on_sales_rollup import (
+	add_ticket_add_on_sales,
+)
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import (
+	release_seats,
+	update_seat_counters,
+)
+from airplane_mode.airplane_mode.doctype.flight_waitlist_entry.flight_waitlist_entry import cancel_waitlist
+from airplane_mode.airplane_mode.doctype.revenue_rollup.revenue_rollup import add_ticket_revenue
+
+CHUNK_SIZE = 500
+# recipients per Email Queue entry
+NOTIFICATION_BATCH_SIZE = 100
+
+
+def enqueue_flight_cancellation(flight):
+	"""Queue the ticket cascade of a cancelled flight and return whether a job was queued.
+
+	Returns False when the flight's cascade is already queued or running. That job
+	keeps going until no live ticket is left, so it covers this request too.
+	"""
+	job_id = f"flight_cancellation::{flight}"
+	if is_job_enqueued(job_id):
+		return False
+	frappe.enqueue(
+		cancel_flight_tickets,
+		queue="long",
+		job_id=job_id,
+		deduplicate=True,
+		enqueue_after_commit=True,
+		flight=flight,
+		commit=True,
+	)
+	return True
+
+
+def cancel_flight_tickets(flight, chunk_size=CHUNK_SIZE, commit=False):
+	"""Cancel every live draft and submitted ticket of a cancelled flight and return a summary.
+
+	Tickets are taken `chunk_size` at a time, locked, cancelled with one update that
+	records their `total_amount` as refund, their seats released and their passengers
+	notified in batches. Cancelled tickets drop out of the query, so a cascade that is
+	interrupted picks up where it stopped when it runs again. With `commit`, as in the
+	background job, every chunk is committed on its own and progress is published to
+	the flight's form. The flight's waitlist is closed first.
+	"""
+	cancel_waitlist(flight)
+	total = frappe.db.count(
+		"Airplane Ticket", {"flight": flight, "docstatus": ["<", 2], "status": ["!=", "Cancelled"]}
+	)
+	summary = frappe._dict(flight=flight, total=total, cancelled=0, refunded=0.0, notified=0)
+	while True:
+		tickets = get_ticket_chunk(flight, chunk_size)
+		if not tickets:
+			break
+
+		cancel_tickets(flight, tickets)
+		summary.notified += notify_passengers(flight, tickets)
+		summary.cancelled += len(tickets)
+		summary.refunded += sum(flt(ticket.total_amount) for ticket in tickets)
+		if commit:
+			frappe.db.commit()
+			frappe.publish_progress(
+				summary.cancelled * 100 / (total or 1),
+				title=f"Cancelling tickets: {flight}",
+				doctype="Airplane Flight",
+				docname=flight,
+				description=f"{summary.cancelled} of {total} tickets",
+			)
+
+	if commit:
+		record_summary(flight, summary)
+	return summary
+
+
+def get_ticket_chunk(flight, chunk_size):
+	Ticket = frappe.qb.DocType("Airplane Ticket")
+	Passenger = frappe.qb.DocType("Flight Passenger")
+	return (
+		frappe.qb.from_(Ticket)
+		.left_join(Passenger)
+		.on(Passenger.name == Ticket.passenger)
+		.select(Ticket.name, Ticket.docstatus, Ticket.seat, Ticket.total_amount, Passenger.email)
+		.where(Ticket.flight == flight)
+		.where(Ticket.docstatus < 2)
+		.where(Ticket.status != "Cancelled")
+		.orderby(Ticket.name)
+		.limit(chunk_size)
+		.for_update()
+	).run(as_dict=True)
+
+
+def cancel_tickets(flight, tickets):
+	"""Cancel draft and submitted tickets together and give their seats back to the flight.
+
+	Submitted tickets move to docstatus 2 with their add-on rows. Drafts cannot be
+	cancelled in that sense, so they stay at docstatus 0 with status Cancelled and
+	their seat cleared, which takes them out of every live-ticket query.
+	"""
+	names = [ticket.name for ticket in tickets]
+	submitted = [ticket.name for ticket in tickets if ticket.docstatus == 1]
+	drafts = [ticket.name for ticket in tickets if ticket.docstatus == 0]
+	add_ticket_revenue(submitted, sign=-1)
+	add_ticket_add_on_sales(submitted, sign=-1)
+	Ticket = frappe.qb.DocType("Airplane Ticket")
+	(
+		frappe.qb.update(Ticket)
+		.set(Ticket.status, "Cancelled")
+		.set(Ticket.refund_amount, Ticket.total_amount)
+		.set(Ticket.modified, now())
+		.set(Ticket.modified_by, frappe.session.user)
+		.where(Ticket.name.isin(names))
+	).run()
+	if submitted:
+		frappe.qb.update(Ticket).set(Ticket.docstatus, 2).where(Ticket.name.isin(submitted)).run()
+		AddOn = frappe.qb.DocType("Airplane Ticket Add-on Item")
+		frappe.qb.update(AddOn).set(AddOn.docstatus, 2).where(AddOn.parent.isin(submitted)).run()
+	if drafts:
+		frappe.qb.update(Ticket).set(Ticket.seat, None).where(Ticket.name.isin(drafts)).run()
+
+	update_seat_counters(flight, held=-len(drafts), sold=-len(submitted))
+	release_seats(flight, [ticket.seat for ticket in tickets])
+
+
+def notify_passengers(flight, tickets):
+	recipients = list(dict.fromkeys(ticket.email for ticket in tickets if ticket.email))
+	if not recipients:
+		return 0
+
+	source, destination = frappe.db.get_value(
+		"Airplane Flight", flight, ["source_airport_code", "destination_airport_code"]
+	)
+	for i in range(0, len(recipients), NOTIFICATION_BATCH_SIZE):
+		frappe.sendmail(
+			recipients=recipients[i : i + NOTIFICATION_BATCH_SIZE],
+			subject=f"Your flight {source} to {destination} has been cancelled",
+			message=(
+				f"<p>We regret to inform you that flight {flight} from {source} to {destination} "
+				"has been cancelled.</p>"
+				"<p>Your ticket has been cancelled and the amount paid will be refunded.</p>"
+			),
+			reference_doctype="Airplane Flight",
+			reference_name=flight,
+		)
+	return len(recipients)
+
+
+def record_summary(flight, summary):
+	frappe.get_doc("Airplane Flight", flight).add_comment(
+		"Info",
+		f"Cancelled {summary.cancelled} tickets, {summary.refunded:.2f} to refund, "
+		f"{summary.notified} passengers notified.",
+	)
+	frappe.publish_realtime(
+		"flight_cancellation_complete",
+		summary,
+		doctype="Airplane Flight",
+		docname=flight,
+		after_commit=True,
+	)
+	frappe.db.commit()
+
+
+def resume_flight_cancellations():
+	"""Requeue the cascade of cancelled flights that still have live tickets."""
+	Flight = frappe.qb.DocType("Airplane Flight")
+	Ticket = frappe.qb.DocType("Airplane Ticket")
+	flights = (
+		frappe.qb.from_(Flight)
+		.join(Ticket)
+		.on(Ticket.flight == Flight.name)
+		.select(Flight.name)
+		.distinct()
+		.where(Flight.status == "Cancelled")
+		.where(Ticket.docstatus < 2)
+		.where(Ticket.status != "Cancelled")
+	).run(pluck=True)
+	for flight in flights:
+		enqueue_flight_cancellation(flight)
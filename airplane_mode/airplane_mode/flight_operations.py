@@ -0,0 +1,175 @@
+import frappe
+from frappe.utils import now
+from frappe.utils.background_jobs import is_job_enqueued
+
+from airplane_mode.airplane_mode.doctype.add_on_sales_rollup.add_on_sales_rollup import (
+	add_ticket_add_on_sales,
+)
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import (
+	update_seat_counters,
+)
+from airplane_mode.airplane_mode.doctype.revenue_rollup.revenue_rollup import add_ticket_revenue
+
+TICKET_DOCTYPE = "Airplane Ticket"
+CHUNK_SIZE = 200
+
+# operation: (statuses a ticket may be in, status it moves to or None to submit)
+OPERATIONS = {
+	"Check In": (("Booked",), "Checked-In"),
+	"Board": (("Booked", "Checked-In"), "Boarded"),
+	"Submit": (("Boarded",), None),
+}
+INVALID_STATUS_MESSAGES = {
+	"Check In": "Cannot check in ticket with status '{status}'.",
+	"Board": "Cannot board ticket with status '{status}'.",
+	"Submit": "Cannot submit ticket unless status is 'Boarded'.",
+}
+
+
+@frappe.whitelist()
+def run_flight_operation(flight, operation, tickets=None):
+	"""Check in, board or submit the draft tickets of a flight from a background job.
+
+	`tickets` limits the operation to the given ticket names, otherwise every draft
+	ticket of the flight is processed. Only one operation runs per flight at a time:
+	while one is queued or running, the request is not queued and False is returned.
+	"""
+	if operation not in OPERATIONS:
+		frappe.throw(f"Unknown flight operation {operation}.")
+	frappe.has_permission(TICKET_DOCTYPE, "submit" if operation == "Submit" else "write", throw=True)
+	frappe.get_doc("Airplane Flight", flight).check_permission("read")
+
+	job_id = f"flight_operation::{flight}"
+	if is_job_enqueued(job_id):
+		frappe.msgprint(
+			f"{operation} of flight {flight} was not queued, as another operation of the flight is "
+			"still queued or running. Try again once it has finished.",
+			title="Operation Not Queued",
+			indicator="orange",
+		)
+		return False
+
+	frappe.enqueue(
+		process_flight_tickets,
+		queue="long",
+		job_id=job_id,
+		deduplicate=True,
+		enqueue_after_commit=True,
+		flight=flight,
+		operation=operation,
+		tickets=frappe.parse_json(tickets) if tickets else None,
+		commit=True,
+	)
+	frappe.msgprint(f"{operation} of flight {flight} has been queued.", alert=True)
+	return True
+
+
+def process_flight_tickets(flight, operation, tickets=None, chunk_size=CHUNK_SIZE, commit=False):
+	"""Run `operation` on the draft tickets of a flight and return a summary.
+
+	Tickets are walked in name order, `chunk_size` at a time. Each chunk is locked and
+	read once, checked with the rules of `AirplaneTicket` and moved with one update,
+	so a chunk costs a handful of queries whatever its size. With `commit`, as in the
+	background job, every chunk is committed on its own, progress is published to the
+	flight's form and the summary is recorded on the flight's timeline.
+	"""
+	allowed_statuses, target_status = OPERATIONS[operation]
+	filters = [["flight", "=", flight], ["docstatus", "=", 0], ["status", "!=", "Cancelled"]]
+	if tickets:
+		filters.append(["name", "in", tickets])
+	total = frappe.db.count(TICKET_DOCTYPE, filters)
+
+	summary = frappe._dict(operation=operation, total=total, processed=0, failed=[])
+	last_name = ""
+	while True:
+		chunk = frappe.get_all(
+			TICKET_DOCTYPE,
+			filters=[*filters, ["name", ">", last_name]],
+			fields=["name", "status"],
+			order_by="name asc",
+			limit=chunk_size,
+			for_update=True,
+		)
+		if not chunk:
+			break
+
+		names = []
+		for ticket in chunk:
+			if ticket.status in allowed_statuses:
+				names.append(ticket.name)
+			else:
+				summary.failed.append(
+					{
+						"ticket": ticket.name,
+						"error": INVALID_STATUS_MESSAGES[operation].format(status=ticket.status),
+					}
+				)
+
+		if names:
+			if target_status:
+				set_status(names, target_status)
+			else:
+				submit_tickets(flight, names)
+
+		summary.processed += len(chunk)
+		last_name = chunk[-1].name
+		if commit:
+			frappe.db.commit()
+			frappe.publish_progress(
+				summary.processed * 100 / (total or 1),
+				title=f"{operation}: {flight}",
+				doctype="Airplane Flight",
+				docname=flight,
+				description=f"{summary.processed} of {total} tickets",
+			)
+
+	summary.succeeded = summary.processed - len(summary.failed)
+	if commit:
+		record_summary(flight, summary)
+	return summary
+
+
+def set_status(names, status):
+	Ticket = frappe.qb.DocType(TICKET_DOCTYPE)
+	(
+		frappe.qb.update(Ticket)
+		.set(Ticket.status, status)
+		.set(Ticket.modified, now())
+		.set(Ticket.modified_by, frappe.session.user)
+		.where(Ticket.name.isin(names))
+		.where(Ticket.docstatus == 0)
+	).run()
+
+
+def submit_tickets(flight, names):
+	"""Submit boarded tickets, move their seats from held to sold and add their revenue."""
+	for doctype, name_field in ((TICKET_DOCTYPE, "name"), ("Airplane Ticket Add-on Item", "parent")):
+		table = frappe.qb.DocType(doctype)
+		(
+			frappe.qb.update(table)
+			.set(table.docstatus, 1)
+			.set(table.modified, now())
+			.set(table.modified_by, frappe.session.user)
+			.where(table[name_field].isin(names))
+			.where(table.docstatus == 0)
+		).run()
+	update_seat_counters(flight, held=-len(names), sold=len(names))
+	add_ticket_revenue(names)
+	add_ticket_add_on_sales(names)
+
+
+def record_summary(flight, summary):
+	message = f"{summary.operation}: {summary.succeeded} of {summary.total} tickets processed"
+	if summary.failed:
+		failures = "".join(f"<li>{row['ticket']}: {row['error']}</li>" for row in summary.failed[:50])
+		more = f"<p>and {len(summary.failed) - 50} more.</p>" if len(summary.failed) > 50 else ""
+		message += f", {len(summary.failed)} failed:<ul>{failures}</ul>{more}"
+	frappe.get_doc("Airplane Flight", flight).add_comment("Info", message)
+	frappe.publish_realtime(
+		"flight_operation_complete",
+		{"flight": flight, **summary},
+		doctype="Airplane Flight",
+		docname=flight,
+		after_commit=True,
+	)
+	frappe.db.commit()
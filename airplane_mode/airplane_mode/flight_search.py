@@ -0,0 +1,106 @@
+import base64
+import json
+
+import frappe
+from frappe.utils import cint, date_diff, getdate
+
+MAX_WINDOW_DAYS = 31
+MAX_PAGE_LENGTH = 100
+# equality columns first, then the sort order the keyset walks
+SEARCH_INDEX = (
+	"source_airport",
+	"destination_airport",
+	"status",
+	"date_of_departure",
+	"time_of_departure",
+	"name",
+)
+SEARCH_INDEX_NAME = "flight_search_index"
+
+
+@frappe.whitelist(allow_guest=True)
+def search_flights(
+	source_airport, destination_airport, from_date, to_date=None, airline=None, after=None, page_length=20
+):
+	"""Return published, scheduled flights on a route departing within a date window.
+
+	Flights come in departure order, `page_length` at a time. Pass the returned
+	`next` cursor as `after` to get the following page; it is None on the last one.
+	The query walks the `flight_search_index` composite index from the cursor, so a
+	page costs the same however many historical flights the route has.
+	"""
+	to_date = to_date or from_date
+	if date_diff(to_date, from_date) < 0:
+		frappe.throw("To Date cannot be before From Date.")
+	if date_diff(to_date, from_date) >= MAX_WINDOW_DAYS:
+		frappe.throw(f"Flights can be searched at most {MAX_WINDOW_DAYS} days at a time.")
+	page_length = min(max(cint(page_length), 1), MAX_PAGE_LENGTH)
+
+	Flight = frappe.qb.DocType("Airplane Flight")
+	Airplane = frappe.qb.DocType("Airplane")
+	query = (
+		frappe.qb.from_(Flight)
+		.left_join(Airplane)
+		.on(Airplane.name == Flight.airplane)
+		.select(
+			Flight.name,
+			Flight.route,
+			Flight.airplane,
+			Airplane.airline,
+			Flight.source_airport_code,
+			Flight.destination_airport_code,
+			Flight.date_of_departure,
+			Flight.time_of_departure,
+			Flight.duration,
+			Flight.fare,
+		)
+		.where(Flight.source_airport == source_airport)
+		.where(Flight.destination_airport == destination_airport)
+		.where(Flight.status == "Scheduled")
+		.where(Flight.date_of_departure.between(getdate(from_date), getdate(to_date)))
+		.where(Flight.docstatus < 2)
+		.where(Flight.published == 1)
+		.orderby(Flight.date_of_departure)
+		.orderby(Flight.time_of_departure)
+		.orderby(Flight.name)
+		.limit(page_length + 1)
+	)
+	if airline:
+		query = query.where(Airplane.airline == airline)
+	if after:
+		date, time, name = decode_cursor(after)
+		query = query.where(
+			(Flight.date_of_departure > date)
+			| (
+				(Flight.date_of_departure == date)
+				& (
+					(Flight.time_of_departure > time)
+					| ((Flight.time_of_departure == time) & (Flight.name > name))
+				)
+			)
+		)
+
+	flights = query.run(as_dict=True)
+	next_cursor = None
+	if len(flights) > page_length:
+		flights = flights[:page_length]
+		last = flights[-1]
+		next_cursor = encode_cursor(last.date_of_departure, last.time_of_departure, last.name)
+	return {"flights": flights, "next": next_cursor}
+
+
+def encode_cursor(date, time, name):
+	value = json.dumps([str(date), str(time), name], separators=(",", ":"))
+	return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_cursor(cursor):
+	try:
+		date, time, name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+		return getdate(date), time, name
+	except Exception:
+		frappe.throw("Invalid search cursor.")
+
+
+def add_search_index():
+	frappe.db.add_index("Airplane Flight", list(SEARCH_INDEX), index_name=SEARCH_INDEX_NAME)
@@ -0,0 +1,409 @@
+"""Streaming importer for flights, passengers and tickets from legacy systems.
+
+Rows are read one at a time from CSV or JSON Lines and handled in chunks: each
+chunk is validated against lookups resolved once per chunk (or once per import
+for airports and airplanes), tickets are checked against the locked seat
+inventory of their flight, and rows are named from reserved series blocks,
+written with multi-row inserts and committed. Rejected rows go to an error file with their
+line number and reason. Run it through bench:
+
+	bench --site mysite import-airplane-data tickets tickets.jsonl --dry-run
+"""
+
+import csv
+import json
+import os
+from collections import OrderedDict
+from itertools import islice
+
+import frappe
+from frappe.utils import cint, flt, get_time, getdate, now
+
+from airplane_mode.airplane_mode.doctype.airplane_flight.airplane_flight import (
+	calculate_eta,
+)
+from airplane_mode.airplane_mode.doctype.airplane_flight.airplane_flight import (
+	get_name_prefix as get_flight_name_prefix,
+)
+from airplane_mode.airplane_mode.doctype.airplane_ticket.airplane_ticket import (
+	get_fetched_flight_fields,
+)
+from airplane_mode.airplane_mode.doctype.airplane_ticket.airplane_ticket import (
+	get_name_prefix as get_ticket_name_prefix,
+)
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import (
+	get_seat_inventory,
+	get_seat_map,
+	rebuild_seat_inventory,
+)
+from airplane_mode.airplane_mode.doctype.revenue_rollup.revenue_rollup import add_ticket_revenue
+from airplane_mode.page_cache import enqueue_page_cache_warmup
+from airplane_mode.utils import bulk_insert, reserve_series
+
+CHUNK_SIZE = 5000
+# flights kept in memory while importing tickets
+FLIGHT_CACHE_SIZE = 100_000
+PASSENGER_PREFIX = "PSG-"
+
+
+class RowError(Exception):
+	pass
+
+
+class ImportLookups:
+	"""Airports and airplanes loaded once per import, and flights cached as tickets need them."""
+
+	def __init__(self):
+		self.airports = {}
+		for airport in frappe.get_all("Airport", fields=["name", "code"]):
+			self.airports[airport.name] = airport
+			self.airports.setdefault(airport.code, airport)
+		self.airplanes = set(frappe.get_all("Airplane", pluck="name"))
+		self.flight_fields = get_fetched_flight_fields()
+		self.flights = OrderedDict()
+
+	def get_airport(self, value, label):
+		if not value:
+			raise RowError(f"{label} is mandatory.")
+		if value not in self.airports:
+			raise RowError(f"{label} {value} does not exist.")
+		return self.airports[value]
+
+	def load_flights(self, names):
+		"""Make sure the flights in `names` that exist are cached, with one query for the missing ones."""
+		for name in names:
+			if name in self.flights:
+				self.flights.move_to_end(name)
+		missing = [name for name in names if name not in self.flights]
+		if missing:
+			fields = {field for _, field in self.flight_fields}
+			for flight in frappe.get_all(
+				"Airplane Flight",
+				filters={"name": ["in", missing], "docstatus": ["<", 2]},
+				fields=["name", *fields],
+			):
+				self.flights[flight.name] = flight
+		while len(self.flights) > FLIGHT_CACHE_SIZE:
+			self.flights.popitem(last=False)
+
+
+def import_file(doctype, path, file_format=None, chunk_size=CHUNK_SIZE, dry_run=False, error_path=None):
+	"""Import `path` into `doctype` and return a summary of read, imported and rejected rows.
+
+	With `dry_run` every chunk is validated and written as usual but rolled back,
+	so rejects are reported without changing the site.
+	"""
+	if doctype not in IMPORTERS:
+		frappe.throw(f"Cannot import {doctype}.")
+	prepare, after_insert = IMPORTERS[doctype]
+	file_format = file_format or ("csv" if path.endswith(".csv") else "jsonl")
+	error_path = error_path or f"{path}.errors.csv"
+
+	lookups = ImportLookups()
+	summary = frappe._dict(doctype=doctype, read=0, imported=0, rejected=0, error_file=None)
+	published = False
+	error_file = errors = None
+	try:
+		for chunk in iter_chunks(read_rows(path, file_format), chunk_size):
+			rows, rejects = prepare(chunk, lookups)
+			if rows:
+				bulk_insert(doctype, rows)
+				after_insert(rows)
+			if dry_run:
+				frappe.db.rollback()
+			else:
+				frappe.db.commit()
+				published = published or any(row.get("published") for row in rows)
+
+			summary.read += len(chunk)
+			summary.imported += len(rows)
+			summary.rejected += len(rejects)
+			if rejects:
+				if not errors:
+					error_file = open(error_path, "w", newline="", encoding="utf-8")
+					errors = csv.writer(error_file)
+					errors.writerow(["line", "error", "row"])
+					summary.error_file = os.path.abspath(error_path)
+				errors.writerows(
+					(line, error, json.dumps(data, default=str)) for line, data, error in rejects
+				)
+	finally:
+		if error_file:
+			error_file.close()
+
+	if published:
+		enqueue_page_cache_warmup(doctype)
+		frappe.db.commit()
+	return summary
+
+
+def read_rows(path, file_format):
+	"""Yield (line number, row) pairs with blank strings read as None."""
+	with open(path, newline="", encoding="utf-8") as file:
+		if file_format == "csv":
+			# the header is line 1
+			rows = enumerate(csv.DictReader(file), start=2)
+		else:
+			rows = ((line, json.loads(text)) for line, text in enumerate(file, start=1) if text.strip())
+		for line, row in rows:
+			yield line, {key.strip(): parse_value(value) for key, value in row.items() if key}
+
+
+def parse_value(value):
+	# only blank strings are missing; 0 and False are values
+	if isinstance(value, str):
+		value = value.strip()
+		return value or None
+	return value
+
+
+def iter_chunks(rows, size):
+	while chunk := list(islice(rows, size)):
+		yield chunk
+
+
+def get_standard_fields(name, docstatus=0):
+	timestamp = now()
+	user = frappe.session.user
+	return {
+		"name": name,
+		"owner": user,
+		"creation": timestamp,
+		"modified": timestamp,
+		"modified_by": user,
+		"docstatus": docstatus,
+		"idx": 0,
+	}
+
+
+def get_existing_names(doctype, chunk):
+	names = [data["name"] for _, data in chunk if data.get("name")]
+	if not names:
+		return set()
+	return set(frappe.get_all(doctype, filters={"name": ["in", names]}, pluck="name"))
+
+
+def parse_docstatus(data):
+	docstatus = cint(data.get("docstatus"))
+	if docstatus not in (0, 1):
+		raise RowError("Docstatus must be 0 or 1.")
+	return docstatus
+
+
+def parse_date(data, field, label):
+	if not data.get(field):
+		raise RowError(f"{label} is mandatory.")
+	try:
+		return getdate(data[field])
+	except Exception:
+		raise RowError(f"{label} {data[field]} is not a valid date.")
+
+
+def parse_option(data, field, doctype, default):
+	value = data.get(field) or default
+	if value not in frappe.get_meta(doctype).get_options(field).split("\n"):
+		raise RowError(f"{value} is not a valid {field}.")
+	return value
+
+
+def validate_chunk(chunk, doctype, build):
+	"""Run `build(data)` on each row, returning the built rows and (line, data, error) rejects."""
+	existing = get_existing_names(doctype, chunk)
+	seen = set()
+	rows, rejects = [], []
+	for line, data in chunk:
+		try:
+			if data.get("name") and (data["name"] in existing or data["name"] in seen):
+				raise RowError(f"{doctype} {data['name']} already exists.")
+			rows.append(build(data))
+			seen.add(data.get("name"))
+		except RowError as e:
+			rejects.append((line, data, str(e)))
+	return rows, rejects
+
+
+def name_rows(rows, doctype, get_prefix, digits):
+	"""Give rows without a name one from a reserved block of their naming series."""
+	groups = {}
+	for row in rows:
+		if not row["name"]:
+			groups.setdefault(get_prefix(row), []).append(row)
+	for prefix, group in groups.items():
+		for row, name in zip(
+			group, reserve_series(prefix, len(group), digits=digits, doctype=doctype), strict=True
+		):
+			row["name"] = name
+
+
+def prepare_flights(chunk, lookups):
+	route_prefix = frappe.get_meta("Airplane Flight").route
+	page = frappe.new_doc("Airplane Flight")
+
+	def build(data):
+		if not data.get("airplane"):
+			raise RowError("Airplane is mandatory.")
+		if data["airplane"] not in lookups.airplanes:
+			raise RowError(f"Airplane {data['airplane']} does not exist.")
+		source = lookups.get_airport(data.get("source_airport"), "Source Airport")
+		destination = lookups.get_airport(data.get("destination_airport"), "Destination Airport")
+		date_of_departure = parse_date(data, "date_of_departure", "Date of Departure")
+		try:
+			time_of_departure = get_time(data["time_of_departure"]).strftime("%H:%M:%S")
+		except Exception:
+			raise RowError("Time of Departure is missing or invalid.")
+		duration = cint(data.get("duration"))
+		if duration <= 0:
+			raise RowError("Duration must be a positive number of seconds.")
+
+		return {
+			**get_standard_fields(data.get("name"), parse_docstatus(data)),
+			"airplane": data["airplane"],
+			"status": parse_option(data, "status", "Airplane Flight", "Scheduled"),
+			"date_of_departure": date_of_departure,
+			"time_of_departure": time_of_departure,
+			"duration": duration,
+			"eta": calculate_eta(date_of_departure, time_of_departure, duration),
+			"fare": flt(data.get("fare")),
+			"gate": data.get("gate"),
+			"published": cint(data.get("published")),
+			"source_airport": source.name,
+			"source_airport_code": source.code,
+			"destination_airport": destination.name,
+			"destination_airport_code": destination.code,
+		}
+
+	rows, rejects = validate_chunk(chunk, "Airplane Flight", build)
+	name_rows(rows, "Airplane Flight", lambda row: get_flight_name_prefix(row["airplane"]), 5)
+	for row in rows:
+		row["route"] = f"{route_prefix}/{page.scrub(row['name'])}"
+	return rows, rejects
+
+
+def after_insert_flights(rows):
+	rebuild_seat_inventory([row["name"] for row in rows])
+
+
+def prepare_passengers(chunk, lookups):
+	def build(data):
+		if not data.get("first_name"):
+			raise RowError("First Name is mandatory.")
+		full_name = data["first_name"]
+		if data.get("last_name"):
+			full_name = f"{full_name} {data['last_name']}"
+		return {
+			**get_standard_fields(data.get("name")),
+			"first_name": data["first_name"],
+			"last_name": data.get("last_name"),
+			"full_name": full_name,
+			"date_of_birth": parse_date(data, "date_of_birth", "Date of Birth"),
+			"email": data.get("email"),
+		}
+
+	rows, rejects = validate_chunk(chunk, "Flight Passenger", build)
+	name_rows(rows, "Flight Passenger", lambda row: PASSENGER_PREFIX, 7)
+	return rows, rejects
+
+
+def after_insert_passengers(rows):
+	pass
+
+
+def prepare_tickets(chunk, lookups):
+	flights = {data["flight"] for _, data in chunk if data.get("flight")}
+	lookups.load_flights(flights)
+	passengers = {data["passenger"] for _, data in chunk if data.get("passenger")}
+	passengers = (
+		set(frappe.get_all("Flight Passenger", filters={"name": ["in", list(passengers)]}, pluck="name"))
+		if passengers
+		else set()
+	)
+	inventories = lock_seat_inventories([flight for flight in flights if flight in lookups.flights])
+
+	def build(data):
+		flight = lookups.flights.get(data.get("flight"))
+		if not flight:
+			raise RowError(f"Flight {data.get('flight')} does not exist.")
+		if data.get("passenger") not in passengers:
+			raise RowError(f"Passenger {data.get('passenger')} does not exist.")
+		if data.get("flight_price") is None:
+			raise RowError("Flight Price is mandatory.")
+
+		docstatus = parse_docstatus(data)
+		status = parse_option(data, "status", "Airplane Ticket", "Booked")
+		# the same rule as AirplaneTicket.before_submit
+		if docstatus == 1 and status != "Boarded":
+			raise RowError("Cannot submit ticket unless status is 'Boarded'.")
+
+		flight_price = flt(data["flight_price"])
+		row = {
+			**get_standard_fields(data.get("name"), docstatus),
+			"flight": flight.name,
+			"passenger": data["passenger"],
+			"status": status,
+			"flight_price": flight_price,
+			"total_amount": flight_price,
+			**{ticket_field: flight[flight_field] for ticket_field, flight_field in lookups.flight_fields},
+		}
+		# last, so a rejected row never takes a seat
+		row["seat"] = take_import_seat(inventories[flight.name], flight.name, data.get("seat"))
+		return row
+
+	rows, rejects = validate_chunk(chunk, "Airplane Ticket", build)
+	name_rows(
+		rows,
+		"Airplane Ticket",
+		lambda row: get_ticket_name_prefix(
+			row["flight"], row["source_airport_code"], row["destination_airport_code"]
+		),
+		3,
+	)
+	return rows, rejects
+
+
+def lock_seat_inventories(flights):
+	"""Lock the inventories of `flights`, in name order, and return {flight: inventory with its seat map}.
+
+	Each inventory also carries `seats_left`, its capacity less the seats sold and
+	held, so a chunk can never oversell a flight. The locks are held until the
+	chunk is committed.
+	"""
+	inventories = {}
+	for flight in sorted(flights):
+		inventory = get_seat_inventory(flight, for_update=True)
+		inventory.seat_map = get_seat_map(inventory)
+		inventory.seats_left = inventory.capacity - inventory.seats_sold - inventory.seats_held
+		inventories[flight] = inventory
+	return inventories
+
+
+def take_import_seat(inventory, flight, seat=None):
+	"""Take `seat`, or the first free seat, on the flight's seat map, as `issue_tickets` does."""
+	if inventory.seats_left <= 0:
+		raise RowError(f"Flight {flight} is full.")
+	seat_map = inventory.seat_map
+	if seat:
+		index = seat_map.index(seat)
+		if index is None:
+			raise RowError(f"Seat {seat} does not exist on flight {flight}.")
+		if seat_map.is_taken(index):
+			raise RowError(f"Seat {seat} is already taken on flight {flight}.")
+	else:
+		index = seat_map.next_free()
+		if index is None:
+			raise RowError(f"Flight {flight} is full.")
+
+	seat_map.take(index)
+	inventory.seats_left -= 1
+	return seat_map.label(index)
+
+
+def after_insert_tickets(rows):
+	rebuild_seat_inventory(list({row["flight"] for row in rows}))
+	add_ticket_revenue([row["name"] for row in rows if row["docstatus"] == 1])
+
+
+IMPORTERS = {
+	"Airplane Flight": (prepare_flights, after_insert_flights),
+	"Flight Passenger": (prepare_passengers, after_insert_passengers),
+	"Airplane Ticket": (prepare_tickets, after_insert_tickets),
+}
@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+import tempfile
+
+import frappe
+from frappe.utils import getdate
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+FIELDS = ["flight", "ticket", "passenger", "full_name", "seat", "status", "add_ons"]
+FORMATS = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+
+@frappe.whitelist()
+def download_manifest(flight=None, airport=None, from_date=None, to_date=None, format="csv"):
+	"""Return the passenger manifest of a flight, or of every departure from `airport`
+	between `from_date` and `to_date`, as CSV or JSON Lines.
+
+	Rows are read through an unbuffered cursor and spooled to a temporary file that is
+	streamed back, so memory stays flat however many tickets the manifest covers.
+	"""
+	if format not in FORMATS:
+		frappe.throw(f"Unsupported manifest format {format}.")
+	frappe.has_permission("Airplane Ticket", "read", throw=True)
+
+	flights = get_manifest_flights(flight, airport, from_date, to_date)
+	text = io.TextIOWrapper(tempfile.TemporaryFile("w+b"), encoding="utf-8", newline="")
+	write_manifest(text, get_manifest_rows(flights), format)
+	text.flush()
+	file = text.detach()
+	file.seek(0)
+
+	if flight:
+		filename = f"manifest-{flight}.{format}"
+	else:
+		filename = f"manifest-{airport}-{from_date}-{to_date}.{format}"
+	return Response(
+		wrap_file(frappe.local.request.environ, file),
+		mimetype=FORMATS[format],
+		headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+		direct_passthrough=True,
+	)
+
+
+def get_manifest_flights(flight=None, airport=None, from_date=None, to_date=None):
+	if flight:
+		frappe.get_doc("Airplane Flight", flight).check_permission("read")
+		return [flight]
+	if not (airport and from_date and to_date):
+		frappe.throw("Either a flight or an airport with a date range is required.")
+	if getdate(from_date) > getdate(to_date):
+		frappe.throw("From Date cannot be after To Date.")
+	return frappe.get_list(
+		"Airplane Flight",
+		filters={
+			"source_airport": airport,
+			"date_of_departure": ["between", [from_date, to_date]],
+			"docstatus": ["<", 2],
+		},
+		order_by="date_of_departure asc, time_of_departure asc",
+		pluck="name",
+	)
+
+
+def get_manifest_rows(flights):
+	"""Yield one dict per ticket of `flights` with its add-ons joined into a list.
+
+	A single ordered query returns one row per ticket and add-on; consecutive rows of a
+	ticket are folded together while the cursor is read.
+	"""
+	if not flights:
+		return
+
+	Ticket = frappe.qb.DocType("Airplane Ticket")
+	Passenger = frappe.qb.DocType("Flight Passenger")
+	AddOn = frappe.qb.DocType("Airplane Ticket Add-on Item")
+	query = (
+		frappe.qb.from_(Ticket)
+		.left_join(Passenger)
+		.on(Passenger.name == Ticket.passenger)
+		.left_join(AddOn)
+		.on((AddOn.parent == Ticket.name) & (AddOn.parenttype == "Airplane Ticket"))
+		.select(
+			Ticket.flight,
+			Ticket.name,
+			Ticket.passenger,
+			Passenger.full_name,
+			Ticket.seat,
+			Ticket.status,
+			AddOn.item,
+		)
+		.where(Ticket.flight.isin(flights))
+		.where(Ticket.docstatus < 2)
+		.where(Ticket.status != "Cancelled")
+		.orderby(Ticket.flight)
+		.orderby(Ticket.name)
+		.orderby(AddOn.idx)
+	)
+
+	row = None
+	with frappe.db.unbuffered_cursor():
+		for flight, ticket, passenger, full_name, seat, status, add_on in query.run(as_iterator=True):
+			if not row or row["ticket"] != ticket:
+				if row:
+					yield row
+				row = {
+					"flight": flight,
+					"ticket": ticket,
+					"passenger": passenger,
+					"full_name": full_name,
+					"seat": seat,
+					"status": status,
+					"add_ons": [],
+				}
+			if add_on:
+				row["add_ons"].append(add_on)
+	if row:
+		yield row
+
+
+def write_manifest(file, rows, format="csv"):
+	if format == "jsonl":
+		for row in rows:
+			file.write(json.dumps(row, default=str))
+			file.write("\n")
+		return
+
+	writer = csv.DictWriter(file, fieldnames=FIELDS)
+	writer.writeheader()
+	for row in rows:
+		writer.writerow({**row, "add_ons": ", ".join(row["add_ons"])})
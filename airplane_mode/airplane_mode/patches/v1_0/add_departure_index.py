@@ -0,0 +1,5 @@
+from airplane_mode.airplane_mode.departure_reminders import add_departure_index
+
+
+def execute():
+	add_departure_index()
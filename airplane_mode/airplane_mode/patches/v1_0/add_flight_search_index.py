@@ -0,0 +1,5 @@
+from airplane_mode.airplane_mode.flight_search import add_search_index
+
+
+def execute():
+	add_search_index()
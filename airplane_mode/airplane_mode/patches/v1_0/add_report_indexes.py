@@ -0,0 +1,7 @@
+from airplane_mode.airplane_mode.doctype.revenue_rollup.revenue_rollup import add_report_index
+from airplane_mode.airport_management.doctype.airport_shop.airport_shop import add_occupancy_index
+
+
+def execute():
+	add_report_index()
+	add_occupancy_index()
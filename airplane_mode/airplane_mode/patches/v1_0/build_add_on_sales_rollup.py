@@ -0,0 +1,7 @@
+from airplane_mode.airplane_mode.doctype.add_on_sales_rollup.add_on_sales_rollup import (
+	rebuild_add_on_sales_rollup,
+)
+
+
+def execute():
+	rebuild_add_on_sales_rollup()
@@ -0,0 +1,5 @@
+from airplane_mode.airplane_mode.doctype.revenue_rollup.revenue_rollup import rebuild_revenue_rollup
+
+
+def execute():
+	rebuild_revenue_rollup()
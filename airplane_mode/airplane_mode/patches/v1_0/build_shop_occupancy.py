@@ -0,0 +1,7 @@
+from airplane_mode.airport_management.doctype.airport_shop_occupancy.airport_shop_occupancy import (
+	rebuild_shop_occupancy,
+)
+
+
+def execute():
+	rebuild_shop_occupancy()
@@ -0,0 +1,7 @@
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import (
+	rebuild_seat_inventory,
+)
+
+
+def execute():
+	rebuild_seat_inventory()
@@ -1,10 +1,85 @@
 import frappe
-import random
+from frappe.query_builder import Case
+
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import (
+    get_seat_inventory,
+    save_seat_map,
+)
+from airplane_mode.airplane_mode.seat_map import SeatMap
+from airplane_mode.utils import run_chunked_patch
+
+FLIGHTS_PER_CHUNK = 50
+
+
 def execute():
-    tickets = frappe.db.get_all("Airplane Ticket", filters={"seat": ["is", "not set"]})
+    run_chunked_patch(__name__, populate_seats)
+
+
+def populate_seats(last_flight):
+    """Seat the live tickets of the next flights, one set-based update per flight."""
+    flights = frappe.get_all(
+        "Airplane Ticket",
+        filters={"docstatus": ["<", 2], "status": ["!=", "Cancelled"], "flight": [">", last_flight]},
+        group_by="flight",
+        order_by="flight asc",
+        limit=FLIGHTS_PER_CHUNK,
+        pluck="flight",
+    )
+    for flight in flights:
+        populate_flight_seats(flight)
+    return flights[-1] if flights else None
 
+
+def populate_flight_seats(flight):
+    """Give each live ticket of a flight its own seat on the aircraft layout.
+
+    Seats were once drawn at random, so a ticket may have none, one off the layout
+    or one another ticket already holds. The first ticket by name keeps a valid
+    seat, the others get free seats, and tickets left over once the flight is full
+    have their seat cleared and are reported in the Error Log.
+    """
+    inventory = get_seat_inventory(flight, for_update=True)
+    if not inventory:
+        return
+
+    tickets = frappe.get_all(
+        "Airplane Ticket",
+        filters={"flight": flight, "docstatus": ["<", 2], "status": ["!=", "Cancelled"]},
+        fields=["name", "seat"],
+        order_by="name asc",
+    )
+    seat_map = SeatMap(inventory.capacity, inventory.seats_per_row)
+    unseated = []
     for ticket in tickets:
-        row = random.randint(1, 100)
-        seat = random.choice(['A', 'B', 'C', 'D', 'E'])
-        seat_number = f"{row}{seat}"
-        frappe.set_value("Airplane Ticket", ticket.name, "seat", seat_number)
\ No newline at end of file
+        index = seat_map.index(ticket.seat)
+        if index is None or seat_map.is_taken(index):
+            unseated.append(ticket)
+        else:
+            seat_map.take(index)
+
+    seats, unplaced = {}, []
+    for ticket in unseated:
+        index = seat_map.next_free()
+        if index is None:
+            unplaced.append(ticket.name)
+            if ticket.seat:
+                seats[ticket.name] = None
+            continue
+        seat_map.take(index)
+        seats[ticket.name] = seat_map.label(index)
+
+    if seats:
+        Ticket = frappe.qb.DocType("Airplane Ticket")
+        seat = Case()
+        for ticket, label in seats.items():
+            seat = seat.when(Ticket.name == ticket, label)
+        frappe.qb.update(Ticket).set(Ticket.seat, seat).where(Ticket.name.isin(list(seats))).run()
+    save_seat_map(flight, seat_map)
+
+    if unplaced:
+        frappe.log_error(
+            f"Could not seat {len(unplaced)} tickets of flight {flight}",
+            "The flight is full. Tickets without a seat:\n" + "\n".join(unplaced),
+            reference_doctype="Airplane Flight",
+            reference_name=flight,
+        )
@@ -0,0 +1,20 @@
+import frappe
+
+
+def execute():
+	# keep hand-entered totals: whatever exceeds the submitted flights becomes the opening balance
+	frappe.db.sql(
+		"""
+		UPDATE `tabCrew Member` crew
+		LEFT JOIN (
+			SELECT fc.crew_member, SUM(f.duration) AS seconds
+			FROM `tabFlight Crew` fc
+			JOIN `tabAirplane Flight` f ON f.name = fc.parent
+			WHERE fc.parenttype = 'Airplane Flight' AND f.docstatus = 1
+			GROUP BY fc.crew_member
+		) flown ON flown.crew_member = crew.name
+		SET crew.opening_flying_hours = GREATEST(
+			IFNULL(crew.total_flying_hours, 0) - IFNULL(flown.seconds, 0) / 3600, 0
+		)
+		"""
+	)
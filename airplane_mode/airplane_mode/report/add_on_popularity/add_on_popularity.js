@@ -0,0 +1,42 @@
+// Copyright (c) 2026, Me! and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Add-on Popularity"] = {
+	filters: [
+		{
+			fieldname: "from_date",
+			label: __("From Date"),
+			fieldtype: "Date",
+		},
+		{
+			fieldname: "to_date",
+			label: __("To Date"),
+			fieldtype: "Date",
+		},
+		{
+			fieldname: "airline",
+			label: __("Airline"),
+			fieldtype: "Link",
+			options: "Airline",
+		},
+		{
+			fieldname: "source_airport",
+			label: __("Source Airport"),
+			fieldtype: "Link",
+			options: "Airport",
+		},
+		{
+			fieldname: "destination_airport",
+			label: __("Destination Airport"),
+			fieldtype: "Link",
+			options: "Airport",
+		},
+		{
+			fieldname: "airport",
+			label: __("Airport"),
+			fieldtype: "Link",
+			options: "Airport",
+			description: __("Flights departing from or arriving at this airport"),
+		},
+	],
+};
@@ -0,0 +1,123 @@
+# Copyright (c) 2026, Me! and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+
+from airplane_mode.report_cache import cached_report
+
+
+@cached_report("Add-on Popularity", depends_on=("Add-on Sales Rollup",))
+def execute(filters: dict | None = None):
+	"""Return columns and data for the report.
+
+	This is the main entry point for the report. It accepts the filters as a
+	dictionary and should return columns and data. It is called by the framework
+	every time the report is refreshed or a filter is updated.
+	"""
+	filters = frappe._dict(filters or {})
+	columns = get_columns()
+	data, totals = get_data(filters)
+	chart = get_chart(data)
+	summary = get_summary(totals)
+
+	return columns, data, _("Add-on Popularity"), chart, summary
+
+
+def get_summary(totals):
+	"""Return the summary of the report from the grand total row of the query."""
+	return [
+		{
+			"value": totals.sold_count,
+			"indicator": "Blue",
+			"label": _("Add-ons Sold"),
+			"datatype": "Int",
+		},
+		{
+			"value": totals.revenue,
+			"indicator": "Green" if totals.revenue > 0 else "Red",
+			"label": _("Add-on Revenue"),
+			"datatype": "Currency",
+		},
+	]
+
+
+def get_chart(data) -> dict:
+	"""Return chart configuration for the report."""
+	return {
+		"data": {
+			"labels": [row.add_on_type for row in data],
+			"datasets": [
+				{
+					"name": _("Sold Count"),
+					"values": [row.sold_count for row in data],
+				}
+			],
+		},
+		"type": "bar",
+	}
+
+
+def get_columns() -> list[dict]:
+	"""Return columns for the report.
+
+	One field definition per column, just like a DocType field definition.
+	"""
+	return [
+		{
+			"label": _("Add-On Type"),
+			"fieldname": "add_on_type",
+			"fieldtype": "Link",
+			"options": "Airplane Ticket Add-on Type",
+		},
+		{
+			"label": _("Sold Count"),
+			"fieldname": "sold_count",
+			"fieldtype": "Int",
+		},
+		{
+			"label": _("Revenue"),
+			"fieldname": "revenue",
+			"fieldtype": "Currency",
+		},
+	]
+
+
+def get_data(filters):
+	"""Return add-on sales of submitted tickets, most sold first, and their grand total row.
+
+	Sales are read from `Add-on Sales Rollup`, which holds one row per add-on,
+	airline, route and departure date, so the cost follows the number of days and
+	routes in the filters rather than the number of add-on rows sold.
+	"""
+	Rollup = frappe.qb.DocType("Add-on Sales Rollup")
+	query = (
+		frappe.qb.from_(Rollup)
+		.select(
+			Rollup.item.as_("add_on_type"),
+			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", Rollup.quantity), 0).as_("sold_count"),
+			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", Rollup.revenue), 0).as_("revenue"),
+		)
+		.groupby(Rollup.item)
+		.rollup(vendor="mysql")
+	)
+	if filters.get("from_date"):
+		query = query.where(Rollup.date_of_departure >= filters.from_date)
+	if filters.get("to_date"):
+		query = query.where(Rollup.date_of_departure <= filters.to_date)
+	if filters.get("airline"):
+		query = query.where(Rollup.airline == filters.airline)
+	if filters.get("source_airport"):
+		query = query.where(Rollup.source_airport == filters.source_airport)
+	if filters.get("destination_airport"):
+		query = query.where(Rollup.destination_airport == filters.destination_airport)
+	if filters.get("airport"):
+		query = query.where(
+			(Rollup.source_airport == filters.airport) | (Rollup.destination_airport == filters.airport)
+		)
+
+	rows = query.run(as_dict=True)
+	if not rows:
+		return [], frappe._dict(sold_count=0, revenue=0)
+	data = sorted((row for row in rows[:-1] if row.sold_count), key=lambda row: row.sold_count, reverse=True)
+	return data, rows[-1]
@@ -3,11 +3,22 @@
 
 frappe.query_reports["Airports By Shop Occupancy"] = {
 	filters: [
-		// {
-		// 	"fieldname": "my_filter",
-		// 	"label": __("My Filter"),
-		// 	"fieldtype": "Data",
-		// 	"reqd": 1,
-		// },
+		{
+			fieldname: "airport",
+			label: __("Airport"),
+			fieldtype: "Link",
+			options: "Airport",
+		},
+		{
+			fieldname: "terminal",
+			label: __("Terminal"),
+			fieldtype: "Int",
+		},
+		{
+			fieldname: "floor",
+			label: __("Floor"),
+			fieldtype: "Select",
+			options: "\nB2\nB1\nG\n1\n2\n3\n4",
+		},
 	],
 };
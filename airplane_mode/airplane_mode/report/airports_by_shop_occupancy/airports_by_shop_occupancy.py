@@ -4,7 +4,10 @@
 import frappe
 from frappe import _
 
+from airplane_mode.report_cache import cached_report
 
+
+@cached_report("Airports by Shop Occupancy", depends_on=("Airport", "Airport Shop", "Airport Shop Occupancy"))
 def execute(filters: dict | None = None):
 	"""Return columns and data for the report.
 
@@ -12,11 +15,12 @@ def execute(filters: dict | None = None):
 	dictionary and should return columns and data. It is called by the framework
 	every time the report is refreshed or a filter is updated.
 	"""
+	filters = frappe._dict(filters or {})
 	columns = get_columns()
-	data = get_data()
+	data, totals = get_data(filters)
 	title = _("Airports by Shop Occupancy")
 	chart = get_chart(data)
-	summary = get_summary(data)
+	summary = get_summary(totals)
 
 	return columns, data, title, chart, summary
 
@@ -82,14 +86,19 @@ def get_columns() -> list[dict]:
 			"fieldname": "available_shop_count",
 			"fieldtype": "Int",
 		},
+		{
+			"label": _("Occupied Area (sq. ft)"),
+			"fieldname": "occupied_area",
+			"fieldtype": "Float",
+		},
 	]
 
 
-def get_summary(data):
-	"""Return the summary of the report."""
-	available_shops = sum(row.available_shop_count for row in data)
-	occupied_shops = sum(row.occupied_shop_count for row in data)
-	total_shops = sum(row.shop_count for row in data)
+def get_summary(totals):
+	"""Return the summary of the report from the grand total row of the query."""
+	available_shops = totals.available_shop_count
+	occupied_shops = totals.occupied_shop_count
+	total_shops = totals.shop_count
 	return [{
 		"value": available_shops,
  		"indicator": "Green" if available_shops > 0 else "Red",
@@ -109,27 +118,71 @@ def get_summary(data):
  		"datatype": "Int",
  	}]	
 
-def get_data() -> list[list]:
-	"""Return data for the report.
+def get_data(filters) -> tuple[list, dict]:
+	"""Return data for the report and its grand total row.
 
-	The report data is a list of rows, with each row being a list of cell values.
+	Airport-wide figures are read from the live `Airport Shop Occupancy` counters.
+	Filtering on terminal or floor needs the shops themselves, which are then
+	counted through `occupancy_report_index`. Either way `WITH ROLLUP` returns the
+	grand total as the last row of the same query.
 	"""
+	if filters.get("terminal") not in (None, "") or filters.get("floor"):
+		query = get_shop_query(filters)
+	else:
+		query = get_counter_query()
+
+	if filters.get("airport"):
+		Airport = frappe.qb.DocType("Airport")
+		query = query.where(Airport.name == filters.airport)
+
+	rows = query.run(as_dict=True)
+	if not rows:
+		return [], frappe._dict(shop_count=0, occupied_shop_count=0, available_shop_count=0, occupied_area=0)
+	return rows[:-1], rows[-1]
+
+
+def get_counter_query():
+	Airport = frappe.qb.DocType("Airport")
+	Occupancy = frappe.qb.DocType("Airport Shop Occupancy")
+	return (
+		frappe.qb.from_(Airport)
+		.left_join(Occupancy)
+		.on(Occupancy.name == Airport.name)
+		.select(
+			Airport.name,
+			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", Occupancy.total_shops), 0).as_("shop_count"),
+			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", Occupancy.occupied_shops), 0).as_("occupied_shop_count"),
+			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", Occupancy.available_shops), 0).as_("available_shop_count"),
+			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", Occupancy.occupied_area), 0).as_("occupied_area"),
+		)
+		.groupby(Airport.name)
+		.rollup(vendor="mysql")
+	)
+
+
+def get_shop_query(filters):
+	"""Terminal and floor are applied in the join so airports without matching shops still show."""
 	Airport = frappe.qb.DocType("Airport")
 	AirportShop = frappe.qb.DocType("Airport Shop")
-	
-	query = (
-		frappe.qb.from_(AirportShop)
-		.right_join(Airport)
-		.on(Airport.name == AirportShop.airport)
+
+	join_condition = Airport.name == AirportShop.airport
+	if filters.get("terminal") not in (None, ""):
+		join_condition &= AirportShop.terminal == filters.terminal
+	if filters.get("floor"):
+		join_condition &= AirportShop.floor == filters.floor
+
+	occupied = AirportShop.status == "Occupied"
+	return (
+		frappe.qb.from_(Airport)
+		.left_join(AirportShop)
+		.on(join_condition)
 		.select(
 			Airport.name,
 			frappe.qb.functions("Coalesce", frappe.qb.functions("Count", AirportShop.name), 0).as_("shop_count"),
-			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", AirportShop.status == "Occupied"), 0).as_("occupied_shop_count"),
+			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", occupied), 0).as_("occupied_shop_count"),
 			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", AirportShop.status == "Available"), 0).as_("available_shop_count"),
+			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", frappe.qb.functions("If", occupied, AirportShop.area_sq_ft, 0)), 0).as_("occupied_area"),
 		)
 		.groupby(Airport.name)
+		.rollup(vendor="mysql")
 	)
-
-	rows = query.run(as_dict=True)
-	return rows
-
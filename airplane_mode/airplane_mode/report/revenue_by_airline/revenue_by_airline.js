@@ -3,11 +3,40 @@
 
 frappe.query_reports["Revenue By Airline"] = {
 	filters: [
-		// {
-		// 	"fieldname": "my_filter",
-		// 	"label": __("My Filter"),
-		// 	"fieldtype": "Data",
-		// 	"reqd": 1,
-		// },
+		{
+			fieldname: "from_date",
+			label: __("From Date"),
+			fieldtype: "Date",
+		},
+		{
+			fieldname: "to_date",
+			label: __("To Date"),
+			fieldtype: "Date",
+		},
+		{
+			fieldname: "airline",
+			label: __("Airline"),
+			fieldtype: "Link",
+			options: "Airline",
+		},
+		{
+			fieldname: "source_airport",
+			label: __("Source Airport"),
+			fieldtype: "Link",
+			options: "Airport",
+		},
+		{
+			fieldname: "destination_airport",
+			label: __("Destination Airport"),
+			fieldtype: "Link",
+			options: "Airport",
+		},
+		{
+			fieldname: "airport",
+			label: __("Airport"),
+			fieldtype: "Link",
+			options: "Airport",
+			description: __("Flights departing from or arriving at this airport"),
+		},
 	],
-};
\ No newline at end of file
+};
@@ -4,7 +4,10 @@
 import frappe
 from frappe import _
 
+from airplane_mode.report_cache import cached_report
 
+
+@cached_report("Revenue by Airline", depends_on=("Airline", "Revenue Rollup"))
 def execute(filters: dict | None = None):
 	"""Return columns and data for the report.
 
@@ -12,27 +15,34 @@ def execute(filters: dict | None = None):
 	dictionary and should return columns and data. It is called by the framework
 	every time the report is refreshed or a filter is updated.
 	"""
+	filters = frappe._dict(filters or {})
 	columns = get_columns()
-	data = get_data()
+	data, totals = get_data(filters)
 	chart = get_chart(data)
-	summary = get_summary(data)
+	summary = get_summary(totals)
 	title = get_title()
- 
+
 	return columns, data, title, chart, summary
 
 def get_title():
 	"""Return the title of the report."""
 	return _("Revenue by Airline")
 
-def get_summary(data):
-	"""Return the summary of the report."""
-	revenue = sum(row[1] for row in data)
+def get_summary(totals):
+	"""Return the summary of the report from the grand total row of the query."""
+	revenue = totals[1]
 	return [{
 		"value": revenue,
  		"indicator": "Green" if revenue > 0 else "Red",
  		"label": _("Total Revenue"),
  		"datatype": "Currency",
  		"currency": "INR"
+	},
+	{
+		"value": totals[2],
+ 		"indicator": "Blue",
+ 		"label": _("Tickets Sold"),
+ 		"datatype": "Int",
 	}]
 
 def get_chart(data: list[list]) -> dict:
@@ -75,30 +85,52 @@ def get_columns() -> list[dict]:
 			"fieldname": "revenue",
 			"fieldtype": "Currency",
 		},
+		{
+			"label": _("Tickets"),
+			"fieldname": "tickets",
+			"fieldtype": "Int",
+		},
 	]
 
 
-def get_data() -> list[list]:
-	"""Return data for the report.
+def get_data(filters) -> tuple[list[list], list]:
+	"""Return data for the report and its grand total row.
 
 	The report data is a list of rows, with each row being a list of cell values.
+	Revenue is read from `Revenue Rollup`, which holds one row per airline, route
+	and departure date, instead of aggregating every ticket. Filters are applied in
+	the join so airlines without matching revenue still show, and `WITH ROLLUP`
+	returns the grand total as the last row of the same query.
 	"""
-	AirplaneTicket = frappe.qb.DocType('Airplane Ticket')
-	SubmittedTicket = frappe.qb.from_(AirplaneTicket).select(AirplaneTicket.name, AirplaneTicket.total_amount, AirplaneTicket.flight).where(AirplaneTicket.docstatus == 1)
-	Airplane = frappe.qb.DocType('Airplane')
-	Flight = frappe.qb.DocType('Airplane Flight')
 	Airline = frappe.qb.DocType('Airline')
+	Rollup = frappe.qb.DocType('Revenue Rollup')
+
+	join_condition = Rollup.airline == Airline.name
+	if filters.get('from_date'):
+		join_condition &= Rollup.date_of_departure >= filters.from_date
+	if filters.get('to_date'):
+		join_condition &= Rollup.date_of_departure <= filters.to_date
+	if filters.get('source_airport'):
+		join_condition &= Rollup.source_airport == filters.source_airport
+	if filters.get('destination_airport'):
+		join_condition &= Rollup.destination_airport == filters.destination_airport
+	if filters.get('airport'):
+		join_condition &= (Rollup.source_airport == filters.airport) | (Rollup.destination_airport == filters.airport)
 
 	query = (
 		frappe.qb.from_(Airline)
-		.left_join(Airplane).on(Airplane.airline == Airline.name)
-		.left_join(Flight).on(Flight.airplane == Airplane.name)
-		.left_join(SubmittedTicket).on(SubmittedTicket.flight == Flight.name)
+		.left_join(Rollup).on(join_condition)
 		.select(
-			Airline.name.as_('airline'), 
-			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", SubmittedTicket.total_amount), 0).as_('revenue')
+			Airline.name.as_('airline'),
+			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", Rollup.revenue), 0).as_('revenue'),
+			frappe.qb.functions("Coalesce", frappe.qb.functions("Sum", Rollup.tickets), 0).as_('tickets'),
 			)
-		.groupby(Airline.name))
-
-	rows = query.run(as_dict=True)
-	return [[r.get('airline'), r.get('revenue')] for r in rows]
+		.groupby(Airline.name)
+		.rollup(vendor="mysql"))
+	if filters.get('airline'):
+		query = query.where(Airline.name == filters.airline)
+
+	rows = [[r.get('airline'), r.get('revenue'), r.get('tickets')] for r in query.run(as_dict=True)]
+	if not rows:
+		return [], [None, 0, 0]
+	return rows[:-1], rows[-1]
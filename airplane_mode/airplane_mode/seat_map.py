@@ -0,0 +1,70 @@
+import re
+from string import ascii_uppercase
+
+DEFAULT_SEATS_PER_ROW = 6
+SEAT_PATTERN = re.compile(r"^(\d+)([A-Z])$")
+
+
+class SeatMap:
+	"""Bitmap of the seats on one flight, bit `i` being set when seat `i` is taken.
+
+	Seats are numbered row by row from the front of the aircraft, so with six
+	seats per row index 0 is "1A", index 5 is "1F" and index 6 is "2A". Only the
+	first `capacity` indexes exist, the last row may be partially filled.
+	"""
+
+	def __init__(self, capacity, seats_per_row=None, bits=0):
+		self.capacity = capacity or 0
+		self.seats_per_row = min(seats_per_row or DEFAULT_SEATS_PER_ROW, len(ascii_uppercase))
+		self.bits = bits
+
+	@classmethod
+	def from_hex(cls, capacity, seats_per_row, value):
+		return cls(capacity, seats_per_row, int(value, 16) if value else 0)
+
+	def to_hex(self):
+		return format(self.bits, "x")
+
+	@property
+	def free_mask(self):
+		return ~self.bits & ((1 << self.capacity) - 1)
+
+	def label(self, index):
+		row, column = divmod(index, self.seats_per_row)
+		return f"{row + 1}{ascii_uppercase[column]}"
+
+	def index(self, label):
+		"""Return the bit index of a seat label, or None if the seat does not exist."""
+		match = SEAT_PATTERN.match((label or "").strip().upper())
+		if not match:
+			return None
+		row, column = int(match.group(1)), ascii_uppercase.index(match.group(2))
+		if row < 1 or column >= self.seats_per_row:
+			return None
+		index = (row - 1) * self.seats_per_row + column
+		return index if index < self.capacity else None
+
+	def is_taken(self, index):
+		return bool(self.bits >> index & 1)
+
+	def next_free(self):
+		free = self.free_mask
+		return (free & -free).bit_length() - 1 if free else None
+
+	def take(self, index):
+		self.bits |= 1 << index
+
+	def release(self, index):
+		self.bits &= ~(1 << index)
+
+	def taken_count(self):
+		return self.bits.bit_count()
+
+	def free_seats(self):
+		seats = []
+		free = self.free_mask
+		while free:
+			lowest = free & -free
+			seats.append(self.label(lowest.bit_length() - 1))
+			free ^= lowest
+		return seats
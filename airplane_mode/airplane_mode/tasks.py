@@ -0,0 +1,108 @@
+import frappe
+from frappe.utils import now_datetime, today
+from pypika import CustomFunction
+from pypika.terms import LiteralValue
+
+from airplane_mode.airplane_mode.availability import clear_availability_cache
+
+STATUS_BATCH_SIZE = 1000
+# draft tickets still in these statuses when their flight departs did not board
+NO_SHOW_STATUSES = ("Booked", "Checked-In")
+
+Timestamp = CustomFunction("TIMESTAMP", ["date", "time"])
+AddSeconds = CustomFunction("TIMESTAMPADD", ["unit", "interval", "datetime"])
+
+
+def refresh_crew_stats():
+	"""Refresh the age and flying hours of every crew member with two set-based updates.
+
+	Flying hours are reconciled as the opening hours plus the duration of every
+	submitted flight, which corrects any drift in the per-flight accrual. Rows
+	that already hold the right values are not written.
+	"""
+	frappe.db.sql(
+		"""
+		UPDATE `tabCrew Member`
+		SET age = TIMESTAMPDIFF(YEAR, date_of_birth, %(today)s)
+		WHERE date_of_birth IS NOT NULL
+			AND NOT age <=> TIMESTAMPDIFF(YEAR, date_of_birth, %(today)s)
+		""",
+		{"today": today()},
+	)
+
+	frappe.db.sql(
+		"""
+		UPDATE `tabCrew Member` crew
+		LEFT JOIN (
+			SELECT fc.crew_member, SUM(f.duration) AS seconds
+			FROM `tabFlight Crew` fc
+			JOIN `tabAirplane Flight` f ON f.name = fc.parent
+			WHERE fc.parenttype = 'Airplane Flight' AND f.docstatus = 1
+			GROUP BY fc.crew_member
+		) flown ON flown.crew_member = crew.name
+		SET crew.total_flying_hours = IFNULL(crew.opening_flying_hours, 0) + IFNULL(flown.seconds, 0) / 3600
+		WHERE ABS(IFNULL(crew.total_flying_hours, 0)
+			- (IFNULL(crew.opening_flying_hours, 0) + IFNULL(flown.seconds, 0) / 3600)) > 0.0001
+		"""
+	)
+
+
+def update_flight_statuses():
+	"""Move flights from Scheduled to Departed at departure and on to Completed on arrival.
+
+	Flights are picked in batches through `departure_index` and moved with one update
+	per batch, together with their tickets: draft tickets that were never boarded
+	become No-Show when the flight departs. Each batch is committed on its own.
+	"""
+	now = now_datetime()
+	Flight = frappe.qb.DocType("Airplane Flight")
+	departure = Timestamp(Flight.date_of_departure, Flight.time_of_departure)
+	arrival = AddSeconds(LiteralValue("SECOND"), Flight.duration, departure)
+
+	for flights in get_flight_batches("Scheduled", departure <= now, now):
+		set_flight_status(flights, "Scheduled", "Departed")
+		mark_no_shows(flights)
+		frappe.db.commit()
+
+	for flights in get_flight_batches("Departed", arrival <= now, now):
+		set_flight_status(flights, "Departed", "Completed")
+		frappe.db.commit()
+
+
+def get_flight_batches(status, due, now):
+	Flight = frappe.qb.DocType("Airplane Flight")
+	while True:
+		flights = (
+			frappe.qb.from_(Flight)
+			.select(Flight.name)
+			.where(Flight.status == status)
+			.where(Flight.date_of_departure <= now.date())
+			.where(Flight.docstatus < 2)
+			.where(due)
+			.limit(STATUS_BATCH_SIZE)
+		).run(pluck=True)
+		if not flights:
+			break
+		yield flights
+
+
+def set_flight_status(flights, current, status):
+	Flight = frappe.qb.DocType("Airplane Flight")
+	(
+		frappe.qb.update(Flight)
+		.set(Flight.status, status)
+		.where(Flight.name.isin(flights))
+		.where(Flight.status == current)
+	).run()
+	clear_availability_cache(*flights)
+
+
+def mark_no_shows(flights):
+	Ticket = frappe.qb.DocType("Airplane Ticket")
+	(
+		frappe.qb.update(Ticket)
+		.set(Ticket.status, "No-Show")
+		.where(Ticket.flight.isin(flights))
+		.where(Ticket.docstatus == 0)
+		.where(Ticket.status.isin(NO_SHOW_STATUSES))
+	).run()
@@ -0,0 +1,25 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from airplane_mode.airplane_mode.availability import CACHE_KEY, get_flights_availability
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+	create_test_ticket,
+)
+
+
+class TestAvailability(FrappeTestCase):
+	def test_availability_of_published_flights(self):
+		flight = create_test_flight(capacity=1)
+		flight.db_set({"published": 1, "fare": 1500})
+		frappe.cache.delete_value(CACHE_KEY.format(flight.name))
+
+		availability = get_flights_availability([flight.name, "FLIGHT-DOES-NOT-EXIST"])
+		self.assertEqual(availability, {flight.name: {"seats_left": 1, "sold_out": False, "fare": 1500}})
+
+		create_test_ticket(flight.name)
+		frappe.db.after_commit.run()
+		self.assertTrue(get_flights_availability([flight.name])[flight.name]["sold_out"])
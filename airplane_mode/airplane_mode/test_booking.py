@@ -0,0 +1,58 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from airplane_mode.airplane_mode.booking import issue_tickets
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+	create_test_passenger,
+	get_counters,
+)
+
+
+def create_test_add_on_type(name="Test Extra Baggage"):
+	if not frappe.db.exists("Airplane Ticket Add-on Type", name):
+		frappe.get_doc({"doctype": "Airplane Ticket Add-on Type", "name": name}).insert()
+	return name
+
+
+class TestBooking(FrappeTestCase):
+	def test_issue_tickets_for_group(self):
+		flight = create_test_flight(capacity=3)
+		add_on = create_test_add_on_type()
+		requests = [
+			{
+				"passenger": create_test_passenger(),
+				"flight_price": 1000,
+				"add_ons": [{"item": add_on, "amount": 200}, {"item": add_on, "amount": 200}],
+			}
+			for _ in range(2)
+		]
+
+		results = issue_tickets(flight.name, requests)
+
+		self.assertEqual([r.seat for r in results], ["1A", "1B"])
+		self.assertEqual(len({r.ticket for r in results}), 2)
+		self.assertEqual(get_counters(flight.name).seats_held, 2)
+
+		ticket = frappe.get_doc("Airplane Ticket", results[0].ticket)
+		self.assertEqual(ticket.source_airport_code, flight.source_airport_code)
+		self.assertEqual(len(ticket.add_ons), 1)
+		self.assertEqual(ticket.total_amount, 1200)
+
+	def test_issue_tickets_reports_failures_per_ticket(self):
+		flight = create_test_flight(capacity=1)
+		requests = [
+			{"passenger": "PSG-DOES-NOT-EXIST", "flight_price": 1000},
+			{"passenger": create_test_passenger(), "flight_price": 1000},
+			{"passenger": create_test_passenger(), "flight_price": 1000},
+		]
+
+		results = issue_tickets(flight.name, requests)
+
+		self.assertIn("does not exist", results[0].error)
+		self.assertTrue(results[1].ticket)
+		self.assertIn("full", results[2].error)
+		self.assertEqual(get_counters(flight.name).seats_held, 1)
@@ -0,0 +1,63 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from airplane_mode.airplane_mode.crew_availability import DutyIndex
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+)
+
+
+def create_test_crew_member(role="Pilot", airline="Test Airline"):
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "Crew Member",
+				"first_name": "Test",
+				"last_name": "Crew",
+				"gender": "Other",
+				"date_of_birth": "1985-01-01",
+				"employee_id": f"TEST-{frappe.generate_hash(length=8)}",
+				"role": role,
+				"status": "Active",
+				"airline": airline,
+			}
+		)
+		.insert()
+		.name
+	)
+
+
+class TestDutyIndex(FrappeTestCase):
+	def test_conflicts(self):
+		day = datetime(2026, 1, 1)
+		index = DutyIndex(
+			[
+				(day, day + timedelta(hours=4), "FL-1"),
+				(day + timedelta(hours=10), day + timedelta(hours=12), "FL-2"),
+			]
+		)
+
+		self.assertTrue(index.is_free(day + timedelta(hours=4), day + timedelta(hours=10)))
+		self.assertEqual(
+			index.conflicts(day + timedelta(hours=3), day + timedelta(hours=11)), ["FL-2", "FL-1"]
+		)
+		self.assertEqual(
+			index.conflicts(day + timedelta(hours=11), day + timedelta(hours=20), exclude="FL-2"), []
+		)
+
+
+class TestCrewAvailability(FrappeTestCase):
+	def test_crew_cannot_fly_overlapping_flights(self):
+		first = create_test_flight()
+		pilot = create_test_crew_member()
+		first.append("crew_members", {"crew_member": pilot})
+		first.save()
+
+		second = create_test_flight()
+		second.append("crew_members", {"crew_member": pilot})
+		self.assertRaises(frappe.ValidationError, second.save)
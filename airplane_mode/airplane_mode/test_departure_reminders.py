@@ -0,0 +1,35 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, now_datetime
+
+from airplane_mode.airplane_mode.departure_reminders import send_departure_reminders
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+	create_test_ticket,
+)
+
+
+class TestDepartureReminders(FrappeTestCase):
+	def test_reminders_are_sent_once_per_ticket(self):
+		flight = create_test_flight()
+		departure = add_to_date(now_datetime(), hours=6)
+		flight.db_set(
+			{"date_of_departure": departure.date(), "time_of_departure": departure.strftime("%H:%M:%S")}
+		)
+		ticket = create_test_ticket(flight.name)
+		frappe.db.set_value("Flight Passenger", ticket.passenger, "email", "passenger@example.com")
+
+		def queued():
+			return frappe.db.count(
+				"Email Queue", {"reference_doctype": "Airplane Flight", "reference_name": flight.name}
+			)
+
+		send_departure_reminders()
+		self.assertEqual(queued(), 1)
+		self.assertEqual(frappe.db.get_value("Airplane Ticket", ticket.name, "departure_reminder_sent"), 1)
+
+		send_departure_reminders()
+		self.assertEqual(queued(), 1)
@@ -0,0 +1,60 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import get_free_seats
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+	create_test_ticket,
+	get_counters,
+)
+from airplane_mode.airplane_mode.flight_cancellation import cancel_flight_tickets
+from airplane_mode.airplane_mode.flight_operations import process_flight_tickets
+
+
+class TestFlightCancellation(FrappeTestCase):
+	def test_cancel_flight_cancels_and_refunds_tickets(self):
+		flight = create_test_flight(capacity=3)
+		tickets = [create_test_ticket(flight.name) for _ in range(3)]
+		process_flight_tickets(flight.name, "Board", tickets=[tickets[0].name])
+		process_flight_tickets(flight.name, "Submit", tickets=[tickets[0].name])
+
+		flight.reload()
+		flight.cancel_flight()
+		summary = cancel_flight_tickets(flight.name, chunk_size=2)
+
+		self.assertEqual((summary.total, summary.cancelled), (3, 3))
+		self.assertEqual(frappe.db.get_value("Airplane Flight", flight.name, "status"), "Cancelled")
+		# the submitted ticket is cancelled, the drafts stay drafts without a seat
+		for ticket, expected_docstatus in zip(tickets, (2, 0, 0), strict=True):
+			docstatus, status, refund_amount = frappe.db.get_value(
+				"Airplane Ticket", ticket.name, ["docstatus", "status", "refund_amount"]
+			)
+			self.assertEqual(
+				(docstatus, status, refund_amount), (expected_docstatus, "Cancelled", ticket.total_amount)
+			)
+		self.assertFalse(frappe.db.get_value("Airplane Ticket", tickets[1].name, "seat"))
+		counters = get_counters(flight.name)
+		self.assertEqual((counters.seats_held, counters.seats_sold), (0, 0))
+		self.assertEqual(len(get_free_seats(flight.name)), 3)
+
+	def test_rerun_only_touches_remaining_tickets(self):
+		flight = create_test_flight(capacity=3)
+		for _ in range(3):
+			create_test_ticket(flight.name)
+
+		cancel_flight_tickets(flight.name, chunk_size=2)
+		self.assertEqual(cancel_flight_tickets(flight.name).cancelled, 0)
+
+	def test_cancelling_the_flight_document_keeps_its_tickets(self):
+		flight = create_test_flight(capacity=2)
+		ticket = create_test_ticket(flight.name)
+		flight.reload()
+		flight.submit()
+
+		flight.cancel()
+
+		self.assertEqual(frappe.db.get_value("Airplane Ticket", ticket.name, "status"), "Booked")
+		self.assertEqual(get_counters(flight.name).seats_held, 1)
@@ -0,0 +1,39 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+	create_test_ticket,
+	get_counters,
+)
+from airplane_mode.airplane_mode.flight_operations import process_flight_tickets
+
+
+class TestFlightOperations(FrappeTestCase):
+	def test_board_and_submit_flight(self):
+		flight = create_test_flight(capacity=3)
+		tickets = [create_test_ticket(flight.name) for _ in range(3)]
+
+		summary = process_flight_tickets(flight.name, "Board", chunk_size=2)
+		self.assertEqual((summary.succeeded, summary.failed), (3, []))
+
+		summary = process_flight_tickets(flight.name, "Submit", chunk_size=2)
+		self.assertEqual(summary.succeeded, 3)
+		for ticket in tickets:
+			self.assertEqual(frappe.db.get_value("Airplane Ticket", ticket.name, "docstatus"), 1)
+		counters = get_counters(flight.name)
+		self.assertEqual((counters.seats_held, counters.seats_sold), (0, 3))
+
+	def test_submit_rejects_tickets_not_boarded(self):
+		flight = create_test_flight(capacity=2)
+		boarded = create_test_ticket(flight.name, status="Boarded")
+		booked = create_test_ticket(flight.name)
+
+		summary = process_flight_tickets(flight.name, "Submit", tickets=[boarded.name, booked.name])
+
+		self.assertEqual(summary.succeeded, 1)
+		self.assertEqual([row["ticket"] for row in summary.failed], [booked.name])
+		self.assertEqual(frappe.db.get_value("Airplane Ticket", booked.name, "docstatus"), 0)
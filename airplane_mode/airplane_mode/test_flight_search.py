@@ -0,0 +1,31 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+)
+from airplane_mode.airplane_mode.flight_search import search_flights
+
+
+class TestFlightSearch(FrappeTestCase):
+	def test_keyset_pages_cover_every_flight_once(self):
+		flights = [create_test_flight() for _ in range(3)]
+		for flight in flights:
+			flight.db_set("published", 1)
+		route = (flights[0].source_airport, flights[0].destination_airport)
+		window = (today(), add_days(today(), 10))
+
+		found = []
+		after = None
+		while True:
+			page = search_flights(*route, *window, after=after, page_length=2)
+			found += [flight.name for flight in page["flights"]]
+			after = page["next"]
+			if not after:
+				break
+
+		for flight in flights:
+			self.assertEqual(found.count(flight.name), 1)
@@ -0,0 +1,121 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import csv
+import json
+import os
+import tempfile
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+	create_test_passenger,
+	get_counters,
+)
+from airplane_mode.airplane_mode.importer import import_file
+
+
+class TestImporter(FrappeTestCase):
+	def setUp(self):
+		self.tmpdir = tempfile.mkdtemp()
+		self.flight = create_test_flight(capacity=5)
+		self.passengers = [create_test_passenger() for _ in range(3)]
+
+	def write_tickets(self, rows):
+		path = os.path.join(self.tmpdir, "tickets.jsonl")
+		with open(path, "w") as file:
+			file.writelines(json.dumps(row) + "\n" for row in rows)
+		return path
+
+	def test_rejects_are_written_and_valid_rows_imported(self):
+		path = self.write_tickets(
+			[
+				{
+					"flight": self.flight.name,
+					"passenger": self.passengers[0],
+					"flight_price": 500,
+					"seat": "1A",
+				},
+				{
+					"flight": self.flight.name,
+					"passenger": self.passengers[1],
+					"flight_price": 500,
+					"seat": "1A",
+				},
+				{"flight": "NO-SUCH-FLIGHT", "passenger": self.passengers[2], "flight_price": 500},
+			]
+		)
+
+		summary = import_file("Airplane Ticket", path)
+
+		self.assertEqual((summary.read, summary.imported, summary.rejected), (3, 1, 2))
+		ticket = frappe.get_doc("Airplane Ticket", {"passenger": self.passengers[0]})
+		self.assertEqual(ticket.source_airport_code, self.flight.source_airport_code)
+		self.assertEqual(ticket.total_amount, 500)
+		self.assertEqual(get_counters(self.flight.name).seats_held, 1)
+		with open(summary.error_file) as file:
+			self.assertEqual([row["line"] for row in csv.DictReader(file)], ["2", "3"])
+
+	def test_dry_run_imports_nothing(self):
+		path = self.write_tickets(
+			[
+				{"flight": self.flight.name, "passenger": self.passengers[0], "flight_price": 500},
+			]
+		)
+		frappe.db.commit()
+
+		summary = import_file("Airplane Ticket", path, dry_run=True)
+
+		self.assertEqual(summary.imported, 1)
+		self.assertFalse(frappe.db.exists("Airplane Ticket", {"passenger": self.passengers[0]}))
+
+	def test_submitted_tickets_must_be_boarded(self):
+		path = self.write_tickets(
+			[
+				{
+					"flight": self.flight.name,
+					"passenger": self.passengers[0],
+					"flight_price": 500,
+					"docstatus": 1,
+				},
+				{
+					"flight": self.flight.name,
+					"passenger": self.passengers[1],
+					"flight_price": 500,
+					"docstatus": 1,
+					"status": "Boarded",
+				},
+			]
+		)
+
+		summary = import_file("Airplane Ticket", path)
+
+		self.assertEqual((summary.imported, summary.rejected), (1, 1))
+		self.assertEqual(
+			frappe.db.get_value("Airplane Ticket", {"passenger": self.passengers[1]}, "docstatus"), 1
+		)
+		with open(summary.error_file) as file:
+			self.assertEqual(
+				next(csv.DictReader(file))["error"], "Cannot submit ticket unless status is 'Boarded'."
+			)
+
+	def test_tickets_beyond_capacity_are_rejected(self):
+		flight = create_test_flight(capacity=2)
+		path = self.write_tickets(
+			[
+				{"flight": flight.name, "passenger": passenger, "flight_price": 0}
+				for passenger in self.passengers
+			]
+		)
+
+		summary = import_file("Airplane Ticket", path)
+
+		self.assertEqual((summary.imported, summary.rejected), (2, 1))
+		seats = frappe.get_all("Airplane Ticket", filters={"flight": flight.name}, pluck="seat")
+		self.assertEqual(len(set(seats)), 2)
+		self.assertTrue(all(seats))
+		self.assertEqual(get_counters(flight.name).seats_held, 2)
+		with open(summary.error_file) as file:
+			self.assertEqual(next(csv.DictReader(file))["error"], f"Flight {flight.name} is full.")
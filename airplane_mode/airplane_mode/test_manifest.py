@@ -0,0 +1,36 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import io
+import json
+
+from frappe.tests.utils import FrappeTestCase
+
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+	create_test_ticket,
+)
+from airplane_mode.airplane_mode.manifest import get_manifest_rows, write_manifest
+from airplane_mode.airplane_mode.test_booking import create_test_add_on_type
+
+
+class TestManifest(FrappeTestCase):
+	def test_manifest_rows_fold_add_ons(self):
+		flight = create_test_flight(capacity=2)
+		add_ons = [create_test_add_on_type(), create_test_add_on_type("Test Meal")]
+		with_add_ons = create_test_ticket(
+			flight.name, add_ons=[{"item": item, "amount": 100} for item in add_ons]
+		)
+		without_add_ons = create_test_ticket(flight.name)
+
+		rows = {row["ticket"]: row for row in get_manifest_rows([flight.name])}
+
+		self.assertEqual(rows[with_add_ons.name]["add_ons"], add_ons)
+		self.assertEqual(rows[without_add_ons.name]["add_ons"], [])
+		self.assertEqual(rows[with_add_ons.name]["seat"], with_add_ons.seat)
+
+		file = io.StringIO()
+		write_manifest(file, rows.values(), "jsonl")
+		lines = file.getvalue().splitlines()
+		self.assertEqual(len(lines), 2)
+		self.assertEqual(json.loads(lines[0])["flight"], flight.name)
@@ -0,0 +1,30 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import set_request
+from frappe.website.serve import get_response
+
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+)
+from airplane_mode.page_cache import STATS_KEY, clear_routes, get_page_cache_stats
+
+
+class TestPageCache(FrappeTestCase):
+	def test_plain_route_is_served_from_cache(self):
+		flight = create_test_flight()
+		flight.db_set("published", 1)
+		clear_routes(flight.route)
+		frappe.cache.delete_value(STATS_KEY)
+
+		frappe.set_user("Guest")
+		try:
+			for _ in range(2):
+				set_request(method="GET", path=flight.route)
+				self.assertEqual(get_response().status_code, 200)
+		finally:
+			frappe.set_user("Administrator")
+
+		self.assertEqual(get_page_cache_stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5})
@@ -0,0 +1,55 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import today
+
+from airplane_mode import report_cache
+from airplane_mode.airplane_mode.doctype.revenue_rollup.revenue_rollup import update_revenue_rollup
+from airplane_mode.airplane_mode.report.revenue_by_airline.revenue_by_airline import execute
+from airplane_mode.airport_management.test_tasks import create_test_airline
+
+
+class TestReportCache(FrappeTestCase):
+	def setUp(self):
+		frappe.cache.delete_value([report_cache.CACHE_KEY, report_cache.LRU_KEY, report_cache.STATS_KEY])
+
+	def get_report_stats(self):
+		return report_cache.get_report_cache_stats()["reports"]["Revenue by Airline"]
+
+	def test_results_are_reused_until_a_dependency_changes(self):
+		airline = create_test_airline("Report Cache Airline")
+		filters = {"airline": airline, "from_date": today(), "to_date": today()}
+
+		first = execute(filters)
+		self.assertEqual(execute({**filters, "airport": None}), first)
+		self.assertEqual(self.get_report_stats()["hits"], 1)
+
+		update_revenue_rollup(
+			[
+				{
+					"airline": airline,
+					"source_airport": None,
+					"destination_airport": None,
+					"date_of_departure": today(),
+					"revenue": 500,
+					"tickets": 1,
+				}
+			]
+		)
+		_, data, *_ = execute(filters)
+		self.assertEqual(data, [[airline, 500, 1]])
+		self.assertEqual(self.get_report_stats()["misses"], 2)
+
+	def test_least_recently_used_results_are_evicted(self):
+		with patch.object(report_cache, "MAX_ENTRIES", 2):
+			for airline in ("A", "B", "A", "C"):
+				execute({"airline": airline})
+			execute({"airline": "A"})
+
+		stats = report_cache.get_report_cache_stats()
+		self.assertEqual((stats["entries"], stats["evictions"]), (2, 1))
+		self.assertEqual(self.get_report_stats()["hits"], 2)
@@ -0,0 +1,52 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, now_datetime
+
+from airplane_mode.airplane_mode.doctype.flight_seat_inventory.test_flight_seat_inventory import (
+	create_test_flight,
+	create_test_ticket,
+)
+from airplane_mode.airplane_mode.tasks import refresh_crew_stats, update_flight_statuses
+from airplane_mode.airplane_mode.test_crew_availability import create_test_crew_member
+
+
+class TestTasks(FrappeTestCase):
+	def test_flying_hours_accrue_and_reconcile(self):
+		flight = create_test_flight()
+		pilot = create_test_crew_member()
+		frappe.db.set_value("Crew Member", pilot, "opening_flying_hours", 100)
+		flight.append("crew_members", {"crew_member": pilot})
+		flight.save()
+		flight.submit()
+
+		# the test flight lasts 2 hours
+		self.assertEqual(frappe.db.get_value("Crew Member", pilot, "total_flying_hours"), 2)
+
+		frappe.db.set_value("Crew Member", pilot, {"total_flying_hours": 0, "age": 0})
+		refresh_crew_stats()
+		total, age = frappe.db.get_value("Crew Member", pilot, ["total_flying_hours", "age"])
+		self.assertEqual(total, 102)
+		self.assertGreater(age, 0)
+
+		flight.cancel()
+		self.assertEqual(frappe.db.get_value("Crew Member", pilot, "total_flying_hours"), 100)
+
+	def test_flight_status_follows_departure_and_arrival(self):
+		flight = create_test_flight()
+		boarded = create_test_ticket(flight.name, status="Boarded")
+		booked = create_test_ticket(flight.name)
+
+		# departed an hour ago, lands in an hour
+		departure = add_to_date(now_datetime(), hours=-1)
+		flight.db_set({"date_of_departure": departure.date(), "time_of_departure": departure.strftime("%H:%M:%S")})
+		update_flight_statuses()
+		self.assertEqual(frappe.db.get_value("Airplane Flight", flight.name, "status"), "Departed")
+		self.assertEqual(frappe.db.get_value("Airplane Ticket", booked.name, "status"), "No-Show")
+		self.assertEqual(frappe.db.get_value("Airplane Ticket", boarded.name, "status"), "Boarded")
+
+		flight.db_set("duration", 1800)
+		update_flight_statuses()
+		self.assertEqual(frappe.db.get_value("Airplane Flight", flight.name, "status"), "Completed")
@@ -1,3 +1,33 @@
 frappe.ready(function() {
-	// bind events here
-})
\ No newline at end of file
+	// book through the API, which waitlists the passenger when the flight is full
+	// instead of failing the whole submission
+	frappe.web_form.save = function() {
+		const values = frappe.web_form.get_values();
+		if (!values) {
+			return false;
+		}
+		frappe.call({
+			method: "airplane_mode.airplane_mode.booking.book_ticket",
+			// the price is set on the server from the flight's fare
+			args: { flight: values.flight, passenger: values.passenger },
+			freeze: true,
+			callback: (r) => {
+				const result = r.message;
+				if (result.waitlist_entry) {
+					frappe.msgprint({
+						title: __("Flight Full"),
+						message: __("The flight is full. The passenger is number {0} on its waitlist.", [
+							result.waitlist_position,
+						]),
+						indicator: "orange",
+					});
+				} else if (result.error) {
+					frappe.msgprint({ title: __("Cannot Book"), message: result.error, indicator: "red" });
+				} else {
+					frappe.web_form.handle_success({ name: result.ticket });
+				}
+			},
+		});
+		return false;
+	};
+})
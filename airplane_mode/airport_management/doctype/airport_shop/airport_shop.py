@@ -4,5 +4,36 @@
 import frappe
 from frappe.website.website_generator import WebsiteGenerator
 
+from airplane_mode.airport_management.doctype.airport_shop_occupancy.airport_shop_occupancy import (
+    apply_shop_change,
+)
+
+# Airports by Shop Occupancy groups by airport, filters on terminal and floor and counts by status
+OCCUPANCY_INDEX = ("airport", "terminal", "floor", "status")
+OCCUPANCY_INDEX_NAME = "occupancy_report_index"
+
+
 class AirportShop(WebsiteGenerator):
-    pass
\ No newline at end of file
+    def after_insert(self):
+        apply_shop_change(None, get_occupancy_state(self))
+
+    def on_update(self):
+        before_save = self.get_doc_before_save()
+        if self.flags.in_insert or not before_save:
+            return
+        apply_shop_change(get_occupancy_state(before_save), get_occupancy_state(self))
+
+    def on_trash(self):
+        apply_shop_change(get_occupancy_state(self), None)
+
+
+def get_occupancy_state(doc):
+    return frappe._dict(airport=doc.airport, status=doc.status, area_sq_ft=doc.area_sq_ft)
+
+
+def on_doctype_update():
+    add_occupancy_index()
+
+
+def add_occupancy_index():
+    frappe.db.add_index("Airport Shop", list(OCCUPANCY_INDEX), index_name=OCCUPANCY_INDEX_NAME)
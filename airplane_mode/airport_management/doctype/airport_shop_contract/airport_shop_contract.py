@@ -4,6 +4,10 @@
 import frappe
 from frappe.model.document import Document
 
+from airplane_mode.airport_management.doctype.airport_shop_occupancy.airport_shop_occupancy import (
+	set_shop_status,
+)
+
 
 class AirportShopContract(Document):
 	def get_default_configs(self):
@@ -39,10 +43,10 @@ class AirportShopContract(Document):
 
 	def on_submit(self):
 		self.is_shop_occupied()
-		frappe.db.set_value("Airport Shop", self.shop, "status", "Occupied")
+		set_shop_status(self.shop, "Occupied")
 		self.date = frappe.utils.nowdate()
 		if self.status != "Active":
 			frappe.throw("Status must be 'Active' on submission.")
 
 	def on_cancel(self):
-		frappe.db.set_value("Airport Shop", self.shop, "status", "Available")
+		set_shop_status(self.shop, "Available")
@@ -0,0 +1,8 @@
+// Copyright (c) 2026, Me! and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Airport Shop Occupancy", {
+// 	refresh(frm) {
+
+// 	},
+// });
@@ -0,0 +1,133 @@
+# Copyright (c) 2026, Me! and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt, now
+
+from airplane_mode.report_cache import touch_doctypes
+
+COUNTERS = ("total_shops", "occupied_shops", "available_shops", "occupied_area")
+
+
+class AirportShopOccupancy(Document):
+	pass
+
+
+def get_shop_counters(shop):
+	"""Return the counter contributions of one shop, given its airport, status and area."""
+	return {
+		"total_shops": 1,
+		"occupied_shops": int(shop.status == "Occupied"),
+		"available_shops": int(shop.status == "Available"),
+		"occupied_area": flt(shop.area_sq_ft) if shop.status == "Occupied" else 0,
+	}
+
+
+def apply_shop_change(before, after):
+	"""Shift the counters of the airports of a shop from its `before` state to its `after` state.
+
+	Either state may be None, for an inserted or a deleted shop.
+	"""
+	deltas = {}
+	for shop, sign in ((before, -1), (after, 1)):
+		if shop and shop.airport:
+			airport = deltas.setdefault(shop.airport, dict.fromkeys(COUNTERS, 0))
+			for counter, value in get_shop_counters(shop).items():
+				airport[counter] += sign * value
+	for airport, delta in deltas.items():
+		if any(delta.values()):
+			update_shop_occupancy(airport, **delta)
+
+
+def update_shop_occupancy(airport, total_shops=0, occupied_shops=0, available_shops=0, occupied_area=0):
+	"""Atomically shift the counters of an airport by the given deltas, creating its row if missing."""
+	timestamp = now()
+	user = frappe.session.user
+	frappe.db.sql(
+		"""
+		INSERT INTO `tabAirport Shop Occupancy`
+			(name, airport, total_shops, occupied_shops, available_shops, occupied_area,
+			creation, modified, owner, modified_by, docstatus, idx)
+		VALUES (%(airport)s, %(airport)s, %(total)s, %(occupied)s, %(available)s, %(area)s,
+			%(now)s, %(now)s, %(user)s, %(user)s, 0, 0)
+		ON DUPLICATE KEY UPDATE
+			total_shops = total_shops + VALUES(total_shops),
+			occupied_shops = occupied_shops + VALUES(occupied_shops),
+			available_shops = available_shops + VALUES(available_shops),
+			occupied_area = occupied_area + VALUES(occupied_area),
+			modified = VALUES(modified)
+		""",
+		{
+			"airport": airport,
+			"total": total_shops,
+			"occupied": occupied_shops,
+			"available": available_shops,
+			"area": occupied_area,
+			"now": timestamp,
+			"user": user,
+		},
+	)
+	touch_doctypes("Airport Shop Occupancy")
+
+
+def set_shop_status(shop, status):
+	"""Set a shop's status and update its airport's counters in the same transaction."""
+	before = frappe.db.get_value(
+		"Airport Shop", shop, ["airport", "status", "area_sq_ft"], as_dict=True, for_update=True
+	)
+	if not before or before.status == status:
+		return
+	frappe.db.set_value("Airport Shop", shop, "status", status)
+	touch_doctypes("Airport Shop")
+	apply_shop_change(before, frappe._dict(before, status=status))
+
+
+def rebuild_shop_occupancy():
+	"""Recompute the counters of every airport from `tabAirport Shop`."""
+	values = {"now": now(), "user": frappe.session.user}
+	frappe.db.sql(
+		"""
+		INSERT INTO `tabAirport Shop Occupancy`
+			(name, airport, total_shops, occupied_shops, available_shops, occupied_area,
+			creation, modified, owner, modified_by, docstatus, idx)
+		SELECT a.name, a.name, COUNT(s.name),
+			COALESCE(SUM(s.status = 'Occupied'), 0),
+			COALESCE(SUM(s.status = 'Available'), 0),
+			COALESCE(SUM(IF(s.status = 'Occupied', s.area_sq_ft, 0)), 0),
+			%(now)s, %(now)s, %(user)s, %(user)s, 0, 0
+		FROM `tabAirport` a
+		LEFT JOIN `tabAirport Shop` s ON s.airport = a.name
+		GROUP BY a.name
+		ON DUPLICATE KEY UPDATE
+			total_shops = VALUES(total_shops),
+			occupied_shops = VALUES(occupied_shops),
+			available_shops = VALUES(available_shops),
+			occupied_area = VALUES(occupied_area),
+			modified = VALUES(modified)
+		""",
+		values,
+	)
+	frappe.db.sql(
+		"""
+		DELETE o FROM `tabAirport Shop Occupancy` o
+		LEFT JOIN `tabAirport` a ON a.name = o.airport
+		WHERE a.name IS NULL
+		"""
+	)
+	touch_doctypes("Airport Shop Occupancy")
+
+
+def reconcile_shop_occupancy():
+	rebuild_shop_occupancy()
+	frappe.db.commit()
+
+
+@frappe.whitelist()
+def get_shop_occupancy(airport=None):
+	"""Return the shop counters of one airport, or of every airport, for dashboards."""
+	frappe.has_permission("Airport Shop Occupancy", "read", throw=True)
+	fields = ["airport", *COUNTERS]
+	if airport:
+		return frappe.db.get_value("Airport Shop Occupancy", airport, fields, as_dict=True)
+	return frappe.get_all("Airport Shop Occupancy", fields=fields, order_by="airport asc")
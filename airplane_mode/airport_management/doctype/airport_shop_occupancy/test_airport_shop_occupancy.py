@@ -0,0 +1,56 @@
+# Copyright (c) 2026, Me! and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from airplane_mode.airport_management.doctype.airport_shop_occupancy.airport_shop_occupancy import (
+	COUNTERS,
+	get_shop_occupancy,
+	rebuild_shop_occupancy,
+	set_shop_status,
+)
+from airplane_mode.airport_management.test_tasks import create_test_airport
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class IntegrationTestAirportShopOccupancy(IntegrationTestCase):
+	"""
+	Integration tests for AirportShopOccupancy.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def test_counters_follow_shop_changes(self):
+		airport = create_test_airport("Occupancy Test Airport", code="OCC")
+		frappe.db.delete("Airport Shop", {"airport": airport})
+		rebuild_shop_occupancy()
+
+		shops = []
+		for i, area in enumerate((100, 250, 400)):
+			shop = frappe.get_doc(
+				{
+					"doctype": "Airport Shop",
+					"name": f"Occupancy Test Shop {i}",
+					"airport": airport,
+					"status": "Available",
+					"area_sq_ft": area,
+				}
+			).insert()
+			shops.append(shop.name)
+		set_shop_status(shops[1], "Occupied")
+		set_shop_status(shops[2], "Occupied")
+		frappe.delete_doc("Airport Shop", shops[2])
+
+		counters = get_shop_occupancy(airport)
+		self.assertEqual(
+			[counters[counter] for counter in COUNTERS],
+			[2, 1, 1, 250],
+		)
+
+		rebuild_shop_occupancy()
+		self.assertEqual(get_shop_occupancy(airport), counters)
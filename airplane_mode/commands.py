@@ -0,0 +1,118 @@
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-seat-inventory")
+@click.option("--flight", "flights", multiple=True, help="Only rebuild these flights")
+@pass_context
+def rebuild_seat_inventory(context, flights=None):
+	"Rebuild Flight Seat Inventory counters from Airplane Tickets"
+	from airplane_mode.airplane_mode.doctype.flight_seat_inventory.flight_seat_inventory import (
+		rebuild_seat_inventory,
+	)
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		rebuild_seat_inventory(list(flights) or None)
+		frappe.db.commit()
+	finally:
+		frappe.destroy()
+
+
+@click.command("rebuild-revenue-rollup")
+@pass_context
+def rebuild_revenue_rollup(context):
+	"Rebuild Revenue Rollup and Add-on Sales Rollup rows from submitted Airplane Tickets"
+	from airplane_mode.airplane_mode.doctype.add_on_sales_rollup.add_on_sales_rollup import (
+		rebuild_add_on_sales_rollup,
+	)
+	from airplane_mode.airplane_mode.doctype.revenue_rollup.revenue_rollup import rebuild_revenue_rollup
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		rebuild_revenue_rollup()
+		rebuild_add_on_sales_rollup()
+		frappe.db.commit()
+	finally:
+		frappe.destroy()
+
+
+@click.command("booking-stress-test")
+@click.option("--bookings", default=2000, help="Number of booking attempts")
+@click.option("--concurrency", default=32, help="Number of parallel booking clients")
+@click.option("--capacity", default=50, help="Capacity of the flight under test")
+@click.option("--keep", is_flag=True, default=False, help="Keep the generated flight and tickets")
+@pass_context
+def booking_stress_test(context, bookings, concurrency, capacity, keep):
+	"Fire concurrent bookings at one small flight and report throughput, latency and oversell"
+	from airplane_mode.airplane_mode.benchmarks.booking_stress import run
+
+	result = run(get_site(context), bookings=bookings, concurrency=concurrency, capacity=capacity, keep=keep)
+	for key, value in result.items():
+		click.echo(f"{key}: {value}")
+	if result["oversold"] or result["duplicate_seats"]:
+		raise click.ClickException("Flight was oversold")
+
+
+@click.command("report-filter-benchmark")
+@click.option("--airlines", default=20, help="Number of airlines in the generated rollup")
+@click.option("--days", default=365, help="Number of departure dates per airline and route")
+@click.option("--routes", default=20, help="Number of routes per airline")
+@click.option("--shops-per-airport", default=2000, help="Number of shops generated at each airport")
+@click.option("--keep", is_flag=True, default=False, help="Keep the generated data")
+@pass_context
+def report_filter_benchmark(context, airlines, days, routes, shops_per_airport, keep):
+	"Compare filtered and unfiltered report runs on a large generated dataset"
+	from airplane_mode.airplane_mode.benchmarks.report_filters import run
+
+	result = run(
+		get_site(context),
+		airlines=airlines,
+		days=days,
+		routes=routes,
+		shops_per_airport=shops_per_airport,
+		keep=keep,
+	)
+	for key, value in result.items():
+		click.echo(f"{key}: {value}")
+
+
+@click.command("import-airplane-data")
+@click.argument("doctype", type=click.Choice(["flights", "passengers", "tickets"]))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+	"--format", "file_format", type=click.Choice(["csv", "jsonl"]), help="Defaults to the file extension"
+)
+@click.option("--chunk-size", default=5000, help="Rows validated and committed together")
+@click.option("--dry-run", is_flag=True, default=False, help="Validate and report rejects without importing")
+@click.option("--error-file", help="Where rejected rows are written, defaults to <path>.errors.csv")
+@pass_context
+def import_airplane_data(context, doctype, path, file_format, chunk_size, dry_run, error_file):
+	"Import flights, passengers or tickets from a CSV or JSON Lines export"
+	from airplane_mode.airplane_mode.importer import import_file
+
+	doctype = {"flights": "Airplane Flight", "passengers": "Flight Passenger", "tickets": "Airplane Ticket"}[
+		doctype
+	]
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		summary = import_file(
+			doctype, path, file_format, chunk_size=chunk_size, dry_run=dry_run, error_path=error_file
+		)
+	finally:
+		frappe.destroy()
+	for key, value in summary.items():
+		click.echo(f"{key}: {value}")
+
+
+commands = [
+	rebuild_seat_inventory,
+	rebuild_revenue_rollup,
+	booking_stress_test,
+	report_filter_benchmark,
+	import_airplane_data,
+]
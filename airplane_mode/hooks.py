@@ -70,6 +70,12 @@ app_license = "mit"
 # automatically create page for each record of this doctype
 # website_generators = ["Web Page"]
 
+# serve flight and shop pages from the rendered-page cache
+page_renderer = [
+	"airplane_mode.page_cache.CachedDocumentPage",
+	"airplane_mode.page_cache.CachedListPage",
+]
+
 # automatically load and sync documents of this doctype from downstream apps
 # importable_doctypes = [doctype_1]
 
@@ -140,6 +146,40 @@ app_license = "mit"
 # 	}
 # }
 
+doc_events = {
+	"Airplane Flight": {
+		"on_update": "airplane_mode.page_cache.clear_page_cache",
+		"on_submit": "airplane_mode.page_cache.clear_page_cache",
+		"on_cancel": "airplane_mode.page_cache.clear_page_cache",
+		"on_update_after_submit": "airplane_mode.page_cache.clear_page_cache",
+		"on_trash": "airplane_mode.page_cache.clear_page_cache",
+	},
+	"Airport Shop": {
+		"on_update": [
+			"airplane_mode.page_cache.clear_page_cache",
+			"airplane_mode.report_cache.clear_report_cache",
+		],
+		"on_submit": "airplane_mode.page_cache.clear_page_cache",
+		"on_cancel": "airplane_mode.page_cache.clear_page_cache",
+		"on_update_after_submit": "airplane_mode.page_cache.clear_page_cache",
+		"after_rename": "airplane_mode.report_cache.clear_report_cache",
+		"on_trash": [
+			"airplane_mode.page_cache.clear_page_cache",
+			"airplane_mode.report_cache.clear_report_cache",
+		],
+	},
+	"Airline": {
+		"on_update": "airplane_mode.report_cache.clear_report_cache",
+		"after_rename": "airplane_mode.report_cache.clear_report_cache",
+		"on_trash": "airplane_mode.report_cache.clear_report_cache",
+	},
+	"Airport": {
+		"on_update": "airplane_mode.report_cache.clear_report_cache",
+		"after_rename": "airplane_mode.report_cache.clear_report_cache",
+		"on_trash": "airplane_mode.report_cache.clear_report_cache",
+	},
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -162,6 +202,19 @@ app_license = "mit"
 # }
 
 scheduler_events = {
+    "cron": {
+        "*/10 * * * *": [
+            "airplane_mode.airplane_mode.tasks.update_flight_statuses",
+            "airplane_mode.airplane_mode.flight_cancellation.resume_flight_cancellations"
+        ]
+    },
+    "hourly": [
+        "airplane_mode.airplane_mode.departure_reminders.send_departure_reminders"
+    ],
+    "daily": [
+        "airplane_mode.airplane_mode.tasks.refresh_crew_stats",
+        "airplane_mode.airport_management.doctype.airport_shop_occupancy.airport_shop_occupancy.reconcile_shop_occupancy"
+    ],
     "monthly": [
         "airplane_mode.airport_management.tasks.send_rent_reminders"
     ]
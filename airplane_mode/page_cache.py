@@ -0,0 +1,137 @@
+"""Rendered-HTML cache for the public flight and airport shop pages.
+
+Guest GET requests for the document and list pages of `CACHED_DOCTYPES` are
+answered from Redis, one hash per route holding the HTML of each query string
+(prefixed with "?", so the bare route gets a field too). A document's routes are
+dropped on save, submit, cancel and delete, and the list pages can be warmed
+from a background job after bulk uploads.
+"""
+
+import frappe
+import requests
+from frappe.utils import get_url
+from frappe.website.page_renderers.document_page import DocumentPage
+from frappe.website.page_renderers.list_page import ListPage
+
+CACHED_DOCTYPES = ("Airplane Flight", "Airport Shop")
+CACHE_KEY = "airplane_mode:page_cache:{}"
+STATS_KEY = "airplane_mode:page_cache_stats"
+# safety net for content pulled in from other documents, such as airline names
+CACHE_TTL = 24 * 60 * 60
+# page size of frappe's web list pages, paged with `?limit_start=`
+LIST_PAGE_LENGTH = 20
+WARM_LIST_PAGES = 5
+
+
+class CachedPageMixin:
+	def render(self):
+		if not can_cache():
+			return super().render()
+
+		route = get_request_route()
+		query = get_request_query()
+		html = frappe.cache.hget(CACHE_KEY.format(route), query)
+		if html is not None:
+			count("hits")
+			return self.build_response(html)
+
+		count("misses")
+		response = super().render()
+		if response.status_code == 200:
+			key = CACHE_KEY.format(route)
+			frappe.cache.hset(key, query, response.get_data(as_text=True))
+			frappe.cache.expire(frappe.cache.make_key(key), CACHE_TTL)
+		return response
+
+
+class CachedDocumentPage(CachedPageMixin, DocumentPage):
+	def can_render(self):
+		return super().can_render() and self.doctype in CACHED_DOCTYPES
+
+
+class CachedListPage(CachedPageMixin, ListPage):
+	def can_render(self):
+		return super().can_render() and self.path in CACHED_DOCTYPES
+
+
+def can_cache():
+	return (
+		frappe.session.user == "Guest"
+		and frappe.request.method == "GET"
+		and not frappe.conf.disable_website_cache
+		and not frappe.local.flags.redirect_location
+	)
+
+
+def get_request_route():
+	return frappe.request.path.strip("/")
+
+
+def get_request_query():
+	# RedisWrapper.hget returns None for an empty field, so never use one
+	return "?" + frappe.request.query_string.decode()
+
+
+def count(stat):
+	frappe.cache.hincrby(frappe.cache.make_key(STATS_KEY), stat, 1)
+
+
+def clear_page_cache(doc, method=None):
+	"""Drop the cached pages of a document and the list pages of its doctype."""
+	routes = {doc.route, frappe.get_meta(doc.doctype).route}
+	before_save = doc.get_doc_before_save()
+	if before_save:
+		routes.add(before_save.route)
+	clear_routes(*routes)
+	if frappe.flags.in_import:
+		enqueue_page_cache_warmup(doc.doctype)
+
+
+def clear_routes(*routes):
+	frappe.cache.delete_value([CACHE_KEY.format(route) for route in routes if route])
+
+
+@frappe.whitelist()
+def get_page_cache_stats():
+	frappe.only_for("System Manager")
+	# counters are written raw with hincrby, so read them back without unpickling
+	values = frappe.cache.hmget(frappe.cache.make_key(STATS_KEY), ["hits", "misses"])
+	hits, misses = (int(value or 0) for value in values)
+	return {
+		"hits": hits,
+		"misses": misses,
+		"hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+	}
+
+
+def enqueue_page_cache_warmup(doctype, names=None):
+	frappe.enqueue(
+		warm_page_cache,
+		queue="long",
+		job_id=f"page_cache_warmup::{doctype}",
+		deduplicate=True,
+		enqueue_after_commit=True,
+		doctype=doctype,
+		names=names,
+	)
+
+
+def warm_page_cache(doctype, names=None):
+	"""Fill the cache for the first list pages of `doctype` and the pages of `names`.
+
+	Pages are requested over HTTP as a guest so they go through the same renderer
+	and land under the same keys as real visitors.
+	"""
+	meta = frappe.get_meta(doctype)
+	# the list pages may have been cached before the upload committed
+	clear_routes(meta.route)
+	paths = [meta.route] + [
+		f"{meta.route}?limit_start={page * LIST_PAGE_LENGTH}" for page in range(1, WARM_LIST_PAGES)
+	]
+	if names:
+		filters = {"name": ["in", names], meta.is_published_field: 1}
+		paths += frappe.get_all(doctype, filters=filters, pluck="route")
+
+	with requests.Session() as session:
+		for path in paths:
+			session.get(get_url(path), timeout=30)
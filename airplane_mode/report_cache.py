@@ -0,0 +1,146 @@
+"""Result cache for the app's script reports.
+
+A report opts in by decorating its `execute` with `cached_report`, naming the
+doctypes its data is read from. Results are stored in Redis under a hash of the
+report, its normalised filters, the user's language and the current version of
+each of those doctypes. Saving, submitting, cancelling or deleting a document
+moves its doctype's version on (see `doc_events` in hooks), as do the bulk SQL
+writers through `touch_doctypes`, so stale results are never looked up again and
+age out of the cache.
+
+The cache holds at most `MAX_ENTRIES` results and evicts the least recently
+used ones beyond that.
+"""
+
+import functools
+import hashlib
+import json
+import time
+
+import frappe
+
+CACHE_KEY = "airplane_mode:report_cache"
+LRU_KEY = "airplane_mode:report_cache_lru"
+VERSIONS_KEY = "airplane_mode:report_cache_versions"
+STATS_KEY = "airplane_mode:report_cache_stats"
+MAX_ENTRIES = 500
+# safety net for data the declared dependencies do not cover
+CACHE_TTL = 6 * 60 * 60
+
+
+def cached_report(report, depends_on):
+	"""Cache the results of a report's `execute(filters)` until one of `depends_on` changes."""
+
+	def decorator(execute):
+		@functools.wraps(execute)
+		def wrapper(filters=None):
+			if frappe.conf.disable_report_cache:
+				return execute(filters)
+
+			key = get_cache_key(report, filters, depends_on)
+			result = frappe.cache.hget(CACHE_KEY, key)
+			if result is not None:
+				touch_entry(key)
+				count(report, "hits")
+				return result
+
+			count(report, "misses")
+			result = execute(filters)
+			set_entry(key, result)
+			return result
+
+		return wrapper
+
+	return decorator
+
+
+def get_cache_key(report, filters, depends_on):
+	versions = get_versions(depends_on)
+	payload = json.dumps(
+		[report, normalise_filters(filters), frappe.local.lang, versions],
+		sort_keys=True,
+		default=str,
+	)
+	return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def normalise_filters(filters):
+	"""Drop unset filters so that an empty and a missing filter share a result."""
+	return {key: value for key, value in (filters or {}).items() if value not in (None, "", [])}
+
+
+def get_versions(doctypes):
+	values = frappe.cache.hmget(frappe.cache.make_key(VERSIONS_KEY), doctypes)
+	return [int(value or 0) for value in values]
+
+
+def touch_doctypes(*doctypes):
+	"""Invalidate the cached results of every report depending on `doctypes`.
+
+	Versions move on right away, for reports run later in this transaction, and
+	again after commit, so a result a concurrent request computes from the old
+	data in between is not the one kept.
+	"""
+	bump_versions(doctypes)
+	frappe.db.after_commit.add(functools.partial(bump_versions, doctypes))
+
+
+def bump_versions(doctypes):
+	key = frappe.cache.make_key(VERSIONS_KEY)
+	for doctype in doctypes:
+		frappe.cache.hincrby(key, doctype, 1)
+
+
+def clear_report_cache(doc, method=None):
+	touch_doctypes(doc.doctype)
+
+
+def set_entry(key, result):
+	frappe.cache.hset(CACHE_KEY, key, result)
+	touch_entry(key)
+	for name in (CACHE_KEY, LRU_KEY):
+		frappe.cache.expire(frappe.cache.make_key(name), CACHE_TTL)
+	evict()
+
+
+def touch_entry(key):
+	frappe.cache.zadd(frappe.cache.make_key(LRU_KEY), {key: time.time()})
+
+
+def evict():
+	"""Drop the least recently used results beyond `MAX_ENTRIES`."""
+	lru_key = frappe.cache.make_key(LRU_KEY)
+	excess = frappe.cache.zcard(lru_key) - MAX_ENTRIES
+	if excess <= 0:
+		return
+	evicted = frappe.cache.zpopmin(lru_key, excess)
+	for key, _ in evicted:
+		frappe.cache.hdel(CACHE_KEY, key.decode())
+	frappe.cache.hincrby(frappe.cache.make_key(STATS_KEY), "evictions", len(evicted))
+
+
+def count(report, stat):
+	frappe.cache.hincrby(frappe.cache.make_key(STATS_KEY), f"{report}:{stat}", 1)
+
+
+@frappe.whitelist()
+def get_report_cache_stats():
+	"""Return hits, misses and hit rate per report, and the cache's size and evictions."""
+	frappe.only_for("System Manager")
+	fields = [field.decode() for field in frappe.cache.hkeys(STATS_KEY)]
+	values = frappe.cache.hmget(frappe.cache.make_key(STATS_KEY), fields) if fields else []
+	stats = {field: int(value or 0) for field, value in zip(fields, values, strict=True)}
+	reports = {}
+	for stat, value in stats.items():
+		report, _, name = stat.rpartition(":")
+		if report:
+			reports.setdefault(report, {"hits": 0, "misses": 0})[name] = value
+	for report_stats in reports.values():
+		total = report_stats["hits"] + report_stats["misses"]
+		report_stats["hit_rate"] = round(report_stats["hits"] / total, 4) if total else None
+	return {
+		"reports": reports,
+		"entries": frappe.cache.zcard(frappe.cache.make_key(LRU_KEY)),
+		"max_entries": MAX_ENTRIES,
+		"evictions": stats.get("evictions", 0),
+	}
@@ -0,0 +1,105 @@
+import hashlib
+
+import frappe
+from frappe.utils import cint, now
+
+from airplane_mode.report_cache import touch_doctypes
+
+
+def reserve_series(key, count=1, digits=3, doctype=None):
+	"""Reserve `count` consecutive numbers on the naming series `key` and return the names.
+
+	The series row is locked until the transaction ends, so concurrent callers get
+	disjoint blocks. When the series does not exist yet and `doctype` is given,
+	numbering continues after the highest existing `doctype` name starting with `key`.
+	"""
+	current = frappe.db.sql("SELECT `current` FROM `tabSeries` WHERE `name` = %s FOR UPDATE", (key,))
+	if current:
+		start = cint(current[0][0])
+		frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name` = %s", (count, key))
+	else:
+		start = get_last_series_number(key, doctype) if doctype else 0
+		frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (key, start + count))
+
+	return [f"{key}{number:0{digits}d}" for number in range(start + 1, start + count + 1)]
+
+
+def bulk_insert(doctype, rows):
+	"""Insert `rows`, dicts with the same keys, with multi-row INSERT statements."""
+	if not rows:
+		return
+	fields = list(rows[0])
+	frappe.db.bulk_insert(doctype, fields, [tuple(row[field] for field in fields) for row in rows])
+	touch_doctypes(doctype)
+
+
+def get_rollup_name(*key):
+	"""Name a rollup row from its key, so adding to a row is an upsert on the primary key."""
+	return hashlib.sha1("\x1f".join(str(value or "") for value in key).encode()).hexdigest()
+
+
+def add_to_rollup(doctype, key_fields, value_fields, rows):
+	"""Add the `value_fields` deltas of `rows` to the `doctype` rollup rows keyed by `key_fields`.
+
+	All rows are written with one INSERT ... ON DUPLICATE KEY UPDATE, so a rollup row
+	is created on its first delta and incremented in place after that.
+	"""
+	rows = [row for row in rows if any(row[field] for field in value_fields)]
+	if not rows:
+		return
+	timestamp = now()
+	user = frappe.session.user
+	fields = ["name", *key_fields, *value_fields, "creation", "modified", "owner", "modified_by"]
+	values = []
+	for row in rows:
+		key = [row.get(field) for field in key_fields]
+		values += [get_rollup_name(*key), *key, *(row[field] for field in value_fields)]
+		values += [timestamp, timestamp, user, user]
+
+	placeholders = "({})".format(", ".join(["%s"] * len(fields)))
+	updates = ", ".join(f"`{field}` = `{field}` + VALUES(`{field}`)" for field in value_fields)
+	frappe.db.sql(
+		f"""
+		INSERT INTO `tab{doctype}` ({", ".join(f"`{field}`" for field in fields)})
+		VALUES {", ".join([placeholders] * len(rows))}
+		ON DUPLICATE KEY UPDATE {updates}, `modified` = VALUES(`modified`)
+		""",
+		values,
+	)
+	touch_doctypes(doctype)
+
+
+def get_last_series_number(key, doctype):
+	last = frappe.db.sql(
+		f"""
+		SELECT MAX(CAST(SUBSTRING(`name`, %(offset)s) AS UNSIGNED))
+		FROM `tab{doctype}`
+		WHERE `name` LIKE %(pattern)s
+		""",
+		{"offset": len(key) + 1, "pattern": escape_like(key) + "%"},
+	)
+	return cint(last[0][0]) if last else 0
+
+
+def escape_like(value):
+	return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def run_chunked_patch(patch, process_chunk, start=""):
+	"""Run a data patch as a series of committed chunks that a rerun resumes from.
+
+	`process_chunk(last_key)` handles the chunk of records after `last_key` and
+	returns the key of the last record it handled, or None once nothing is left.
+	Each chunk is committed together with that key, so if the patch fails, the
+	next `bench migrate` picks up after the last committed chunk.
+	"""
+	checkpoint_key = f"airplane_mode:patch_checkpoint:{patch}"
+	last_key = frappe.db.get_global(checkpoint_key) or start
+	while True:
+		last_key = process_chunk(last_key)
+		if last_key is None:
+			break
+		frappe.db.set_global(checkpoint_key, last_key)
+		frappe.db.commit()
+
+	frappe.defaults.clear_default(checkpoint_key, parent="__global")